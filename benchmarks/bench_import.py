@@ -0,0 +1,66 @@
+"""
+Cold import time of cvdm.score
+
+Each scenario runs in a fresh interpreter so nothing is cached in
+sys.modules. "numpy" is the floor every scenario pays; "all models"
+imports every model module, which is what importing the package cost
+before the model modules were loaded lazily.
+
+Example:
+    python benchmarks/bench_import.py -r 20 -o import.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+SCENARIOS = {
+    "numpy": "import numpy",
+    "package": "import cvdm.score",
+    "one model": "from cvdm.score import Pce",
+    "all models": "from cvdm.score import *",
+}
+
+TIMER = """
+import time
+start = time.perf_counter()
+{}
+print(time.perf_counter() - start)
+"""
+
+
+def time_import(stmt, repeat):
+    """
+    Seconds taken by stmt in each of repeat fresh interpreters
+    """
+    env = dict(os.environ, PYTHONPATH=ROOT, PYTHONDONTWRITEBYTECODE="")
+    return [float(subprocess.check_output(
+        [sys.executable, "-c", TIMER.format(stmt)], env=env))
+        for _ in range(repeat)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("-r", "--repeat", type=int, default=10)
+    parser.add_argument("-o", "--output", help="JSON file for the results")
+    args = parser.parse_args(argv)
+    results = {}
+    for name, stmt in SCENARIOS.items():
+        times = time_import(stmt, args.repeat)
+        results[name] = {"stmt": stmt,
+                         "median_sec": statistics.median(times),
+                         "min_sec": min(times)}
+        print("{:<12} {:>8.1f} ms median {:>8.1f} ms min".format(
+            name, 1e3 * statistics.median(times), 1e3 * min(times)))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    return results
+
+
+if __name__ == "__main__":
+    main()
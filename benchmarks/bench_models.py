@@ -0,0 +1,147 @@
+"""
+Throughput and peak memory of every risk model
+
+Times the per-row score() path and the vectorized score_batch() path
+of every model in cvdm.score.cohort.MODELS on synthetic cohorts and
+writes the results as JSON so runs can be compared over time.
+
+The per-row path is timed on a sample of at most --scalar-rows rows
+(1e7 Python calls per model would take hours); its rows per second is
+measured on that sample.
+
+Example:
+    python benchmarks/bench_models.py -o before.json
+    python benchmarks/bench_models.py -o after.json --compare before.json
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from cvdm.score.cohort import MODELS, get_model  # noqa: E402
+from cohort import synthetic_cohort  # noqa: E402
+
+
+def _best_time(func, repeat):
+    best = np.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _peak_memory(func):
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def bench_model(name, n, scalar_rows=1000, repeat=3, seed=0):
+    """
+    Benchmark one model on an n row synthetic cohort, returning
+    a list of result records (one per scoring path)
+    """
+    model = get_model(name)
+    data = synthetic_cohort(n, model.feat_key, seed)
+    results = []
+
+    def batch():
+        model.score_batch(data)
+    elapsed = _best_time(batch, repeat)
+    results.append({"model": name, "path": "batch", "rows": n,
+                    "seconds": elapsed,
+                    "rows_per_sec": n / elapsed,
+                    "peak_bytes": _peak_memory(batch)})
+
+    m = min(n, scalar_rows)
+    if m > 0:
+        rows = [{k: data[k][i].item() for k in model.feat_key}
+                for i in range(m)]
+
+        def scalar():
+            for row in rows:
+                model.score(row)
+        elapsed = _best_time(scalar, repeat)
+        results.append({"model": name, "path": "scalar", "rows": m,
+                        "seconds": elapsed,
+                        "rows_per_sec": m / elapsed,
+                        "peak_bytes": _peak_memory(scalar)})
+    return results
+
+
+def _git_commit():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "HEAD"], stderr=subprocess.DEVNULL,
+            cwd=os.path.dirname(os.path.abspath(__file__))).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline):
+    """
+    Print the rows per second ratio of results over a baseline run
+    """
+    old = {(r["model"], r["path"], r["rows"]): r["rows_per_sec"]
+           for r in baseline["results"]}
+    print("{:<16} {:<7} {:>10} {:>14} {:>8}".format(
+        "model", "path", "rows", "rows/s", "speedup"))
+    for r in results["results"]:
+        key = (r["model"], r["path"], r["rows"])
+        ratio = r["rows_per_sec"] / old[key] if key in old else float("nan")
+        print("{:<16} {:<7} {:>10} {:>14.0f} {:>8.2f}".format(
+            r["model"], r["path"], r["rows"], r["rows_per_sec"], ratio))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("-m", "--models", nargs="+", default=sorted(MODELS),
+                        choices=sorted(MODELS))
+    parser.add_argument("-n", "--sizes", nargs="+", type=float,
+                        default=[1e3, 1e5, 1e7],
+                        help="cohort sizes in rows")
+    parser.add_argument("--scalar-rows", type=int, default=1000,
+                        help="rows sampled for the per-row score() path")
+    parser.add_argument("-r", "--repeat", type=int, default=3,
+                        help="timing repeats (the best is kept)")
+    parser.add_argument("-o", "--output", help="JSON file for the results")
+    parser.add_argument("--compare", help="JSON results of an earlier run")
+    args = parser.parse_args(argv)
+
+    results = {"python": platform.python_version(),
+               "numpy": np.__version__,
+               "platform": platform.platform(),
+               "cpu_count": os.cpu_count(),
+               "commit": _git_commit(),
+               "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+               "results": []}
+    for n in [int(n) for n in args.sizes]:
+        for name in args.models:
+            for r in bench_model(name, n, args.scalar_rows, args.repeat):
+                results["results"].append(r)
+                print("{model:<16} {path:<7} {rows:>10} "
+                      "{rows_per_sec:>14.0f} rows/s "
+                      "{peak_bytes:>12} B peak".format(**r))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            compare(results, json.load(f))
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Synthetic cohorts for the benchmarks
+
+Columns are generated on demand so a 1e7 row cohort only holds the
+columns the benchmarked models read.
+"""
+import numpy as np
+
+
+def _flag(p):
+    return lambda rng, n: rng.random(n) < p
+
+
+def _uniform(low, high):
+    return lambda rng, n: rng.uniform(low, high, n)
+
+
+COLUMNS = {
+    "index_age": lambda rng, n: rng.integers(30, 90, n).astype(float),
+    "female": _flag(0.5),
+    "AC": _flag(0.2),
+    "EAsian": _flag(0.1),
+    "Maori": _flag(0.1),
+    "Pacific": _flag(0.1),
+    "IndoAsian": _flag(0.1),
+    "ODcs": _flag(0.1),
+    "SEuro": _flag(0.1),
+    "Abor": _flag(0.05),
+    "cur_smoke": _flag(0.3),
+    "prev_smoke": _flag(0.3),
+    "heavy_smoke": _flag(0.05),
+    "moderate_smoke": _flag(0.05),
+    "light_smoke": _flag(0.05),
+    "dm": _flag(0.8),
+    "chol_tot": _uniform(100, 320),
+    "chol_hdl": _uniform(25, 90),
+    "chol_tot_mmol": _uniform(2.5, 8.5),
+    "chol_hdl_mmol": _uniform(0.6, 2.4),
+    "chol_ldl_mmol": _uniform(1, 5),
+    "nonhdl_mmol": _uniform(1.5, 7),
+    "tchdl": _uniform(2, 8),
+    "sbp": _uniform(90, 190),
+    "dbp": _uniform(50, 110),
+    "pp": _uniform(20, 90),
+    "htn_treat": _flag(0.5),
+    "bpld": _flag(0.4),
+    "statin": _flag(0.5),
+    "anticoagulant": _flag(0.1),
+    "insulin": _flag(0.2),
+    "bmi": _uniform(17, 45),
+    "height_m": _uniform(1.4, 2.0),
+    "hba1c": _uniform(5, 12),
+    "hba1c_mmol": _uniform(30, 110),
+    "a_glucose": _flag(0.6),
+    "albumin_creat": _uniform(0, 300),
+    "albumin_creat_mgmmol": _uniform(0, 40),
+    "albumin_urine": _uniform(0, 100),
+    "microalbum": _flag(0.2),
+    "macroalbum": _flag(0.05),
+    "egfr": _uniform(15, 120),
+    "creat": _uniform(0.5, 2.0),
+    "hb": _uniform(9, 17),
+    "wbc": _uniform(4, 11),
+    "retinopathy": _flag(0.1),
+    "afib": _flag(0.1),
+    "cvd_hist": _flag(0.2),
+    "chd": _flag(0.2),
+    "chf": _flag(0.1),
+    "renal": _flag(0.1),
+    "pvd": _flag(0.05),
+    "amp_hist": _flag(0.02),
+    "ulcer_hist": _flag(0.02),
+    "stroke_hist": _flag(0.05),
+    "5y_follow": _flag(0.5),
+    "diab_dur": lambda rng, n: rng.integers(0, 25, n).astype(float),
+}
+
+
+def synthetic_cohort(n, keys=None, seed=0):
+    """
+    Mapping of column name to array with n rows
+
+    Parameters
+    ----------
+    n : int
+            Number of rows
+    keys : list of column names (defaults to every column)
+    seed : int
+            Seed for numpy's default_rng
+    """
+    keys = list(COLUMNS) if keys is None else keys
+    rng = np.random.default_rng(seed)
+    data = {k: COLUMNS[k](rng, n) for k in keys if k in COLUMNS}
+    # keep the derived columns consistent with the ones they come from
+    if "male" in keys:
+        data["male"] = ~(data["female"] if "female" in data
+                         else COLUMNS["female"](rng, n))
+    if "Cauc" in keys:
+        data["Cauc"] = ~(data["AC"] if "AC" in data
+                         else COLUMNS["AC"](rng, n))
+    if "diab_age" in keys:
+        age = data["index_age"] if "index_age" in data \
+            else COLUMNS["index_age"](rng, n)
+        dur = data["diab_dur"] if "diab_dur" in data \
+            else COLUMNS["diab_dur"](rng, n)
+        data["diab_age"] = age - dur
+    missing = [k for k in keys if k not in data]
+    if missing:
+        raise KeyError("No generator for {}".format(missing))
+    return data
@@ -1,23 +1,80 @@
+import importlib
+import sys
+import types
+
 from .baseRisk import BaseRisk
-from .survModel import cox_surv, weibull_atf_surv, weibull_hazard, weibull_surv
+from .cohort import Cohort, CohortPlan, score_cohort
+from .cache import ScoreCache, CachedRisk
+from .lookup import GridRisk
+from .trajectory import Trajectories, score_trajectories
+from .survModel import cox_risk, cox_surv, cox_surv_multi
+from .survModel import weibull_atf_surv, weibull_hazard, weibull_surv
 from .helper import clean_diab_dur, clean_hba1c, clean_acr, clean_pp, clean_bp
 from .helper import clean_height, clean_egfr, clean_nonhdl, clean_chol, clean_hdl
 from .helper import clean_bmi, clean_age, clean_tot_chol, clean_tchdl, clean_hb
 from .helper import clean_ldl
-from .advance import advance, Advance
-from .aric import aric, Aric
-from .chs import chs, Chs
-from .darts import darts, Darts
-from .dcs import dcs, Dcs
-from .dial import dial, Dial
-from .dmcx import dmcx, Dmcx
-from .fremantle import fremantle, Fremantle
-from .frs import frs_primary, frs_simple, FrsSimple, FrsPrimary
-from .hkdr import hkdr_chd, HkdrCHD, hkdr_hf, HkdrHF, hkdr_stroke, HkdrStroke
-from .ndr import ndr, Ndr
-from .pce import pce, Pce
-from .qdiabetes import qdiabetes, QDiabetes
-from .recode import recode, Recode
-from .score import score, Score
-from .ukpds import ukpds, Ukpds
-from .ukpdsOM2 import ukpdsom2_chf, UkpdsOM2CHF, ukpdsom2_stroke, UkpdsOM2Stroke, ukpdsom2_mi_male, ukpdsom2_mi_female, UkpdsOM2MI 
+
+# the model modules are imported on first access of one of their names
+_LAZY = {
+    "advance": ["advance", "Advance"],
+    "aric": ["aric", "Aric"],
+    "chs": ["chs", "Chs"],
+    "darts": ["darts", "Darts"],
+    "dcs": ["dcs", "Dcs"],
+    "dial": ["dial", "Dial"],
+    "dmcx": ["dmcx", "Dmcx"],
+    "fremantle": ["fremantle", "Fremantle"],
+    "frs": ["frs_primary", "frs_simple", "FrsSimple", "FrsPrimary"],
+    "hkdr": ["hkdr_chd", "HkdrCHD", "hkdr_hf", "HkdrHF",
+             "hkdr_stroke", "HkdrStroke", "HkdrPanel"],
+    "ndr": ["ndr", "Ndr"],
+    "pce": ["pce", "Pce"],
+    "qdiabetes": ["qdiabetes", "QDiabetes"],
+    "recode": ["recode", "Recode"],
+    "score": ["score", "Score"],
+    "ukpds": ["ukpds", "Ukpds"],
+    "ukpdsOM2": ["ukpdsom2_chf", "UkpdsOM2CHF", "ukpdsom2_stroke",
+                 "UkpdsOM2Stroke", "ukpdsom2_mi_male", "ukpdsom2_mi_female",
+                 "UkpdsOM2MI"],
+}
+_LAZY_ATTRS = {k: mod for mod, names in _LAZY.items() for k in names}
+
+__all__ = ["BaseRisk", "Cohort", "CohortPlan", "score_cohort",
+           "ScoreCache", "CachedRisk", "GridRisk",
+           "Trajectories", "score_trajectories",
+           "cox_risk", "cox_surv", "cox_surv_multi", "weibull_atf_surv",
+           "weibull_hazard", "weibull_surv",
+           "clean_diab_dur", "clean_hba1c", "clean_acr", "clean_pp",
+           "clean_bp", "clean_height", "clean_egfr", "clean_nonhdl",
+           "clean_chol", "clean_hdl", "clean_bmi", "clean_age",
+           "clean_tot_chol", "clean_tchdl", "clean_hb", "clean_ldl"]
+__all__ += list(_LAZY_ATTRS)
+
+
+def __getattr__(name):
+    modName = _LAZY_ATTRS.get(name, name if name in _LAZY else None)
+    if modName is None:
+        raise AttributeError("module {!r} has no attribute {!r}"
+                             .format(__name__, name))
+    importlib.import_module("." + modName, __name__)
+    return globals()[name]
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRS))
+
+
+class _LazyPackage(types.ModuleType):
+    def __setattr__(self, name, value):
+        # importing a model module binds it on the package, which would
+        # shadow the function of the same name (e.g. pce), so bind the
+        # module's public names instead as the eager imports used to
+        if name in _LAZY and isinstance(value, types.ModuleType):
+            for k in _LAZY[name]:
+                super().__setattr__(k, getattr(value, k))
+            if name in _LAZY_ATTRS:
+                return
+        super().__setattr__(name, value)
+
+
+sys.modules[__name__].__class__ = _LazyPackage
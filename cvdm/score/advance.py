@@ -10,6 +10,8 @@ import numpy as np
 
 from cvdm.score import cox_surv, BaseRisk
 from cvdm.score import clean_diab_dur, clean_pp, clean_hba1c, clean_acr, clean_nonhdl
+from cvdm.score.incremental import IncrementalCoxMixin, design_matrix
+from cvdm.score.incremental import column_term, clean_term, log_term
 
 # coefficients for survival
 BETA = np.array([ 0.06187, # age at diagnosis of diabetes
@@ -26,6 +28,18 @@ BETA = np.array([ 0.06187, # age at diagnosis of diabetes
 S_0 = 0.951044
 CONST = 6.52910152
 
+# design terms of BETA
+ADVANCE_TERMS = [column_term("diab_age"),
+                 column_term("female"),
+                 clean_term("diab_dur", clean_diab_dur),
+                 clean_term("pp", clean_pp),
+                 column_term("retinopathy"),
+                 column_term("afib"),
+                 clean_term("hba1c", clean_hba1c),
+                 log_term("albumin_creat", clean_acr),
+                 clean_term("nonhdl_mmol", clean_nonhdl, meas="mmol"),
+                 column_term("htn_treat")]
+
 
 def advance(diab_age, female, diab_dur,
             pp, retin, afib,
@@ -45,7 +59,15 @@ def advance(diab_age, female, diab_dur,
     return s
 
 
-class Advance(BaseRisk):
+def advance_batch(cols):
+    """
+    Vectorized version of advance where cols is a
+    Cohort holding the Advance feature keys
+    """
+    return cox_surv(design_matrix(cols, ADVANCE_TERMS), BETA, S_0, CONST)
+
+
+class Advance(IncrementalCoxMixin, BaseRisk):
     features = ["diab_age",
                 "female",
                 "diab_dur",
@@ -58,6 +80,7 @@ class Advance(BaseRisk):
                 "htn_treat"]
     # set them to be the same
     feat_key = features
+    cox_terms = ADVANCE_TERMS
 
     def score(self, row):
         return advance(row["diab_age"],
@@ -71,6 +94,12 @@ class Advance(BaseRisk):
                        row["nonhdl_mmol"],
                        row["htn_treat"])
 
+    def score_batch(self, data):
+        return advance_batch(self.get_feature_columns(data))
+
+    def cox_params(self, cols):
+        return BETA, S_0, CONST, 1
+
     def get_features(self, row):
         """
         Get the features associated with this score
@@ -79,3 +108,8 @@ class Advance(BaseRisk):
         # log transform albumin creat
         feat_dict["albumin_creat"] = np.log(feat_dict["albumin_creat"])
         return feat_dict
+
+    def get_feature_arrays(self, cols):
+        feat = super().get_feature_arrays(cols)
+        feat["albumin_creat"] = cols.log("albumin_creat")
+        return feat
@@ -8,6 +8,8 @@ import numpy as np
 
 from cvdm.score import cox_surv, BaseRisk
 from cvdm.score import clean_age, clean_tot_chol, clean_hdl, clean_bp
+from cvdm.score.binning import BinTable
+from cvdm.score.coefTable import CoefTable, branch_code
 
 
 # coefficients for survival
@@ -43,6 +45,16 @@ MALE_INFO = {
         ])
 }
 
+# indexed by branch_code(male)
+ARIC_COEF = CoefTable([FEMALE_INFO, MALE_INFO])
+
+# tch 200-279 and >= 280 vs < 200
+TC_BINS = BinTable([200, np.nextafter(279, np.inf), 280],
+                   [-1, 0, -1, 1], ["tc_279", "tc_280"])
+# hdl < 45 and 45-49 vs >= 50
+HDL_BINS = BinTable([45, np.nextafter(49, np.inf)],
+                    [0, 1, -1], ["hdl_45", "hdl_49"])
+
 
 def aric(age, male, cauc, tc, hdl, sbp, htn, smoke):
     # set the coeff based on male or female
@@ -53,16 +65,34 @@ def aric(age, male, cauc, tc, hdl, sbp, htn, smoke):
     tc = clean_tot_chol(tc)
     hdl = clean_hdl(hdl)
     xFeat = np.array([age, age**2, cauc,
-                      tc >= 200 and tc <= 279,
-                      tc >= 280,
-                      hdl < 45,
-                      hdl >= 45 and hdl <= 49,
+                      *TC_BINS.indicators(tc),
+                      *HDL_BINS.indicators(hdl),
                       clean_bp(sbp), htn, smoke])
     return cox_surv(xFeat, genderInfo["coef"],
                     genderInfo["sm"],
                     genderInfo["xBetaMed"])
 
 
+def aric_batch(cols):
+    """
+    Vectorized version of aric where cols is a
+    Cohort holding the Aric feature keys
+    """
+    age = cols.clean("index_age", clean_age)
+    tc = cols.clean("chol_tot", clean_tot_chol)
+    hdl = cols.clean("chol_hdl", clean_hdl)
+    xFeat = np.column_stack([age, age**2, cols["Cauc"],
+                             TC_BINS.indicators(tc),
+                             HDL_BINS.indicators(hdl),
+                             cols.clean("sbp", clean_bp),
+                             cols["htn_treat"],
+                             cols["cur_smoke"]])
+    genderInfo = ARIC_COEF.gather(branch_code(cols["male"]))
+    return cox_surv(xFeat, genderInfo["coef"],
+                    genderInfo["sm"],
+                    genderInfo["xBetaMed"])
+
+
 class Aric(BaseRisk):
     features = ["index_age",
                 "male",
@@ -82,11 +112,19 @@ class Aric(BaseRisk):
                     row["htn_treat"],
                     row["cur_smoke"])
 
+    def score_batch(self, data):
+        return aric_batch(self.get_feature_columns(data))
+
     def get_features(self, row):
         feat_dict = super().get_features(row)
         feat_dict["age_sq"] = row["index_age"]**2
-        feat_dict["tc_279"] = row["chol_tot"] >= 200 and row["chol_tot"] <= 279
-        feat_dict["tc_280"] = row["chol_tot"] >= 280
-        feat_dict["hdl_45"] = row["chol_hdl"] < 45
-        feat_dict["hdl_49"] = row["chol_hdl"] >= 45 and row["chol_hdl"] <= 49
+        feat_dict.update(TC_BINS.named(row["chol_tot"]))
+        feat_dict.update(HDL_BINS.named(row["chol_hdl"]))
         return feat_dict
+
+    def get_feature_arrays(self, cols):
+        feat = super().get_feature_arrays(cols)
+        feat["age_sq"] = cols["index_age"]**2
+        feat.update(TC_BINS.named(cols["chol_tot"]))
+        feat.update(HDL_BINS.named(cols["chol_hdl"]))
+        return feat
@@ -1,10 +1,19 @@
 from abc import ABCMeta, abstractmethod
 
+import numpy as np
+
+from cvdm.score.cohort import as_cohort
+
 
 class BaseRisk(object):
     __metaclass__ = ABCMeta
     features = None
     feat_key = None
+    # attributes configuring the score (e.g. risk, tYear), None when the
+    # instance itself is its configuration (see ScoreCache.key)
+    config_keys = []
+    # True for models scoring several outcomes (a vector) per row
+    multi_outcome = False
 
     @abstractmethod
     def score(self, row):
@@ -22,6 +31,27 @@ class BaseRisk(object):
         """
         pass
 
+    def score_batch(self, data):
+        """
+        Given a column representation of a cohort,
+        calculate the risk score for every row.
+        Subclasses override this with a vectorized
+        implementation; the default scores row by row.
+
+        Parameters
+        ----------
+        data : mapping of column name to array, pandas
+               DataFrame or numpy structured array
+
+        Returns
+        ----------
+        ndarray: the score for each row
+        """
+        cols = self.get_feature_columns(data)
+        return np.fromiter((self.score({k: cols[k][i] for k in self.feat_key})
+                            for i in range(len(cols))),
+                           dtype=float, count=len(cols))
+
     def get_feature_keys(self):
         """
         Get the keys / column names for the pandas row
@@ -29,9 +59,45 @@ class BaseRisk(object):
         """
         return self.feat_key
 
+    def get_feature_columns(self, data):
+        """
+        Get the Cohort holding the feature keys as float arrays
+        """
+        return as_cohort(data).load(self.feat_key)
 
     def get_features(self, row):
         """
         Get the features associated with this score
         """
         return { k:v for k, v in row.items() if k in self.features }
+
+    def get_feature_arrays(self, cols):
+        """
+        Column-wise version of get_features: the features
+        associated with this score as a dictionary of arrays
+        for the Cohort cols
+        """
+        return {k: cols[k] for k in self.features}
+
+    def get_feature_matrix(self, data):
+        """
+        Get the features associated with this score
+        for every row as a dense design matrix
+
+        Parameters
+        ----------
+        data : mapping of column name to array, pandas
+               DataFrame or numpy structured array
+
+        Returns
+        ----------
+        ndarray: (n, features) float matrix
+        list: the feature name of each column
+        """
+        cols = as_cohort(data)
+        feat = self.get_feature_arrays(cols)
+        names = list(feat)
+        xFeat = np.empty((len(cols), len(names)))
+        for j, k in enumerate(names):
+            xFeat[:, j] = feat[k]
+        return xFeat, names
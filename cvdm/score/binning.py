@@ -0,0 +1,68 @@
+"""
+Declarative band tables
+
+Several models enter a continuous measurement as indicator columns of
+the band it falls in (cholesterol bands of ARIC, eGFR bands of DMCx).
+A BinTable holds the band edges and the indicator column of every band,
+so the indicators of a whole cohort are one band code per row and one
+lookup-table gather instead of chained comparisons per indicator.
+"""
+import numpy as np
+
+
+class BinTable(object):
+    """
+    Indicator columns of a banded measurement
+
+    Parameters
+    ----------
+    edges : increasing band edges; band b holds edges[b-1] <= x < edges[b]
+            as in np.digitize, so an inclusive upper bound u is given as
+            the edge np.nextafter(u, np.inf)
+    levels : indicator column of every band (len(edges) + 1 entries),
+             or -1 for a reference band without a column
+    names : name of every indicator column
+    """
+
+    def __init__(self, edges, levels, names):
+        if len(levels) != len(edges) + 1:
+            raise ValueError("Need one level per band ({} edges give {} bands)"
+                             .format(len(edges), len(edges) + 1))
+        self.edges = np.asarray(edges, dtype=float)
+        self.names = list(names)
+        # the extra last row is for NaN, which is in no band just like
+        # it fails every comparison
+        lut = np.zeros((len(levels) + 1, len(self.names)), dtype=bool)
+        for b, col in enumerate(levels):
+            if col >= 0:
+                lut[b, col] = True
+        lut.flags.writeable = False
+        self._lut = lut
+
+    def bin(self, x):
+        """
+        Band index of x, np.digitize(x, edges), with len(edges) + 1 for NaN
+        """
+        x = np.asarray(x, dtype=float)
+        # counting the edges passed is faster than the binary search
+        # of np.digitize for the handful of edges of a band table
+        band = np.zeros(x.shape, dtype=np.uint8 if len(self._lut) < 256
+                        else np.intp)
+        for edge in self.edges:
+            band += x >= edge
+        band[np.isnan(x)] = len(self._lut) - 1
+        return band
+
+    def indicators(self, x):
+        """
+        Indicator columns of x as a (k,) vector for a scalar
+        or an (n, k) matrix for an array
+        """
+        return self._lut.take(self.bin(x), axis=0)
+
+    def named(self, x):
+        """
+        Dictionary of the indicator columns of x by name
+        """
+        ind = self.indicators(x)
+        return {k: ind[..., j] for j, k in enumerate(self.names)}
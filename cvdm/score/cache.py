@@ -0,0 +1,135 @@
+"""
+Bounded LRU cache of scalar scores
+
+Dashboards score the same patient with the same models over and over.
+A ScoreCache remembers the last maxsize scores keyed on the model class,
+its configuration (the config_keys attributes it declares, e.g. risk,
+tYear, target or low_risk) and the values of its feat_key only, so
+unrelated row entries and other instance state do not defeat the cache.
+"""
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from cvdm.score.baseRisk import BaseRisk
+
+
+def _canonical(value):
+    """
+    Hashable canonical form of a feature value, so that e.g. True,
+    1, 1.0 and np.float64(1) share a key and NaN matches NaN
+    """
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return value
+    return "nan" if value != value else value
+
+
+class ScoreCache(object):
+    """
+    Thread-safe LRU cache of model.score(row)
+
+    Parameters
+    ----------
+    maxsize : number of scores kept before the least
+              recently used one is evicted
+    """
+
+    def __init__(self, maxsize=1024):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._scores = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._scores)
+
+    def key(self, model, row):
+        """
+        Cache key of the model configuration and the row's feat_key values.
+        Models declaring no config_keys (None) are keyed on the instance.
+        """
+        keys = getattr(model, "config_keys", None)
+        if keys is None:
+            config = model
+        else:
+            config = tuple((k, _canonical(getattr(model, k))) for k in keys)
+        return (type(model), config,
+                tuple(_canonical(row[k]) for k in model.feat_key))
+
+    def score(self, model, row):
+        """
+        model.score(row), computed only if not cached
+        """
+        key = self.key(model, row)
+        with self._lock:
+            if key in self._scores:
+                self._scores.move_to_end(key)
+                self.hits += 1
+                return self._scores[key]
+            self.misses += 1
+        # scored outside the lock; two threads missing on the same
+        # key both compute it and store the same value
+        value = model.score(row)
+        if isinstance(value, np.ndarray):
+            value = value.copy()
+            value.flags.writeable = False
+        with self._lock:
+            self._scores[key] = value
+            self._scores.move_to_end(key)
+            while len(self._scores) > self.maxsize:
+                self._scores.popitem(last=False)
+        return value
+
+    def info(self):
+        """
+        Dictionary of the hits, misses, size and maxsize of the cache
+        """
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses,
+                    "size": len(self._scores), "maxsize": self.maxsize}
+
+    def clear(self):
+        """
+        Drop every score and reset the counters
+        """
+        with self._lock:
+            self._scores.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+class CachedRisk(BaseRisk):
+    """
+    Opt-in memoization of model.score, e.g. CachedRisk(Pce(risk=10));
+    score_batch and the feature methods go straight to the model
+
+    Parameters
+    ----------
+    model : BaseRisk instance
+    cache : ScoreCache, which may be shared by several models
+    maxsize : size of the cache made when cache is None
+    """
+
+    def __init__(self, model, cache=None, maxsize=1024):
+        self.model = model
+        self.cache = ScoreCache(maxsize) if cache is None else cache
+        self.features = model.features
+        self.feat_key = model.feat_key
+
+    def score(self, row):
+        return self.cache.score(self.model, row)
+
+    def score_batch(self, data):
+        return self.model.score_batch(data)
+
+    def get_features(self, row):
+        return self.model.get_features(row)
+
+    def get_feature_arrays(self, cols):
+        return self.model.get_feature_arrays(cols)
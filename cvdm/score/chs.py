@@ -52,6 +52,25 @@ def chs(age, prevSmoker, curSmoker, sbp, totChol,
     return xFeat.dot(finalCoef)
 
 
+def chs_batch(cols, coef="CHS"):
+    """
+    Vectorized version of chs where cols is a
+    Cohort holding the Chs feature keys
+    """
+    finalCoef = CHS_COEFF
+    if coef == "MESA":
+        finalCoef = MESA_COEFF
+    xFeat = np.column_stack([cols["index_age"],
+                             cols["prev_smoke"],
+                             cols["cur_smoke"],
+                             np.minimum(cols["sbp"], 160) / 10,
+                             cols["chol_tot"],
+                             cols["chol_hdl"],
+                             cols["creat"] > 110.5,
+                             cols["insulin"]])
+    return xFeat.dot(finalCoef)
+
+
 class Chs(BaseRisk):
     base_hazard = None
     coef = None
@@ -62,6 +81,8 @@ class Chs(BaseRisk):
                 "chol_tot",
                 "chol_hdl",
                 "insulin"]
+    feat_key = features + ["sbp", "creat"]
+    config_keys = ["base_hazard", "coef"]
 
     def __init__(self, baseHazard=0.5, coef="CHS"):
         self.base_hazard = baseHazard
@@ -78,4 +99,7 @@ class Chs(BaseRisk):
                  row["insulin"],
                  self.coef)
         return 1 - self.base_hazard ** xb
-    
+
+    def score_batch(self, data):
+        xb = chs_batch(self.get_feature_columns(data), self.coef)
+        return 1 - self.base_hazard ** xb
@@ -0,0 +1,228 @@
+"""
+cvdm-score command line tool
+
+Stream a CSV, JSON-lines or Parquet file through one or more risk
+models in fixed-size chunks and write the scores incrementally, so
+memory use is bounded by the chunk size rather than the file size.
+
+Example:
+    cvdm-score cohort.csv scores.parquet -m pce:risk=10 frs_primary ndr
+"""
+import argparse
+import itertools
+import json
+import os
+import sys
+
+import numpy as np
+import tqdm
+
+from cvdm.score.cohort import CohortPlan, get_model, MODELS
+
+
+FORMATS = {".csv": "csv",
+           ".json": "jsonl",
+           ".jsonl": "jsonl",
+           ".ndjson": "jsonl",
+           ".parquet": "parquet",
+           ".pq": "parquet"}
+
+
+def _get_format(path, fmt=None):
+    if fmt is not None:
+        return fmt
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in FORMATS:
+        raise ValueError("Cannot infer the file format of {}".format(path))
+    return FORMATS[ext]
+
+
+def parse_model(spec):
+    """
+    Build a model from a name with optional constructor
+    arguments, e.g. "pce:risk=10" or "dcs:target=MI"
+    """
+    name, _, args = spec.partition(":")
+    if name not in MODELS:
+        raise ValueError("Unknown model: {}".format(name))
+    kwargs = {}
+    for arg in filter(None, args.split(",")):
+        k, _, v = arg.partition("=")
+        try:
+            kwargs[k] = json.loads(v)
+        except ValueError:
+            kwargs[k] = v
+    model = get_model(name)
+    if kwargs:
+        model = type(model)(**kwargs)
+    return model
+
+
+def read_chunks(path, columns, chunksize, fmt=None):
+    """
+    Yield pandas DataFrames of at most chunksize rows
+    holding only the requested columns
+    """
+    import pandas as pd
+    fmt = _get_format(path, fmt)
+    if fmt == "csv":
+        yield from pd.read_csv(path, usecols=columns, chunksize=chunksize)
+    elif fmt == "jsonl":
+        for chunk in pd.read_json(path, lines=True, chunksize=chunksize):
+            yield chunk[columns]
+    elif fmt == "parquet":
+        import pyarrow.parquet as pq
+        pf = pq.ParquetFile(path)
+        for batch in pf.iter_batches(batch_size=chunksize, columns=columns):
+            yield batch.to_pandas()
+    else:
+        raise ValueError("Unsupported format: {}".format(fmt))
+
+
+def count_rows(path, fmt=None):
+    """
+    Number of rows when it is cheap to know up front (Parquet metadata)
+    """
+    if _get_format(path, fmt) == "parquet":
+        import pyarrow.parquet as pq
+        return pq.ParquetFile(path).metadata.num_rows
+    return None
+
+
+class ChunkWriter(object):
+    """
+    Append DataFrame chunks to a CSV, JSON-lines or Parquet file.
+    The file (with the CSV header or Parquet schema) is written up
+    front, so an input without rows still gives an output file.
+
+    Parameters
+    ----------
+    columns : output columns, in order
+    sample : optional DataFrame whose dtypes give the Parquet types of
+             the columns it holds; the other columns are float64. Every
+             chunk is cast to this schema, so e.g. an integer column
+             with missing values in a later chunk is kept as integers
+    """
+
+    def __init__(self, path, columns, fmt=None, sample=None):
+        import pandas as pd
+        self.path = path
+        self.columns = list(columns)
+        self.fmt = _get_format(path, fmt)
+        self.schema = None
+        if self.fmt == "parquet":
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            known = [] if sample is None else \
+                [k for k in self.columns if k in sample.columns]
+            types = {}
+            if known:
+                sampleSchema = pa.Schema.from_pandas(sample[known],
+                                                     preserve_index=False)
+                types = {k: sampleSchema.field(k).type for k in known}
+            self.schema = pa.schema([(k, types.get(k, pa.float64()))
+                                     for k in self.columns])
+            self._out = pq.ParquetWriter(self.path, self.schema)
+            return
+        self._out = open(self.path, "w", newline="")
+        if self.fmt == "csv":
+            pd.DataFrame(columns=self.columns).to_csv(self._out, index=False)
+
+    def write(self, df):
+        df = df[self.columns]
+        if self.fmt == "parquet":
+            import pyarrow as pa
+            self._out.write_table(pa.Table.from_pandas(
+                df, schema=self.schema, preserve_index=False))
+        elif self.fmt == "csv":
+            df.to_csv(self._out, index=False, header=False)
+        else:
+            lines = df.to_json(orient="records", lines=True)
+            self._out.write(lines if lines.endswith("\n") else lines + "\n")
+
+    def close(self):
+        self._out.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def score_file(infile, outfile, models, chunksize=100000,
+               keep=None, in_format=None, out_format=None,
+               progress=True, dedup=False):
+    """
+    Score every row of infile against the models and write
+    the kept columns plus one risk column per model to outfile
+
+    Parameters
+    ----------
+    models : list of model specs (see parse_model)
+    keep : list of input columns to copy to the output (e.g. an id)
+    dedup : score only the unique rows of every chunk and model,
+            reporting the rows per unique row when progress is on
+    """
+    keep = list(keep or [])
+    plan = CohortPlan([parse_model(m) for m in models], dedup)
+    nUnique = np.zeros(len(models), dtype=int)
+    columns = keep + [k for k in plan.feat_key if k not in keep]
+    chunks = read_chunks(infile, columns, chunksize, in_format)
+    # the first chunk gives the output types of the kept columns
+    first = next(chunks, None)
+    if first is not None:
+        chunks = itertools.chain([first], chunks)
+    sample = None if first is None else first[keep]
+    nrows = 0
+    with ChunkWriter(outfile, keep + list(models), out_format,
+                     sample) as writer, \
+            tqdm.tqdm(total=count_rows(infile, in_format), unit="rows",
+                      disable=not progress) as pbar:
+        for chunk in chunks:
+            risk = plan.run(chunk)
+            if dedup:
+                nUnique += plan.unique_counts
+            out = chunk[keep].reset_index(drop=True)
+            for j, name in enumerate(models):
+                out[name] = risk[:, j]
+            writer.write(out)
+            nrows += len(chunk)
+            pbar.update(len(chunk))
+    if dedup and progress:
+        for name, u in zip(models, nUnique):
+            print("{}: {} unique of {} rows ({:.1f}x collapse)"
+                  .format(name, u, nrows, nrows / max(u, 1)), file=sys.stderr)
+    return nrows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="cvdm-score",
+        description="Score a cohort file against cardiovascular risk models")
+    parser.add_argument("infile", help="CSV, JSON-lines or Parquet input")
+    parser.add_argument("outfile", help="CSV, JSON-lines or Parquet output")
+    parser.add_argument("-m", "--models", nargs="+", required=True,
+                        help="models to score, optionally with arguments "
+                             "(e.g. pce:risk=10). Choices: "
+                             + ", ".join(sorted(MODELS)))
+    parser.add_argument("-k", "--keep", nargs="*", default=[],
+                        help="input columns to copy to the output")
+    parser.add_argument("-c", "--chunksize", type=int, default=100000,
+                        help="number of rows scored at a time")
+    parser.add_argument("--in-format", choices=sorted(set(FORMATS.values())))
+    parser.add_argument("--out-format", choices=sorted(set(FORMATS.values())))
+    parser.add_argument("-q", "--quiet", action="store_true",
+                        help="do not show the progress bar")
+    parser.add_argument("--dedup", action="store_true",
+                        help="score only the unique rows of every model "
+                             "and report the collapse ratio")
+    args = parser.parse_args(argv)
+    score_file(args.infile, args.outfile, args.models,
+               chunksize=args.chunksize, keep=args.keep,
+               in_format=args.in_format, out_format=args.out_format,
+               progress=not args.quiet, dedup=args.dedup)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Contiguous coefficient registry
+
+Models with several coefficient sets (by sex, race, region, ...) keep
+each set as a module-level dictionary. A CoefTable stacks the sets of
+one model into contiguous arrays whose row k belongs to branch code k,
+so the per-row coefficients of a mixed cohort are a single fancy-index
+gather instead of a Python branch per patient. Branches whose equations
+differ in form, not just in coefficients, are evaluated by
+branch_apply with one vectorized call per branch.
+"""
+import numpy as np
+
+
+def branch_code(*flags):
+    """
+    Integer branch code sum(flag_i << i) of the binary flags,
+    e.g. branch_code(female, ac) is 0 for a white male,
+    1 for a white female, 2 for a black male and 3 for a black female
+    """
+    code = 0
+    for i, flag in enumerate(flags):
+        code = code + ((np.asarray(flag) != 0).astype(np.intp) << i)
+    return code
+
+
+def partition(code, nBranch=0):
+    """
+    Row indices of every branch code (in input order within a branch),
+    from a stable argsort of the codes split at their bincount offsets
+
+    Returns
+    ----------
+    list: element k is the integer index array of the rows with code k
+    """
+    code = np.asarray(code, dtype=np.intp)
+    counts = np.bincount(code, minlength=nBranch)
+    order = np.argsort(code, kind="stable")
+    return np.split(order, np.cumsum(counts)[:-1])
+
+
+def branch_apply(code, funcs, *args, shape=()):
+    """
+    Evaluate funcs[k] on the rows with branch code k and scatter the
+    results back into input order
+
+    Parameters
+    ----------
+    code : (n,) integer branch codes, e.g. from branch_code
+    funcs : list of the vectorized equation of every branch
+    args : Cohorts or arrays restricted to the rows of the branch
+           (Cohort.take or indexing) before being passed to funcs[k]
+    shape : trailing shape of the branch results, used when no row
+            has a branch to take it from (e.g. an empty cohort)
+
+    Returns
+    ----------
+    ndarray: (n,) or (n, ...) results, with the trailing shape of the
+             branch results
+    """
+    code = np.asarray(code, dtype=np.intp)
+    if len(code) and code.max() >= len(funcs):
+        raise ValueError("Branch code {} has no function".format(code.max()))
+    out = None
+    for k, rows in enumerate(partition(code, len(funcs))):
+        if len(rows) == 0:
+            continue
+        res = np.asarray(funcs[k](*[a[rows] if isinstance(a, np.ndarray)
+                                    else a.take(rows) for a in args]))
+        if out is None:
+            out = np.empty((len(code),) + res.shape[1:])
+        out[rows] = res
+    return np.empty((len(code),) + tuple(shape)) if out is None else out
+
+
+class CoefTable(object):
+    """
+    Coefficient sets of one model stacked by branch code
+
+    Parameters
+    ----------
+    variants : list of coefficient dictionaries, where variants[k]
+               is used for branch code k. Every dictionary must have the
+               same keys; the values are stacked along a new first axis
+               (e.g. "coef" (p,) becomes (k, p) and "s0" becomes (k,))
+    """
+
+    def __init__(self, variants):
+        self.keys = list(variants[0])
+        self._arrays = {}
+        for k in self.keys:
+            arr = np.ascontiguousarray(np.stack([v[k] for v in variants]),
+                                       dtype=float)
+            arr.flags.writeable = False
+            self._arrays[k] = arr
+
+    def __len__(self):
+        return len(self._arrays[self.keys[0]])
+
+    def __getitem__(self, key):
+        return self._arrays[key]
+
+    def gather(self, code, keys=None):
+        """
+        Per-row coefficients for the branch codes, e.g. "coef" as an
+        (n, p) matrix that cox_surv takes in place of a single beta
+        """
+        keys = self.keys if keys is None else keys
+        return {k: self._arrays[k][code] for k in keys}
@@ -0,0 +1,275 @@
+"""
+Cohort column store and fused multi-model scoring
+
+A Cohort wraps the column representation of a cohort (a mapping of
+column name to array, a pandas DataFrame or a numpy structured array)
+and memoizes each float column, cleaned column and derived transform
+so that every model scored against the same Cohort shares them.
+"""
+import importlib
+
+import numpy as np
+
+
+# model name -> (module, class) used to build the default instance
+MODELS = {
+    "advance": ("advance", "Advance"),
+    "aric": ("aric", "Aric"),
+    "chs": ("chs", "Chs"),
+    "darts": ("darts", "Darts"),
+    "dcs": ("dcs", "Dcs"),
+    "dial": ("dial", "Dial"),
+    "dmcx": ("dmcx", "Dmcx"),
+    "fremantle": ("fremantle", "Fremantle"),
+    "frs_primary": ("frs", "FrsPrimary"),
+    "frs_simple": ("frs", "FrsSimple"),
+    "hkdr_chd": ("hkdr", "HkdrCHD"),
+    "hkdr_hf": ("hkdr", "HkdrHF"),
+    "hkdr_stroke": ("hkdr", "HkdrStroke"),
+    "ndr": ("ndr", "Ndr"),
+    "pce": ("pce", "Pce"),
+    "qdiabetes": ("qdiabetes", "QDiabetes"),
+    "recode": ("recode", "Recode"),
+    "score": ("score", "Score"),
+    "ukpds": ("ukpds", "Ukpds"),
+    "ukpdsom2_chf": ("ukpdsOM2", "UkpdsOM2CHF"),
+    "ukpdsom2_stroke": ("ukpdsOM2", "UkpdsOM2Stroke"),
+    "ukpdsom2_mi": ("ukpdsOM2", "UkpdsOM2MI"),
+}
+
+
+class Cohort(object):
+    """
+    Column store that converts each column to a float array once
+    and memoizes cleaned columns and derived transforms.
+    The cached arrays are read-only as they are shared by every
+    model scored against the cohort.
+    """
+
+    def __init__(self, data):
+        self.data = data
+        self._cols = {}
+        self._derived = {}
+
+    def __getitem__(self, key):
+        col = self._cols.get(key)
+        if col is None:
+            col = np.atleast_1d(np.asarray(self.data[key], dtype=float)).view()
+            col.flags.writeable = False
+            self._cols[key] = col
+        return col
+
+    def __contains__(self, key):
+        try:
+            self[key]
+        except (KeyError, ValueError, IndexError):
+            return False
+        return True
+
+    def load(self, keys):
+        """
+        Load the columns keys, raising a KeyError naming every one
+        that is missing (or not numeric), and return the Cohort
+        """
+        missing = [k for k in keys if k not in self]
+        if missing:
+            raise KeyError("Missing or non-numeric columns: {}".format(missing))
+        return self
+
+    def __len__(self):
+        if not self._cols:
+            raise TypeError("Length is unknown until a column is loaded")
+        return len(next(iter(self._cols.values())))
+
+    def _memo(self, cacheKey, func):
+        val = self._derived.get(cacheKey)
+        if val is None:
+            val = np.asarray(func()).view()
+            val.flags.writeable = False
+            self._derived[cacheKey] = val
+        return val
+
+    def clean(self, key, func, **kwargs):
+        """
+        Cleaned column func(cohort[key], **kwargs)
+        """
+        cacheKey = ("clean", key, func, tuple(sorted(kwargs.items())))
+        return self._memo(cacheKey, lambda: func(self[key], **kwargs))
+
+    def derive(self, key, func):
+        """
+        Derived column func() memoized under key, for terms
+        shared by several models or equations
+        """
+        return self._memo(("derive", key), func)
+
+    def _value(self, key, func, kwargs):
+        if func is None:
+            return self[key]
+        return self.clean(key, func, **kwargs)
+
+    def log(self, key, func=None, offset=0, **kwargs):
+        """
+        Natural log of offset + the (optionally cleaned) column
+        """
+        cacheKey = ("log", key, func, offset, tuple(sorted(kwargs.items())))
+        return self._memo(cacheKey,
+                          lambda: np.log(self._value(key, func, kwargs) + offset))
+
+    def log10(self, key, func=None, offset=0, **kwargs):
+        """
+        Base 10 log of offset + the (optionally cleaned) column
+        """
+        cacheKey = ("log10", key, func, offset, tuple(sorted(kwargs.items())))
+        return self._memo(cacheKey,
+                          lambda: np.log10(self._value(key, func, kwargs) + offset))
+
+    def take(self, index):
+        """
+        Cohort restricted to the rows selected by index
+        (boolean mask or integer indices)
+        """
+        return Cohort(_TakeView(self, index))
+
+
+class _TakeView(object):
+    def __init__(self, cohort, index):
+        self.cohort = cohort
+        self.index = index
+
+    def __getitem__(self, key):
+        return self.cohort[key][self.index]
+
+
+def as_cohort(data):
+    """
+    Wrap data in a Cohort unless it already is one
+    """
+    if isinstance(data, Cohort):
+        return data
+    return Cohort(data)
+
+
+def get_model(model):
+    """
+    Get the model instance from its name (see MODELS)
+    or pass through an existing model instance
+    """
+    if not isinstance(model, str):
+        return model
+    if model not in MODELS:
+        raise ValueError("Unknown model: {}".format(model))
+    modName, clsName = MODELS[model]
+    mod = importlib.import_module("cvdm.score." + modName)
+    return getattr(mod, clsName)()
+
+
+def unique_rows(cohort, keys):
+    """
+    Unique rows of the Cohort over the keys
+
+    Returns
+    ----------
+    Cohort of the unique rows, and the (n,) inverse index
+    mapping every row to its unique row
+    """
+    # the rows are numbered by the mixed-radix code of their per-column
+    # value codes, as np.unique(axis=0) sorting rows as bytes is an
+    # order of magnitude slower
+    code = np.zeros(len(cohort[keys[0]]), dtype=np.int64)
+    radix = 1
+    for k in keys:
+        values, inverse = np.unique(cohort[k], return_inverse=True)
+        if radix * len(values) >= 2**62:
+            # renumber the codes seen so far densely before overflowing
+            code = np.unique(code, return_inverse=True)[1].reshape(-1)
+            radix = int(code.max()) + 1
+        code *= len(values)
+        code += inverse.reshape(-1)
+        radix *= len(values)
+    _, first, inverse = np.unique(code, return_index=True,
+                                  return_inverse=True)
+    return cohort.take(first), inverse.reshape(-1)
+
+
+def score_unique(model, data):
+    """
+    Score only the unique rows of data over the model's feat_key
+    and scatter the risks back to every row
+
+    Returns
+    ----------
+    ndarray: the risk of every row
+    int: the number of unique rows scored
+    """
+    uniq, inverse = unique_rows(as_cohort(data), model.get_feature_keys())
+    risk = model.score_batch(uniq)
+    return risk[inverse], len(risk)
+
+
+class CohortPlan(object):
+    """
+    Execution plan for scoring several models against one cohort.
+    The plan resolves the models and the union of their feature keys
+    once; running it loads every column once and lets the models
+    share the cleaned columns and derived transforms.
+    With dedup, every model scores only the unique rows over its
+    feat_key (see score_unique), which pays off for cohorts of
+    rounded labs and flags; after a run, unique_counts holds the
+    number of unique rows of every model and collapse_ratio the
+    number of rows per unique row.
+    """
+
+    def __init__(self, models, dedup=False):
+        self.names = [m if isinstance(m, str) else type(m).__name__
+                      for m in models]
+        self.models = [get_model(m) for m in models]
+        for m in self.models:
+            if getattr(m, "multi_outcome", False):
+                raise TypeError("{} scores several outcomes per row, score it"
+                                " with its own score_batch"
+                                .format(type(m).__name__))
+        self.dedup = dedup
+        self.unique_counts = None
+        self.collapse_ratio = None
+        self.feat_key = []
+        for m in self.models:
+            self.feat_key += [k for k in m.get_feature_keys()
+                              if k not in self.feat_key]
+
+    def run(self, data):
+        """
+        Score the cohort, returning an (n, models) risk matrix
+        """
+        # load every column up front so missing columns fail early
+        cohort = as_cohort(data).load(self.feat_key)
+        risk = np.empty((len(cohort), len(self.models)))
+        if not self.dedup:
+            for j, m in enumerate(self.models):
+                risk[:, j] = m.score_batch(cohort)
+            return risk
+        self.unique_counts = []
+        for j, m in enumerate(self.models):
+            risk[:, j], nUnique = score_unique(m, cohort)
+            self.unique_counts.append(nUnique)
+        self.collapse_ratio = [len(cohort) / max(u, 1)
+                               for u in self.unique_counts]
+        return risk
+
+
+def score_cohort(data, models, dedup=False):
+    """
+    Score a cohort against several models at once
+
+    Parameters
+    ----------
+    data : mapping of column name to array, pandas DataFrame,
+           numpy structured array or Cohort
+    models : list of model names (see MODELS) or model instances
+    dedup : score only the unique rows of every model (see CohortPlan)
+
+    Returns
+    ----------
+    ndarray: (n, len(models)) matrix of risks
+    """
+    return CohortPlan(models, dedup).run(data)
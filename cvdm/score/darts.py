@@ -11,6 +11,7 @@ import numpy as np
 
 from cvdm.score import weibull_atf_surv, BaseRisk
 from cvdm.score import clean_diab_dur, clean_tot_chol, clean_hba1c, clean_bp, clean_height
+from cvdm.score.cohort import as_cohort
 
 
 # coefficients for survival
@@ -52,6 +53,65 @@ def darts(diab_age, diab_dur, chol_tot, prev_smoker,
     return s
 
 
+def _darts_design(cols, follow5):
+    hba1c_log = cols.log("hba1c", clean_hba1c)
+    sbp = cols.clean("sbp", clean_bp)
+    return np.column_stack([cols.log("diab_dur", clean_diab_dur),
+                            cols["diab_age"],
+                            cols.clean("chol_tot_mmol", clean_tot_chol),
+                            cols["prev_smoke"],
+                            cols["cur_smoke"],
+                            cols["male"],
+                            hba1c_log,
+                            hba1c_log*follow5,
+                            sbp,
+                            cols["htn_treat"],
+                            sbp*cols["htn_treat"],
+                            cols.clean("height_m", clean_height)])
+
+
+def darts_batch(cols, t):
+    """
+    Vectorized version of darts where cols is a
+    Cohort holding the Darts feature keys
+    """
+    return weibull_atf_surv(_darts_design(cols, cols["5y_follow"]),
+                            BETA, INTERCEPT, SIGMA, t)
+
+
+def darts_horizons_batch(cols, tYears=None, follow5_from_t=False):
+    """
+    Risk of darts at several follow-up times for the Cohort cols,
+    broadcasting one AFT location xFeat.beta + mu per row
+
+    Parameters
+    ----------
+    tYears : follow-up times in years (every year 1 to 10 by default)
+    follow5_from_t : set the follow-up > 5 years indicator from each
+                     time (t > 5) instead of the 5y_follow column
+
+    Returns
+    ----------
+    ndarray: (n, len(tYears)) risk matrix
+    """
+    if tYears is None:
+        tYears = np.arange(1, 11)
+    tYears = np.asarray(tYears, dtype=float)
+    if follow5_from_t:
+        loc = _darts_design(cols, 0).dot(BETA) + INTERCEPT
+        # BETA[7] is the log a1c x follow-up > 5 years interaction
+        loc = loc[:, None] + np.multiply.outer(
+            BETA[7]*cols.log("hba1c", clean_hba1c), tYears > 5)
+    else:
+        loc = _darts_design(cols, cols["5y_follow"]).dot(BETA) + INTERCEPT
+        loc = loc[:, None]
+    risk = np.divide(tYears, loc)
+    np.power(risk, SIGMA, out=risk)
+    np.negative(risk, out=risk)
+    np.expm1(risk, out=risk)
+    return np.negative(risk, out=risk)
+
+
 
 class Darts(BaseRisk):
     tYear = None
@@ -64,8 +124,8 @@ class Darts(BaseRisk):
                 "htn_treat",
                 "height_m"]
     feat_key = features + ["diab_dur", "hba1c", "5y_follow"]
-    
-    
+    config_keys = ["tYear"]
+
     def __init__(self, tYear=5):
         self.tYear = tYear
 
@@ -83,6 +143,22 @@ class Darts(BaseRisk):
                      row["height_m"],
                      self.tYear)
 
+    def score_batch(self, data):
+        return darts_batch(self.get_feature_columns(data), self.tYear)
+
+    def score_horizons(self, data, tYears=None, follow5_from_t=False):
+        """
+        Risk at each follow-up time in tYears (every year 1 to 10 by
+        default) for every row, as an (n, len(tYears)) matrix; with
+        follow5_from_t the 5y_follow column is not needed and is set
+        from t > 5 instead
+        """
+        if not follow5_from_t:
+            return darts_horizons_batch(self.get_feature_columns(data), tYears)
+        keys = [k for k in self.feat_key if k != "5y_follow"]
+        return darts_horizons_batch(as_cohort(data).load(keys), tYears,
+                                    follow5_from_t)
+
     def get_features(self, row):
         feat_dict = super().get_features(row)
         diabDur = row["diab_dur"]
@@ -94,6 +170,15 @@ class Darts(BaseRisk):
         feat_dict["sbp_htn"] = row["sbp"] * row["htn_treat"]
         return feat_dict
 
+    def get_feature_arrays(self, cols):
+        feat = super().get_feature_arrays(cols)
+        diabDur = cols["diab_dur"]
+        feat["diab_dur_log"] = np.log(np.where(diabDur < 1, 1, diabDur))
+        feat["hba1c_log"] = cols.log("hba1c")
+        feat["hba1c_log_follow5"] = cols.log("hba1c") * cols["5y_follow"]
+        feat["sbp_htn"] = cols["sbp"] * cols["htn_treat"]
+        return feat
+
 
 
 
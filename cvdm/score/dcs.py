@@ -84,6 +84,35 @@ def dcs(diabAge, isFemale, prevSmoke, curSmoke, hba1c, sbp,
                     coefInfo["s0"], coefInfo["const"])
 
 
+def dcs_batch(cols, target="CVD"):
+    """
+    Vectorized version of dcs where cols is a
+    Cohort holding the Dcs feature keys
+    """
+    coefInfo = MI_INFO
+    if target == "CVD":
+        coefInfo = CVD_INFO
+    xFeat = np.column_stack([cols["diab_age"],
+                             cols["female"],
+                             cols["prev_smoke"],
+                             cols["cur_smoke"],
+                             cols["hba1c"],
+                             cols["sbp"],
+                             cols["Maori"],
+                             cols["EAsian"],
+                             cols["Pacific"],
+                             cols["IndoAsian"],
+                             cols["ODcs"],
+                             cols["tchdl"],
+                             cols["microalbum"],
+                             cols["macroalbum"],
+                             cols["diab_dur"],
+                             cols["htn_treat"],
+                             cols["sbp"]*cols["htn_treat"]])
+    return cox_surv(xFeat, coefInfo["coef"],
+                    coefInfo["s0"], coefInfo["const"])
+
+
 class Dcs(BaseRisk):
     target = None
     features = ["diab_age",
@@ -103,6 +132,7 @@ class Dcs(BaseRisk):
                 "diab_dur",
                 "htn_treat"]
     feat_key = features
+    config_keys = ["target"]
 
     def __init__(self, target="CVD"):
         self.target = target
@@ -126,7 +156,15 @@ class Dcs(BaseRisk):
                    row["htn_treat"],
                    target=self.target)
 
+    def score_batch(self, data):
+        return dcs_batch(self.get_feature_columns(data), self.target)
+
     def get_features(self, row):
         feat_dict = super().get_features(row)
         feat_dict["sbp_htn"] = feat_dict["sbp"]*feat_dict["htn_treat"]
         return feat_dict
+
+    def get_feature_arrays(self, cols):
+        feat = super().get_feature_arrays(cols)
+        feat["sbp_htn"] = feat["sbp"]*feat["htn_treat"]
+        return feat
@@ -86,6 +86,17 @@ AGE_S0 = {
     93: 0.99943,
     94: 0.99955
 }
+# array form of the baseline survival indexed by age - AGE_S0_MIN
+AGE_S0_MIN = min(AGE_S0)
+AGE_S0_MAX = max(AGE_S0)
+AGE_S0_ARRAY = np.array([AGE_S0[k] for k in sorted(AGE_S0)])
+
+
+def _age_s0(age):
+    """
+    Baseline survival for the year of age (completed years)
+    """
+    return AGE_S0_ARRAY[np.floor(age).astype(int) - AGE_S0_MIN]
 
 
 # coefficients for survival
@@ -152,10 +163,117 @@ def dial(is_male, age, bmi, cur_smoke,
                       hz_treat,
                       high_risk_county])
     # look-up the age-specific value
-    s0 = AGE_S0[age]
+    s0 = _age_s0(age)
     return cox_surv(xFeat, DIAL_COEF, s0)
 
 
+def _dial_design(cols, age, diab_dur, hz_treat=0, high_risk_county=False):
+    """
+    Design matrix of dial for the Cohort cols at the given
+    (clipped) age and (rounded) diabetes duration
+    """
+    bmi = cols.clean("bmi", clean_bmi)
+    sbp = cols.clean("sbp", clean_bp)
+    non_hdl = cols.clean("nonhdl_mmol", clean_nonhdl, meas="mmol")
+    egfr = cols.clean("egfr", clean_egfr)
+    hba1c = cols.clean("hba1c_mmol", clean_hba1c, meas="mmol")
+    is_male = cols["male"]
+    cur_smoke = cols["cur_smoke"]
+    cvd_hist = cols["cvd_hist"]
+    insulin = cols["insulin"]
+    n = len(age)
+    return np.column_stack([is_male,
+                            age*is_male,
+                            bmi-30,
+                            bmi**2 - 30**2,
+                            cur_smoke,
+                            age*cur_smoke,
+                            sbp-140,
+                            sbp**2 - 140**2,
+                            non_hdl - 3.8,
+                            non_hdl**2 - 3.8**2,
+                            hba1c-50,
+                            hba1c**2 - 50**2,
+                            egfr - 80,
+                            egfr**2 - 80**2,
+                            cols["microalbum"],
+                            cols["macroalbum"],
+                            diab_dur,
+                            cvd_hist,
+                            age*cvd_hist,
+                            insulin,
+                            age * insulin,
+                            np.full(n, hz_treat, dtype=float),
+                            np.full(n, high_risk_county, dtype=float)])
+
+
+def _dial_age_dur(cols):
+    age = np.clip(cols.clean("index_age", clean_age), 34, 94)
+    diab_dur = np.round(cols.clean("diab_dur", clean_diab_dur))
+    return age, diab_dur
+
+
+def dial_batch(cols, hz_treat=0, high_risk_county=False):
+    """
+    Vectorized version of dial where cols is a
+    Cohort holding the Dial feature keys
+    """
+    age, diab_dur = _dial_age_dur(cols)
+    xFeat = _dial_design(cols, age, diab_dur, hz_treat, high_risk_county)
+    return cox_surv(xFeat, DIAL_COEF, _age_s0(age))
+
+
+def dial_lifetime_batch(cols, hz_treat=0, high_risk_county=False):
+    """
+    Lifetime CVD-free survival of dial for the Cohort cols,
+    iterating the annual survival from the current age to the
+    last year of the baseline table (age 94) for every row at once.
+    Age and diabetes duration advance one year per step; every other
+    risk factor stays at its current value. Non-CVD mortality is not
+    modelled, so both outputs are CVD-free in the absence of
+    competing risks.
+
+    Parameters
+    ----------
+    hz_treat : log hazard ratio of the intended treatment,
+               scalar or a sequence of alternatives
+
+    Returns
+    ----------
+    ndarray: survival free of CVD to age 95
+    ndarray: expected CVD-free life-years until age 95
+             (trapezoid rule over the annual survival)
+    Both are (n,) for a scalar hz_treat and (n, len(hz_treat))
+    for a sequence.
+    """
+    age, diab_dur = _dial_age_dur(cols)
+    lp = _dial_design(cols, age, diab_dur, 0,
+                      high_risk_county).dot(DIAL_COEF)
+    # age and diabetes duration enter linearly, so each year
+    # adds the same amount to the linear predictor
+    slope = _dial_design(cols, age + 1, diab_dur + 1, 0,
+                         high_risk_county).dot(DIAL_COEF) - lp
+    lp = lp[:, None] + np.atleast_1d(np.asarray(hz_treat, dtype=float))
+    ageIdx = np.floor(age).astype(int)
+    surv = np.ones_like(lp)
+    lifeYears = np.zeros_like(lp)
+    for k in range(AGE_S0_MAX - AGE_S0_MIN + 1):
+        active = ageIdx + k <= AGE_S0_MAX
+        if not active.any():
+            break
+        s0 = AGE_S0_ARRAY[np.minimum(ageIdx + k, AGE_S0_MAX) - AGE_S0_MIN]
+        # annual survival s0**exp(lp) in log space, 1 past the table
+        with np.errstate(over="ignore"):
+            logS = np.exp(lp + k*slope[:, None]) * np.log(s0)[:, None]
+        logS[~active] = 0
+        prev = surv
+        surv = prev * np.exp(logS)
+        lifeYears += np.where(active[:, None], (prev + surv) / 2, 0)
+    if np.ndim(hz_treat) == 0:
+        return surv[:, 0], lifeYears[:, 0]
+    return surv, lifeYears
+
+
 class Dial(BaseRisk):
     features = ["male",
                 "cur_smoke",
@@ -185,6 +303,16 @@ class Dial(BaseRisk):
                     row["cvd_hist"],
                     row["insulin"])
 
+    def score_batch(self, data):
+        return dial_batch(self.get_feature_columns(data))
+
+    def score_lifetime(self, data, hz_treat=0):
+        """
+        Lifetime CVD-free survival and expected CVD-free life-years
+        until age 95 for every row (see dial_lifetime_batch)
+        """
+        return dial_lifetime_batch(self.get_feature_columns(data), hz_treat)
+
     def get_features(self, row):
         feat_dict = super().get_features(row)
         feat_dict["age_male"] = row["index_age"]*row["male"]
@@ -202,3 +330,22 @@ class Dial(BaseRisk):
         feat_dict["age_cvd"] = row["index_age"] * row["cvd_hist"]
         feat_dict["age_insulin"] = row["index_age"] * row["insulin"]
         return feat_dict
+
+    def get_feature_arrays(self, cols):
+        feat = super().get_feature_arrays(cols)
+        age = cols["index_age"]
+        feat["age_male"] = age*cols["male"]
+        feat["bmi_30"] = cols["bmi"] - 30
+        feat["bmi_2_30"] = cols["bmi"]**2 - 30**2
+        feat["age_smoke"] = age*cols["cur_smoke"]
+        feat["sbp_140"] = cols["sbp"]-140
+        feat["sbp_2_140"] = cols["sbp"]**2 - 140**2
+        feat["nonhdl_38"] = cols["nonhdl_mmol"] - 3.8
+        feat["nonhdl_2_38"] = cols["nonhdl_mmol"]**2 - 3.8**2
+        feat["hba1c_50"] = cols["hba1c_mmol"] - 50
+        feat["hba1c_2_50"] = cols["hba1c_mmol"]**2 - 50**2
+        feat["egfr_80"] = cols["egfr"] - 80
+        feat["egfr_2_80"] = cols["egfr"]**2 - 80**2
+        feat["age_cvd"] = age * cols["cvd_hist"]
+        feat["age_insulin"] = age * cols["insulin"]
+        return feat
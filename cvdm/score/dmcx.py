@@ -14,6 +14,10 @@ import numpy as np
 from cvdm.score import cox_surv, BaseRisk
 from cvdm.score import clean_age, clean_egfr, clean_acr, clean_diab_dur
 from cvdm.score import clean_bp, clean_hba1c, clean_bmi, clean_tchdl
+from cvdm.score.binning import BinTable
+from cvdm.score.coefTable import CoefTable, branch_code
+from cvdm.score.incremental import IncrementalCoxMixin, design_matrix
+from cvdm.score.incremental import column_term, clean_term, log_term
 
 
 # coefficients for survival
@@ -73,6 +77,13 @@ FEMALE_DCMX = {
     "const": 2.007179
 }
 
+# indexed by branch_code(female)
+DCMX_COEF = CoefTable([MALE_DCMX, FEMALE_DCMX])
+
+# egfr 60-90, 30-60 and < 30 vs >= 90
+EGFR_BINS = BinTable([30, 60, 90], [2, 1, 0, -1],
+                     ["egfr_60_90", "egfr_30_60", "egfr_lt_30"])
+
 
 def dmcx(age, egfr, tchdl, acr, smoker, diab_dur, female, 
          sbp, dbp, hba1c, htn_med, bmi, insulin, aGlucose):
@@ -95,9 +106,7 @@ def dmcx(age, egfr, tchdl, acr, smoker, diab_dur, female,
     tchdl = clean_tchdl(tchdl)
     
     xFeat = np.array([age,
-                      egfr >= 60 and egfr < 90,
-                      egfr >= 30 and egfr < 60,
-                      egfr < 30,
+                      *EGFR_BINS.indicators(egfr),
                       tchdl,
                       np.log(clean_acr(acr) + 1),
                       smoker,
@@ -123,8 +132,50 @@ def dmcx(age, egfr, tchdl, acr, smoker, diab_dur, female,
                     coefInfo["sm"], coefInfo["const"])
 
 
+def _age(cols):
+    return cols.clean("index_age", clean_age)
+
+
+# design terms of the coefficients; the squares and age interactions
+# are re-evaluated when any of their keys changes
+DCMX_TERMS = [clean_term("index_age", clean_age),
+              (("egfr",),
+               lambda c: EGFR_BINS.indicators(c.clean("egfr", clean_egfr))),
+              clean_term("tchdl", clean_tchdl),
+              log_term("albumin_creat_mgmmol", clean_acr, offset=1),
+              column_term("cur_smoke"),
+              clean_term("diab_dur", clean_diab_dur),
+              clean_term("sbp", clean_bp),
+              clean_term("hba1c", clean_hba1c),
+              column_term("htn_treat"),
+              clean_term("dbp", clean_bp),
+              clean_term("bmi", clean_bmi),
+              column_term("insulin"),
+              (("dbp",), lambda c: c.clean("dbp", clean_bp)**2),
+              (("bmi",), lambda c: c.clean("bmi", clean_bmi)**2),
+              (("sbp",), lambda c: c.clean("sbp", clean_bp)**2),
+              (("hba1c",), lambda c: c.clean("hba1c", clean_hba1c)**2),
+              (("index_age", "tchdl"),
+               lambda c: _age(c) * c.clean("tchdl", clean_tchdl)),
+              (("index_age", "hba1c"),
+               lambda c: _age(c) * c.clean("hba1c", clean_hba1c)),
+              (("index_age", "cur_smoke"),
+               lambda c: _age(c) * c["cur_smoke"]),
+              column_term("a_glucose")]
 
-class Dmcx(BaseRisk):
+
+def dmcx_batch(cols):
+    """
+    Vectorized version of dmcx where cols is a
+    Cohort holding the Dmcx feature keys
+    """
+    coefInfo = DCMX_COEF.gather(branch_code(cols["female"]))
+    return cox_surv(design_matrix(cols, DCMX_TERMS), coefInfo["coef"],
+                    coefInfo["sm"], coefInfo["const"])
+
+
+
+class Dmcx(IncrementalCoxMixin, BaseRisk):
     features = ["index_age",
                 "egfr",
                 "tchdl",
@@ -140,6 +191,9 @@ class Dmcx(BaseRisk):
                 "insulin",
                 "a_glucose"]
     feat_key = features
+    cox_terms = DCMX_TERMS
+    # female selects the coefficients, so it cannot be updated
+    branch_keys = ["female"]
     
     def score(self, row):
         return dmcx(row["index_age"],
@@ -156,3 +210,10 @@ class Dmcx(BaseRisk):
                     row["bmi"],
                     row["insulin"],
                     row["a_glucose"])
+
+    def score_batch(self, data):
+        return dmcx_batch(self.get_feature_columns(data))
+
+    def cox_params(self, cols):
+        coefInfo = DCMX_COEF.gather(branch_code(cols["female"]))
+        return coefInfo["coef"], coefInfo["sm"], coefInfo["const"], 1
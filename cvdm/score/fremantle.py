@@ -11,6 +11,8 @@ import numpy as np
 
 from cvdm.score import cox_surv, BaseRisk
 from cvdm.score import clean_age, clean_hba1c, clean_acr, clean_hdl
+from cvdm.score.incremental import IncrementalCoxMixin, design_matrix
+from cvdm.score.incremental import column_term, clean_term, log_term
 
 
 # coefficients for survival
@@ -64,7 +66,27 @@ def fremantle(age, male, cvd, hba1c, acr,
                     FREMANTLE_SM, FREMANTLE_CONST)
 
 
-class Fremantle(BaseRisk):
+# design terms of FREMANTLE_COEF
+FREMANTLE_TERMS = [clean_term("index_age", clean_age),
+                   column_term("male"),
+                   column_term("cvd_hist"),
+                   log_term("hba1c", clean_hba1c),
+                   log_term("albumin_creat_mgmmol", clean_acr),
+                   log_term("chol_hdl_mmol", clean_hdl, meas="mmol"),
+                   column_term("SEuro"),
+                   column_term("Abor")]
+
+
+def fremantle_batch(cols):
+    """
+    Vectorized version of fremantle where cols is a
+    Cohort holding the Fremantle feature keys
+    """
+    return cox_surv(design_matrix(cols, FREMANTLE_TERMS), FREMANTLE_COEF,
+                    FREMANTLE_SM, FREMANTLE_CONST)
+
+
+class Fremantle(IncrementalCoxMixin, BaseRisk):
     features = ["index_age",
                 "male",
                 "cvd_hist",
@@ -73,6 +95,7 @@ class Fremantle(BaseRisk):
     feat_key = features + ["hba1c",
                            "albumin_creat_mgmmol",
                            "chol_hdl_mmol"]
+    cox_terms = FREMANTLE_TERMS
 
     def score(self, row):
         return fremantle(row["index_age"],
@@ -84,9 +107,22 @@ class Fremantle(BaseRisk):
                          row["SEuro"],
                          row["Abor"])
 
+    def score_batch(self, data):
+        return fremantle_batch(self.get_feature_columns(data))
+
+    def cox_params(self, cols):
+        return FREMANTLE_COEF, FREMANTLE_SM, FREMANTLE_CONST, 1
+
     def get_features(self, row):
         feat_dict = super().get_features(row)
         feat_dict["hba1c_log"] = np.log(row["hba1c"])
         feat_dict["acr_log"] = np.log(row["albumin_creat_mgmmol"])
         feat_dict["hdl_log"] = np.log(row["chol_hdl_mmol"])
         return feat_dict
+
+    def get_feature_arrays(self, cols):
+        feat = super().get_feature_arrays(cols)
+        feat["hba1c_log"] = cols.log("hba1c")
+        feat["acr_log"] = cols.log("albumin_creat_mgmmol")
+        feat["hdl_log"] = cols.log("chol_hdl_mmol")
+        return feat
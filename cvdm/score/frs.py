@@ -8,6 +8,7 @@ import numpy as np
 
 from cvdm.score import cox_surv, BaseRisk
 from cvdm.score import clean_bp, clean_bmi, clean_tot_chol, clean_hdl, clean_age
+from cvdm.score.coefTable import CoefTable, branch_code
 
 
 NONLAB_WOMEN  = {
@@ -57,6 +58,10 @@ LAB_WOMEN  = {
     "const": 26.1931
 }
 
+# indexed by branch_code(female)
+NONLAB_COEF = CoefTable([NONLAB_MEN, NONLAB_WOMEN])
+LAB_COEF = CoefTable([LAB_MEN, LAB_WOMEN])
+
 
 class FrsSimple(BaseRisk):
     features = ["female",
@@ -76,6 +81,9 @@ class FrsSimple(BaseRisk):
                           row["cur_smoke"],
                           row["dm"])
 
+    def score_batch(self, data):
+        return frs_simple_batch(self.get_feature_columns(data))
+
     def get_features(self, row):
         feat_dict = super().get_features(row)
         feat_dict["age_log"] = np.log(row["index_age"])
@@ -84,6 +92,14 @@ class FrsSimple(BaseRisk):
         feat_dict["sbp_htn"] = np.log(row["sbp"])*(row["htn_treat"])
         return feat_dict
 
+    def get_feature_arrays(self, cols):
+        feat = super().get_feature_arrays(cols)
+        feat["age_log"] = cols.log("index_age")
+        feat["bmi_log"] = cols.log("bmi")
+        feat["sbp_nhtn"] = cols.log("sbp")*(1-cols["htn_treat"])
+        feat["sbp_htn"] = cols.log("sbp")*cols["htn_treat"]
+        return feat
+
 
 class FrsPrimary(BaseRisk):
     features = ["female",
@@ -105,6 +121,9 @@ class FrsPrimary(BaseRisk):
                            row['cur_smoke'],
                            row["dm"])
 
+    def score_batch(self, data):
+        return frs_primary_batch(self.get_feature_columns(data))
+
     def get_features(self, row):
         feat_dict = super().get_features(row)
         feat_dict["age_log"] = np.log(row["index_age"])
@@ -113,6 +132,15 @@ class FrsPrimary(BaseRisk):
         feat_dict["sbp_nhtn"] = np.log(row["sbp"])*(1-row["htn_treat"])
         feat_dict["sbp_htn"] = np.log(row["sbp"])*(row["htn_treat"])
         return feat_dict
+
+    def get_feature_arrays(self, cols):
+        feat = super().get_feature_arrays(cols)
+        feat["age_log"] = cols.log("index_age")
+        feat["tot_log"] = cols.log("chol_tot")
+        feat["hdl_log"] = cols.log("chol_hdl")
+        feat["sbp_nhtn"] = cols.log("sbp")*(1-cols["htn_treat"])
+        feat["sbp_htn"] = cols.log("sbp")*cols["htn_treat"]
+        return feat
  
 
 def frs_simple(female, age, bmi, sbp, htn, smk, diab):
@@ -164,3 +192,42 @@ def frs_primary(female, age, tot_chol, hdl, sbp, htn, smk, diab):
         genderInfo = LAB_WOMEN
     return cox_surv(xFeat, genderInfo["coef"],
                     genderInfo["s0"], genderInfo["const"])
+
+
+def frs_simple_batch(cols):
+    """
+    Vectorized version of frs_simple where cols is a
+    Cohort holding the FrsSimple feature keys
+    """
+    htn = cols["htn_treat"]
+    sbp_log = cols.log("sbp", clean_bp)
+    xFeat = np.column_stack([cols.log("index_age", clean_age),
+                             cols.log("bmi", clean_bmi),
+                             sbp_log*(1-htn),
+                             sbp_log*htn,
+                             cols["cur_smoke"],
+                             cols["dm"]])
+    return _frs_gender_surv(xFeat, cols["female"], NONLAB_COEF)
+
+
+def frs_primary_batch(cols):
+    """
+    Vectorized version of frs_primary where cols is a
+    Cohort holding the FrsPrimary feature keys
+    """
+    htn = cols["htn_treat"]
+    sbp_log = cols.log("sbp", clean_bp)
+    xFeat = np.column_stack([cols.log("index_age", clean_age),
+                             cols.log("chol_tot", clean_tot_chol),
+                             cols.log("chol_hdl", clean_hdl),
+                             sbp_log*(1-htn),
+                             sbp_log*htn,
+                             cols["cur_smoke"],
+                             cols["dm"]])
+    return _frs_gender_surv(xFeat, cols["female"], LAB_COEF)
+
+
+def _frs_gender_surv(xFeat, female, coefTable):
+    genderInfo = coefTable.gather(branch_code(female))
+    return cox_surv(xFeat, genderInfo["coef"],
+                    genderInfo["s0"], genderInfo["const"])
@@ -1,75 +1,110 @@
-
-def clean_diab_dur(diab_dur, min_val=1):
-    return max(min_val, diab_dur)
-
-
-def clean_hba1c(hba1c, meas="per"):
+import numpy as np
+
+
+def _clean_min(x, min_val, inplace=False, return_mask=False):
+    """
+    Floor the value(s) at min_val. Scalars use the builtin max while
+    arrays are clipped in one pass with np.fmax, which like max(min_val, x)
+    maps NaN to min_val.
+
+    Parameters
+    ----------
+    x : numeric or array
+    min_val : numeric
+            Smallest allowed value
+    inplace : boolean
+            Clip a writeable float ndarray in place instead of copying
+            it; other arrays (e.g. integer columns) are copied
+    return_mask : boolean
+            Also return a boolean mask of the values that were clipped
+    """
+    if not return_mask and np.ndim(x) == 0:
+        return max(min_val, x)
+    x = np.asarray(x)
+    mask = None
+    if return_mask:
+        mask = ~(x >= min_val)
+    # a float floor cannot be written into an integer array
+    out = None
+    if (inplace and isinstance(x, np.ndarray) and x.ndim > 0
+            and np.issubdtype(x.dtype, np.floating) and x.flags.writeable):
+        out = x
+    x = np.fmax(x, min_val, out=out)
+    if return_mask:
+        return x, mask
+    return x
+
+
+def clean_diab_dur(diab_dur, min_val=1, inplace=False, return_mask=False):
+    return _clean_min(diab_dur, min_val, inplace, return_mask)
+
+
+def clean_hba1c(hba1c, meas="per", inplace=False, return_mask=False):
     if meas == "per":
-        return max(3, hba1c)
+        return _clean_min(hba1c, 3, inplace, return_mask)
     else:
-        return max(9, hba1c)
+        return _clean_min(hba1c, 9, inplace, return_mask)
 
-    
-def clean_acr(acr):
-    return max(1, acr)
 
+def clean_acr(acr, inplace=False, return_mask=False):
+    return _clean_min(acr, 1, inplace, return_mask)
 
-def clean_pp(pp):
-    return max(0, pp)
 
+def clean_pp(pp, inplace=False, return_mask=False):
+    return _clean_min(pp, 0, inplace, return_mask)
 
-def clean_bp(bp):
-    return max(10, bp)
 
+def clean_bp(bp, inplace=False, return_mask=False):
+    return _clean_min(bp, 10, inplace, return_mask)
 
-def clean_height(height, meas="m"):
+
+def clean_height(height, meas="m", inplace=False, return_mask=False):
     if meas == "m":
-        return max(0.2, height)
+        return _clean_min(height, 0.2, inplace, return_mask)
     else:
         # return it in inches
-        return max(7.87, height)
+        return _clean_min(height, 7.87, inplace, return_mask)
 
 
-def clean_egfr(egfr):
-    return max(1, egfr)
+def clean_egfr(egfr, inplace=False, return_mask=False):
+    return _clean_min(egfr, 1, inplace, return_mask)
 
 
-def clean_nonhdl(nonhdl, meas="mgdl"):
-    return max(0, nonhdl)
+def clean_nonhdl(nonhdl, meas="mgdl", inplace=False, return_mask=False):
+    return _clean_min(nonhdl, 0, inplace, return_mask)
 
 
-def clean_chol(chol, meas="mgdl"):
-    return max(1, chol)
+def clean_chol(chol, meas="mgdl", inplace=False, return_mask=False):
+    return _clean_min(chol, 1, inplace, return_mask)
 
 
-def clean_ldl(ldl, meas="mgdl"):
-    return max(1, ldl)
+def clean_ldl(ldl, meas="mgdl", inplace=False, return_mask=False):
+    return _clean_min(ldl, 1, inplace, return_mask)
 
 
-def clean_hdl(hdl, meas="mgdl"):
+def clean_hdl(hdl, meas="mgdl", inplace=False, return_mask=False):
     min_hdl_mmol = 0.01
     if meas == "mmol":
-        return max(min_hdl_mmol, hdl)
+        return _clean_min(hdl, min_hdl_mmol, inplace, return_mask)
     else:
-        return max(min_hdl_mmol*38.67, hdl)
-
+        return _clean_min(hdl, min_hdl_mmol*38.67, inplace, return_mask)
 
-def clean_tot_chol(chol_tot, meas="mgdl"):
-    return max(1, chol_tot)
 
+def clean_tot_chol(chol_tot, meas="mgdl", inplace=False, return_mask=False):
+    return _clean_min(chol_tot, 1, inplace, return_mask)
 
-def clean_tchdl(tchdl):
-    return max(1, tchdl)
 
+def clean_tchdl(tchdl, inplace=False, return_mask=False):
+    return _clean_min(tchdl, 1, inplace, return_mask)
 
-def clean_bmi(bmi):
-    return max(10, bmi)
 
+def clean_bmi(bmi, inplace=False, return_mask=False):
+    return _clean_min(bmi, 10, inplace, return_mask)
 
-def clean_age(age):
-    return max(18, age)
 
+def clean_age(age, inplace=False, return_mask=False):
+    return _clean_min(age, 18, inplace, return_mask)
 
-def clean_hb(hb):
-    return max(0, hb)
 
+def clean_hb(hb, inplace=False, return_mask=False):
+    return _clean_min(hb, 0, inplace, return_mask)
@@ -12,6 +12,10 @@ import numpy as np
 from cvdm.score import cox_surv, BaseRisk
 from cvdm.score import clean_age, clean_diab_dur, clean_egfr, clean_acr
 from cvdm.score import clean_bmi, clean_hba1c, clean_nonhdl, clean_hb
+from cvdm.score.coefTable import CoefTable, branch_code
+from cvdm.score.cohort import as_cohort
+from cvdm.score.incremental import IncrementalCoxMixin, design_matrix
+from cvdm.score.incremental import column_term, clean_term, log10_term
 
 
 # coefficients for survival
@@ -44,6 +48,10 @@ HKDR_HF = {
     "shrink": 0.9744
 }
 
+# sex-specific baseline survival indexed by branch_code(female)
+HKDR_HF_COEF = CoefTable([{"sm": HKDR_HF["male_sm"]},
+                          {"sm": HKDR_HF["female_sm"]}])
+
 HKDR_STROKE = {
     "coef": np.array([ 0.0634,  # age in years
                        0.0897,  # hba1c (%)
@@ -92,7 +100,29 @@ def hkdr_chd(age, female, cur_smoker, diab_dur,
                     HKDR_CHD["shrink"])
 
 
-class HkdrCHD(BaseRisk):
+# design terms of HKDR_CHD["coef"]
+HKDR_CHD_TERMS = [clean_term("index_age", clean_age),
+                  column_term("female"),
+                  column_term("cur_smoke"),
+                  clean_term("diab_dur", clean_diab_dur),
+                  log10_term("egfr", clean_egfr),
+                  log10_term("albumin_creat_mgmmol", clean_acr, offset=1),
+                  clean_term("nonhdl_mmol", clean_nonhdl, meas="mmol")]
+
+
+def hkdr_chd_batch(cols):
+    """
+    Vectorized version of hkdr_chd where cols is a
+    Cohort holding the HkdrCHD feature keys
+    """
+    return cox_surv(design_matrix(cols, HKDR_CHD_TERMS),
+                    HKDR_CHD["coef"],
+                    HKDR_CHD["sm"],
+                    HKDR_CHD["const"],
+                    HKDR_CHD["shrink"])
+
+
+class HkdrCHD(IncrementalCoxMixin, BaseRisk):
     features = ["female",
                 "index_age",
                 "diab_dur",
@@ -100,6 +130,7 @@ class HkdrCHD(BaseRisk):
                 "nonhdl_mmol"]
     feat_key = features + ["egfr",
                            "albumin_creat_mgmmol"]
+    cox_terms = HKDR_CHD_TERMS
 
     def score(self, row):
         return hkdr_chd(row["index_age"],
@@ -110,12 +141,25 @@ class HkdrCHD(BaseRisk):
                         row["albumin_creat_mgmmol"],
                         row["nonhdl_mmol"])
 
+    def score_batch(self, data):
+        return hkdr_chd_batch(self.get_feature_columns(data))
+
+    def cox_params(self, cols):
+        return (HKDR_CHD["coef"], HKDR_CHD["sm"], HKDR_CHD["const"],
+                HKDR_CHD["shrink"])
+
     def get_features(self, row):
         feat_dict = super().get_features(row)
         feat_dict["egfr_log"] = np.log10(row["egfr"])
         feat_dict["acr_log"] = np.log10(1+row["albumin_creat_mgmmol"])
         return feat_dict
 
+    def get_feature_arrays(self, cols):
+        feat = super().get_feature_arrays(cols)
+        feat["egfr_log"] = cols.log10("egfr")
+        feat["acr_log"] = cols.log10("albumin_creat_mgmmol", offset=1)
+        return feat
+
 
 def hkdr_hf(female, age, bmi, hba1c, acr, hb, chdHist):
     """
@@ -153,6 +197,25 @@ def hkdr_hf(female, age, bmi, hba1c, acr, hb, chdHist):
                     HKDR_HF["shrink"])
 
 
+def hkdr_hf_batch(cols):
+    """
+    Vectorized version of hkdr_hf where cols is a
+    Cohort holding the HkdrHF feature keys
+    """
+    baseSurv = HKDR_HF_COEF["sm"][branch_code(cols["female"])]
+    xFeat = np.column_stack([cols.clean("index_age", clean_age),
+                             cols.clean("bmi", clean_bmi),
+                             cols.clean("hba1c", clean_hba1c),
+                             cols.log10("albumin_creat_mgmmol", clean_acr, offset=1),
+                             cols.clean("hb", clean_hb),
+                             cols["chd"]])
+    return cox_surv(xFeat,
+                    HKDR_HF["coef"],
+                    baseSurv,
+                    HKDR_HF["const"],
+                    HKDR_HF["shrink"])
+
+
 class HkdrHF(BaseRisk):
     features = ["female",
                 "index_age",
@@ -171,12 +234,19 @@ class HkdrHF(BaseRisk):
                        row["hb"],
                        row["chd"])
 
+    def score_batch(self, data):
+        return hkdr_hf_batch(self.get_feature_columns(data))
 
     def get_features(self, row):
         feat_dict = super().get_features(row)
         feat_dict["acr_log"] = np.log10(1+row["albumin_creat_mgmmol"])
         return feat_dict
 
+    def get_feature_arrays(self, cols):
+        feat = super().get_feature_arrays(cols)
+        feat["acr_log"] = cols.log10("albumin_creat_mgmmol", offset=1)
+        return feat
+
 
 
 def hkdr_stroke(age, hba1c, acr, chd):
@@ -190,6 +260,21 @@ def hkdr_stroke(age, hba1c, acr, chd):
                     HKDR_STROKE["const"])
 
 
+def hkdr_stroke_batch(cols):
+    """
+    Vectorized version of hkdr_stroke where cols is a
+    Cohort holding the HkdrStroke feature keys
+    """
+    xFeat = np.column_stack([cols.clean("index_age", clean_age),
+                             cols.clean("hba1c", clean_hba1c),
+                             cols.log10("albumin_creat_mgmmol", clean_acr),
+                             cols["chd"]])
+    return cox_surv(xFeat,
+                    HKDR_STROKE["coef"],
+                    HKDR_STROKE["sm"],
+                    HKDR_STROKE["const"])
+
+
 class HkdrStroke(BaseRisk):
     features = ["index_age",
                 "hba1c",
@@ -202,7 +287,124 @@ class HkdrStroke(BaseRisk):
                            row["albumin_creat_mgmmol"],
                            row["chd"])
 
+    def score_batch(self, data):
+        return hkdr_stroke_batch(self.get_feature_columns(data))
+
     def get_features(self, row):
         feat_dict = super().get_features(row)
         feat_dict["acr_log"] = np.log10(1+row["albumin_creat_mgmmol"])
         return feat_dict
+
+    def get_feature_arrays(self, cols):
+        feat = super().get_feature_arrays(cols)
+        feat["acr_log"] = cols.log10("albumin_creat_mgmmol", offset=1)
+        return feat
+
+
+# terms of the panel design matrix and the terms of every equation
+PANEL_TERMS = ["age", "female", "cur_smoke", "diab_dur", "egfr_log",
+               "acr_log1", "nonhdl", "bmi", "hba1c", "hb", "chd", "acr_log"]
+PANEL_OUTCOMES = ["chd", "hf", "stroke"]
+
+
+def _panel_beta():
+    beta = np.zeros((len(PANEL_TERMS), len(PANEL_OUTCOMES)))
+    for j, (info, terms) in enumerate([
+            (HKDR_CHD, ["age", "female", "cur_smoke", "diab_dur",
+                        "egfr_log", "acr_log1", "nonhdl"]),
+            (HKDR_HF, ["age", "bmi", "hba1c", "acr_log1", "hb", "chd"]),
+            # stroke uses log10 of the ACR itself
+            (HKDR_STROKE, ["age", "hba1c", "acr_log", "chd"])]):
+        beta[[PANEL_TERMS.index(t) for t in terms], j] = info["coef"]
+    beta.flags.writeable = False
+    return beta
+
+
+HKDR_PANEL = {"beta": _panel_beta(),
+              "const": np.array([HKDR_CHD["const"], HKDR_HF["const"],
+                                 HKDR_STROKE["const"]]),
+              # stroke has no shrinkage
+              "shrink": np.array([HKDR_CHD["shrink"], HKDR_HF["shrink"], 1])}
+
+# baseline survival of every outcome indexed by branch_code(female)
+HKDR_PANEL_COEF = CoefTable([
+    {"sm": [HKDR_CHD["sm"], HKDR_HF["male_sm"], HKDR_STROKE["sm"]]},
+    {"sm": [HKDR_CHD["sm"], HKDR_HF["female_sm"], HKDR_STROKE["sm"]]}])
+
+
+def hkdr_panel_batch(cols):
+    """
+    Risk of CHD, heart failure and stroke for the Cohort cols, with the
+    shared cleaned inputs built once and the three linear predictors
+    evaluated as one matrix product
+
+    Returns
+    ----------
+    ndarray: (n, 3) risk matrix, columns as in PANEL_OUTCOMES
+    """
+    # stacked term by term (contiguous copies) and transposed, which is
+    # several times faster than column_stack for this many terms
+    xFeat = np.vstack([cols.clean("index_age", clean_age),
+                       cols["female"],
+                       cols["cur_smoke"],
+                       cols.clean("diab_dur", clean_diab_dur),
+                       cols.log10("egfr", clean_egfr),
+                       cols.log10("albumin_creat_mgmmol", clean_acr, offset=1),
+                       cols.clean("nonhdl_mmol", clean_nonhdl, meas="mmol"),
+                       cols.clean("bmi", clean_bmi),
+                       cols.clean("hba1c", clean_hba1c),
+                       cols.clean("hb", clean_hb),
+                       cols["chd"],
+                       cols.log10("albumin_creat_mgmmol", clean_acr)]).T
+    lp = xFeat.dot(HKDR_PANEL["beta"])
+    lp -= HKDR_PANEL["const"]
+    lp *= HKDR_PANEL["shrink"]
+    logSm = np.log(HKDR_PANEL_COEF["sm"]).take(branch_code(cols["female"]),
+                                               axis=0)
+    with np.errstate(over="ignore"):
+        np.exp(lp, out=lp)
+        lp *= logSm
+    np.expm1(lp, out=lp)
+    return np.negative(lp, out=lp)
+
+
+class HkdrPanel(object):
+    """
+    CHD, heart failure and stroke risk together, scored as one (3,)
+    vector per row with the outcomes in the order of outcomes.
+    Not a BaseRisk, whose consumers (score_cohort, CachedRisk,
+    GridRisk, ...) expect one risk per row; score HkdrCHD, HkdrHF and
+    HkdrStroke there instead.
+    """
+    outcomes = PANEL_OUTCOMES
+    config_keys = []
+    multi_outcome = True
+    features = ["female",
+                "index_age",
+                "diab_dur",
+                "cur_smoke",
+                "nonhdl_mmol",
+                "bmi",
+                "hba1c",
+                "hb",
+                "chd"]
+    feat_key = features + ["egfr",
+                           "albumin_creat_mgmmol"]
+
+    def get_feature_keys(self):
+        return self.feat_key
+
+    def score(self, row):
+        """
+        (3,) risks of the outcomes for a pandas row or dictionary
+        """
+        return np.array([HkdrCHD().score(row),
+                         HkdrHF().score(row),
+                         HkdrStroke().score(row)])
+
+    def score_batch(self, data):
+        """
+        (n, 3) risk matrix for a column representation of a cohort,
+        which may be a Cohort shared with other models
+        """
+        return hkdr_panel_batch(as_cohort(data).load(self.feat_key))
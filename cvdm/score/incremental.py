@@ -0,0 +1,168 @@
+"""
+Incremental re-scoring of Cox models
+
+A Cox model's risk depends on the features only through the linear
+predictor xFeat.beta. When a single lab value of a scored patient
+changes, only the design terms built from that value change, so the
+new linear predictor is the stored one plus beta_j * (new - old) over
+those terms. The models supporting this write their design as a list
+of (keys, func) terms: the raw feature keys a term is built from and a
+function of a Cohort returning its column(s). Interaction terms list
+every key they involve and are re-evaluated when any of them changes.
+"""
+import numpy as np
+
+from cvdm.score.cohort import Cohort, as_cohort
+from cvdm.score.survModel import cox_risk
+
+
+def column_term(key):
+    """
+    Design term of the raw column key
+    """
+    return ((key,), lambda cols: cols[key])
+
+
+def clean_term(key, func, **kwargs):
+    """
+    Design term of the column key cleaned by func
+    """
+    return ((key,), lambda cols: cols.clean(key, func, **kwargs))
+
+
+def log_term(key, func=None, offset=0, **kwargs):
+    """
+    Design term of the natural log of offset + the (cleaned) column key
+    """
+    return ((key,), lambda cols: cols.log(key, func, offset, **kwargs))
+
+
+def log10_term(key, func=None, offset=0, **kwargs):
+    """
+    Design term of the base 10 log of offset + the (cleaned) column key
+    """
+    return ((key,), lambda cols: cols.log10(key, func, offset, **kwargs))
+
+
+def design_matrix(cols, terms):
+    """
+    (n, p) design matrix of the (keys, func) terms for the Cohort cols
+    """
+    return np.column_stack([func(cols) for _, func in terms])
+
+
+class IncrementalCox(object):
+    """
+    Linear predictor and cleaned design of a Cox-scored cohort,
+    kept to rescore rows after a few feature values change
+
+    Parameters
+    ----------
+    cols : Cohort (or column mapping) holding the keys of the terms
+    terms : list of (keys, func) design terms
+    beta : coefficients (p,) or per-row coefficients (n, p)
+    s0, b0, shrinkage : as in cox_surv, scalars or per-row arrays (n,)
+    branch_keys : keys selecting per-row coefficients (e.g. sex), which
+                  cannot be updated incrementally
+    """
+
+    def __init__(self, cols, terms, beta, s0, b0=0, shrinkage=1,
+                 branch_keys=()):
+        cols = as_cohort(cols)
+        self.terms = terms
+        self.branch_keys = set(branch_keys)
+        blocks = [np.asarray(func(cols), dtype=float) for _, func in terms]
+        n = len(blocks[0])
+        self.xFeat = np.column_stack(blocks)
+        # design columns of every term
+        edges = np.cumsum([0] + [1 if b.ndim == 1 else b.shape[1]
+                                 for b in blocks])
+        self._columns = [np.arange(a, b) for a, b in zip(edges, edges[1:])]
+        self.raw = {k: np.array(cols[k], dtype=float)
+                    for keys, _ in terms for k in keys}
+        self.beta = np.asarray(beta, dtype=float)
+        self.s0 = np.broadcast_to(s0, n)
+        self.b0 = np.broadcast_to(b0, n)
+        self.shrinkage = np.broadcast_to(shrinkage, n)
+        if self.beta.ndim == 2:
+            self.lp = np.einsum("ij,ij->i", self.xFeat, self.beta)
+        else:
+            self.lp = self.xFeat.dot(self.beta)
+
+    def __len__(self):
+        return len(self.lp)
+
+    def risk(self, rows=slice(None)):
+        """
+        Risk of the rows (all by default) from the stored linear predictor
+        """
+        return cox_risk(self.lp[rows], self.s0[rows],
+                        self.b0[rows], self.shrinkage[rows])
+
+    def update(self, rows, values):
+        """
+        Set new feature values for some rows and return their new risk.
+        Only the terms built from the changed keys are re-evaluated.
+
+        Parameters
+        ----------
+        rows : integer indices of the rows that changed
+        values : mapping of feature key to the new values of those rows
+        """
+        rows = np.atleast_1d(np.asarray(rows, dtype=np.intp))
+        fixed = self.branch_keys.intersection(values)
+        if fixed:
+            raise ValueError("Cannot update the coefficient branch keys {},"
+                             " rescore these rows".format(sorted(fixed)))
+        unknown = set(values) - set(self.raw)
+        if unknown:
+            raise KeyError("Not a feature of this model: {}"
+                           .format(sorted(unknown)))
+        values = {k: np.broadcast_to(np.asarray(v, dtype=float), rows.shape)
+                  for k, v in values.items()}
+        changed = [j for j, (keys, _) in enumerate(self.terms)
+                   if not set(keys).isdisjoint(values)]
+        if not changed:
+            return self.risk(rows)
+        # the new columns are evaluated before any state is written,
+        # so a failing term leaves the state as it was
+        sub = Cohort({k: values[k] if k in values else self.raw[k][rows]
+                      for j in changed for k in self.terms[j][0]})
+        idx = np.concatenate([self._columns[j] for j in changed])
+        new = np.column_stack([self.terms[j][1](sub) for j in changed])
+        delta = new - self.xFeat[np.ix_(rows, idx)]
+        if self.beta.ndim == 2:
+            delta = np.einsum("ij,ij->i", delta, self.beta[np.ix_(rows, idx)])
+        else:
+            delta = delta.dot(self.beta[idx])
+        for k, v in values.items():
+            self.raw[k][rows] = v
+        self.xFeat[np.ix_(rows, idx)] = new
+        self.lp[rows] += delta
+        return self.risk(rows)
+
+
+class IncrementalCoxMixin(object):
+    """
+    score_state of the BaseRisk models of a Cox equation written as
+    design terms, which set cox_terms (and branch_keys) and define
+    cox_params
+    """
+    cox_terms = None
+    branch_keys = ()
+
+    def cox_params(self, cols):
+        """
+        (beta, s0, b0, shrinkage) of the model for the Cohort cols,
+        as in cox_surv
+        """
+        raise NotImplementedError
+
+    def score_state(self, data):
+        """
+        IncrementalCox state of the cohort, whose update method
+        rescores rows after some of their feature values change
+        """
+        cols = self.get_feature_columns(data)
+        return IncrementalCox(cols, self.cox_terms, *self.cox_params(cols),
+                              branch_keys=self.branch_keys)
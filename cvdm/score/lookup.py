@@ -0,0 +1,183 @@
+"""
+Gridded risk tables
+
+Models of a few inputs (hkdr_stroke, frs_simple) can be tabulated once
+over a grid of their inputs and then answered by multilinear
+interpolation of the table, which costs a handful of gathers per row
+whatever the model. Rows outside the grid are scored exactly.
+
+The interpolation error is estimated when the table is built, against
+the exact model at the centre of every grid cell (where the error of
+multilinear interpolation of a smooth risk surface peaks) or, for grids
+of more cells than max_check, at max_check random points of the grid.
+error_estimate is an estimate, not a bound: a surface bending sharply
+within a cell between the check points can exceed it, so refine the
+grid where the model is most curved.
+"""
+import bisect
+import itertools
+
+import numpy as np
+
+from cvdm.score.baseRisk import BaseRisk
+from cvdm.score.cohort import as_cohort
+
+
+class GridRisk(BaseRisk):
+    """
+    Model answered by multilinear interpolation of a precomputed table
+
+    Parameters
+    ----------
+    model : BaseRisk whose score_batch fills the table
+    axes : mapping of every feat_key of the model to its increasing
+           grid points (e.g. np.linspace(40, 80, 41) for age or [0, 1]
+           for a flag)
+    discrete : keys (e.g. flags) only queried at their grid points;
+               other values of them are scored exactly
+    dtype : dtype of the stored table (float32 by default, whose
+            rounding is included in error_estimate)
+    max_check : most exact evaluations used to estimate the error
+
+    Attributes
+    ----------
+    error_estimate : largest absolute error at the check points, an
+                     estimate of the error of queries inside the grid
+    check_points : number of check points
+    """
+
+    # every table is its own configuration
+    config_keys = None
+
+    def __init__(self, model, axes, discrete=(), dtype=np.float32,
+                 max_check=1000000):
+        missing = set(model.feat_key) - set(axes)
+        if missing:
+            raise ValueError("No grid for {}".format(sorted(missing)))
+        self.model = model
+        self.features = model.features
+        self.feat_key = model.feat_key
+        self.keys = list(axes)
+        self.points = [np.asarray(axes[k], dtype=float) for k in self.keys]
+        for k, pts in zip(self.keys, self.points):
+            if len(pts) < 2 or np.any(np.diff(pts) <= 0):
+                raise ValueError("The grid of {} needs at least two increasing"
+                                 " points".format(k))
+        self.discrete = np.array([k in discrete for k in self.keys])
+        grid = np.meshgrid(*self.points, indexing="ij")
+        risk = model.score_batch({k: g.ravel() for k, g in zip(self.keys, grid)})
+        self.table = risk.reshape(grid[0].shape).astype(dtype)
+        self.table.flags.writeable = False
+        self._flat = self.table.reshape(-1)
+        self._strides = [s // self.table.itemsize for s in self.table.strides]
+        self._lists = [pts.tolist() for pts in self.points]
+        self.error_estimate, self.check_points = self._check(max_check)
+
+    @property
+    def nbytes(self):
+        return self.table.nbytes
+
+    def _check(self, max_check):
+        """
+        Largest absolute difference to the exact model at the cell
+        centres (discrete axes at their points) or at random points
+        """
+        centres = [pts if disc else (pts[:-1] + pts[1:]) / 2
+                   for pts, disc in zip(self.points, self.discrete)]
+        if np.prod([len(c) for c in centres], dtype=float) <= max_check:
+            grid = np.meshgrid(*centres, indexing="ij")
+            xQuery = np.column_stack([g.ravel() for g in grid])
+        else:
+            rng = np.random.default_rng(0)
+            xQuery = np.column_stack(
+                [rng.choice(pts, max_check) if disc
+                 else rng.uniform(pts[0], pts[-1], max_check)
+                 for pts, disc in zip(self.points, self.discrete)])
+        exact = self.model.score_batch({k: xQuery[:, j]
+                                        for j, k in enumerate(self.keys)})
+        err = np.abs(self._interp(xQuery) - exact)
+        return float(np.nanmax(err)), len(xQuery)
+
+    def _interp(self, xQuery):
+        """
+        Multilinear interpolation of the table at the (n, d) points,
+        all inside the grid
+        """
+        n = len(xQuery)
+        base = np.zeros(n, dtype=np.intp)
+        strides = np.array(self.table.strides) // self.table.itemsize
+        offsets = []
+        weights = []
+        for j, pts in enumerate(self.points):
+            x = xQuery[:, j]
+            i = np.searchsorted(pts, x, side="right") - 1
+            np.clip(i, 0, len(pts) - 2, out=i)
+            base += i * strides[j]
+            if self.discrete[j]:
+                # exactly on a point, so no interpolation along this axis
+                base += (x == pts[i + 1]) * strides[j]
+                continue
+            offsets.append(strides[j])
+            weights.append((x - pts[i]) / (pts[i + 1] - pts[i]))
+        table = self.table.reshape(-1)
+        risk = np.zeros(n)
+        for corner in itertools.product([0, 1], repeat=len(offsets)):
+            w = np.ones(n)
+            for c, wj in zip(corner, weights):
+                w *= wj if c else 1 - wj
+            risk += w * table[base + np.dot(corner, offsets).astype(np.intp)]
+        return risk
+
+    def score(self, row):
+        # pure Python walk of the same corners, cheaper than numpy for one row
+        base = 0
+        axes = []
+        for j, (k, pts) in enumerate(zip(self.keys, self._lists)):
+            x = float(row[k])
+            if not pts[0] <= x <= pts[-1]:
+                return self.model.score(row)
+            i = min(bisect.bisect_right(pts, x) - 1, len(pts) - 2)
+            if self.discrete[j]:
+                if x not in (pts[i], pts[i + 1]):
+                    return self.model.score(row)
+                base += (i + (x == pts[i + 1])) * self._strides[j]
+                continue
+            base += i * self._strides[j]
+            axes.append((self._strides[j], (x - pts[i]) / (pts[i + 1] - pts[i])))
+        risk = 0.
+        for corner in itertools.product([0, 1], repeat=len(axes)):
+            w = 1.
+            idx = base
+            for c, (stride, wj) in zip(corner, axes):
+                if c:
+                    w *= wj
+                    idx += stride
+                else:
+                    w *= 1 - wj
+            risk += w * self._flat.item(idx)
+        return risk
+
+    def score_batch(self, data):
+        cols = as_cohort(data)
+        xQuery = np.column_stack([cols[k] for k in self.keys])
+        outside = np.zeros(len(xQuery), dtype=bool)
+        for j, pts in enumerate(self.points):
+            x = xQuery[:, j]
+            if self.discrete[j]:
+                outside |= ~np.isin(x, pts)
+            else:
+                # NaN fails both comparisons and is scored exactly
+                outside |= ~((x >= pts[0]) & (x <= pts[-1]))
+        risk = np.empty(len(xQuery))
+        inside = ~outside
+        risk[inside] = self._interp(xQuery[inside])
+        if outside.any():
+            rows = np.flatnonzero(outside)
+            risk[rows] = self.model.score_batch(cols.take(rows))
+        return risk
+
+    def get_features(self, row):
+        return self.model.get_features(row)
+
+    def get_feature_arrays(self, cols):
+        return self.model.get_feature_arrays(cols)
@@ -56,6 +56,31 @@ def ndr(diab_age, diab_dur, tchdl, hba1c, sbp, bmi,
     return s
 
 
+def ndr_batch(cols, risk=5):
+    """
+    Vectorized version of ndr where cols is a
+    Cohort holding the Ndr feature keys
+    """
+    if risk not in [4, 5]:
+        raise NotImplementedError("Does not support risk that is not 4 or 5")
+    baseSurv = S0_4
+    if risk == 5:
+        baseSurv = S0_5
+    xFeat = np.column_stack([cols["diab_age"]-53.858,
+                             cols.clean("diab_dur", clean_diab_dur)-7.7360,
+                             cols.log("tchdl", clean_tchdl)-1.3948,
+                             cols.log("hba1c", clean_hba1c)-1.9736,
+                             cols.log("sbp", clean_bp)-4.9441,
+                             cols.log("bmi", clean_bmi)-3.3718,
+                             cols["male"]-0.6005,
+                             cols["cur_smoke"]-0.1778,
+                             cols["microalbum"]-0.1604,
+                             cols["macroalbum"]-0.0638,
+                             cols["afib"]-0.0319,
+                             cols["cvd_hist"]-0.1525])
+    return cox_surv(xFeat, BETA, baseSurv)
+
+
 class Ndr(BaseRisk):
     risk = None
     features = ["diab_age",
@@ -71,6 +96,7 @@ class Ndr(BaseRisk):
                            "sbp",
                            "bmi"]
 
+    config_keys = ["risk"]
 
     def __init__(self, risk = 5):
         self.risk = risk
@@ -90,6 +116,9 @@ class Ndr(BaseRisk):
                    row["cvd_hist"],
                    self.risk)
 
+    def score_batch(self, data):
+        return ndr_batch(self.get_feature_columns(data), self.risk)
+
     def get_features(self, row):
         feat_dict = super().get_features(row)
         feat_dict["tchdl_log"] = np.log(row["tchdl"])
@@ -98,3 +127,11 @@ class Ndr(BaseRisk):
         feat_dict["bmi"] = np.log(row["bmi"])
         return feat_dict
 
+    def get_feature_arrays(self, cols):
+        feat = super().get_feature_arrays(cols)
+        feat["tchdl_log"] = cols.log("tchdl")
+        feat["hba1c_log"] = cols.log("hba1c")
+        feat["sbp"] = cols.log("sbp")
+        feat["bmi"] = cols.log("bmi")
+        return feat
+
@@ -0,0 +1,172 @@
+"""
+Multi-core scoring backed by shared memory
+
+The input columns and the output risk matrix live in
+multiprocessing.shared_memory segments. Workers attach to them once
+and score row ranges in place, so no cohort data is pickled between
+processes. Each worker limits its BLAS thread pool (one thread by
+default) so that the workers do not oversubscribe the CPU.
+"""
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from cvdm.score.cohort import CohortPlan, as_cohort
+
+
+BLAS_ENV = ["OMP_NUM_THREADS",
+            "OPENBLAS_NUM_THREADS",
+            "MKL_NUM_THREADS",
+            "VECLIB_MAXIMUM_THREADS",
+            "NUMEXPR_NUM_THREADS"]
+
+# segments attached by this (worker) process, keyed by name
+_ATTACHED = {}
+
+
+def limit_blas_threads(n_threads):
+    """
+    Limit the BLAS / OpenMP thread pools of this process.
+    The environment variables cover libraries that are not loaded
+    yet and threadpoolctl, when installed, the ones that are.
+    """
+    for k in BLAS_ENV:
+        os.environ[k] = str(n_threads)
+    try:
+        from threadpoolctl import threadpool_limits
+    except ImportError:
+        return
+    threadpool_limits(n_threads)
+
+
+def _init_worker(blas_threads):
+    if blas_threads is not None:
+        limit_blas_threads(blas_threads)
+
+
+def _attach(name, keep):
+    # close the segments of earlier jobs before attaching new ones
+    for k in [k for k in _ATTACHED if k not in keep]:
+        _ATTACHED.pop(k).close()
+    shm = _ATTACHED.get(name)
+    if shm is None:
+        shm = shared_memory.SharedMemory(name=name)
+        _ATTACHED[name] = shm
+    return shm
+
+
+def _score_range(models, colSpec, outSpec, start, stop):
+    keep = set(colSpec.values()) | {outSpec[0]}
+    n = outSpec[1]
+    cols = {k: np.ndarray((n,), dtype=float,
+                          buffer=_attach(name, keep).buf)[start:stop]
+            for k, name in colSpec.items()}
+    out = np.ndarray((n, len(models)), dtype=float,
+                     buffer=_attach(outSpec[0], keep).buf)
+    for j, model in enumerate(models):
+        out[start:stop, j] = model.score_batch(cols)
+    return stop - start
+
+
+class ParallelScorer(object):
+    """
+    Score cohorts against several models on a pool of worker processes
+
+    Parameters
+    ----------
+    models : list of model names (see cohort.MODELS) or model instances
+    n_workers : int
+            Number of worker processes (defaults to the CPU count)
+    chunksize : int
+            Rows per task (defaults to splitting the cohort into
+            four tasks per worker)
+    blas_threads : int or None
+            BLAS threads per worker, None leaves them unchanged
+    mp_context : str
+            multiprocessing start method ("fork", "spawn", ...)
+    """
+
+    def __init__(self, models, n_workers=None, chunksize=None,
+                 blas_threads=1, mp_context=None):
+        self.plan = CohortPlan(models)
+        self.n_workers = n_workers or os.cpu_count()
+        self.chunksize = chunksize
+        env = {k: os.environ.get(k) for k in BLAS_ENV}
+        if blas_threads is not None:
+            # spawned workers read the limits when they import numpy
+            for k in BLAS_ENV:
+                os.environ[k] = str(blas_threads)
+        try:
+            self.pool = ProcessPoolExecutor(
+                max_workers=self.n_workers,
+                mp_context=multiprocessing.get_context(mp_context),
+                initializer=_init_worker,
+                initargs=(blas_threads,))
+        finally:
+            for k, v in env.items():
+                if v is None:
+                    os.environ.pop(k, None)
+                else:
+                    os.environ[k] = v
+
+    def _ranges(self, n):
+        chunksize = self.chunksize
+        if chunksize is None:
+            chunksize = -(-n // (4 * self.n_workers))
+        chunksize = max(chunksize, 1)
+        return [(s, min(s + chunksize, n)) for s in range(0, n, chunksize)]
+
+    def score(self, data):
+        """
+        Score the cohort, returning an (n, models) risk matrix
+        """
+        cohort = as_cohort(data).load(self.plan.feat_key)
+        n = len(cohort)
+        m = len(self.plan.models)
+        segments = []
+        try:
+            colSpec = {}
+            for k in self.plan.feat_key:
+                shm = shared_memory.SharedMemory(create=True,
+                                                 size=max(n * 8, 1))
+                segments.append(shm)
+                np.ndarray((n,), dtype=float, buffer=shm.buf)[:] = cohort[k]
+                colSpec[k] = shm.name
+            outShm = shared_memory.SharedMemory(create=True,
+                                                size=max(n * m * 8, 1))
+            segments.append(outShm)
+            outSpec = (outShm.name, n)
+            futures = [self.pool.submit(_score_range, self.plan.models,
+                                        colSpec, outSpec, start, stop)
+                       for start, stop in self._ranges(n)]
+            for f in futures:
+                f.result()
+            risk = np.ndarray((n, m), dtype=float, buffer=outShm.buf).copy()
+        finally:
+            for shm in segments:
+                shm.close()
+                shm.unlink()
+        return risk
+
+    def close(self):
+        self.pool.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def score_parallel(data, models, n_workers=None, chunksize=None,
+                   blas_threads=1, mp_context=None):
+    """
+    Score a cohort against several models using a temporary
+    ParallelScorer, returning an (n, models) risk matrix
+    """
+    with ParallelScorer(models, n_workers, chunksize,
+                        blas_threads, mp_context) as scorer:
+        return scorer.score(data)
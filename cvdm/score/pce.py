@@ -5,8 +5,9 @@ https://clincalc.com/cardiology/ascvd/pooledcohort.aspx
 """
 import numpy as np
 
-from cvdm.score import cox_surv, BaseRisk
+from cvdm.score import cox_surv, cox_surv_multi, BaseRisk
 from cvdm.score import clean_age, clean_tot_chol, clean_hdl, clean_bp
+from cvdm.score.coefTable import CoefTable, branch_code
 
 
 WHITE_FEMALE  = {
@@ -90,6 +91,11 @@ BLACK_MALE  = {
     "const": 19.54
 }
 
+# indexed by branch_code(female, ac)
+PCE_COEF = CoefTable([WHITE_MALE, WHITE_FEMALE, BLACK_MALE, BLACK_FEMALE])
+# risk horizons (years) and their baseline survival
+PCE_HORIZONS = {5: "s5", 10: "s10"}
+
 
 def pce(female, ac, age, tot_chol, hdl,
         sbp, smoker, htn, diab, risk=5):
@@ -106,22 +112,22 @@ def pce(female, ac, age, tot_chol, hdl,
         cohortInfo = WHITE_FEMALE
     elif ac:
         cohortInfo = BLACK_MALE
-    age = clean_age(age)
-    tot_chol = clean_tot_chol(tot_chol)
-    hdl = clean_hdl(hdl)
-    sbp = clean_bp(sbp)
-    xFeat = np.array([np.log(age),
-                      np.log(age)**2,
-                      np.log(tot_chol),
-                      np.log(tot_chol)*np.log(age),
-                      np.log(hdl),
-                      np.log(hdl)*np.log(age),
-                      np.log(sbp)*(1-htn),
-                      np.log(age)*np.log(sbp)*(1-htn),
-                      np.log(sbp)*htn,
-                      np.log(age)*np.log(sbp)*htn,
+    age_log = np.log(clean_age(age))
+    tot_log = np.log(clean_tot_chol(tot_chol))
+    hdl_log = np.log(clean_hdl(hdl))
+    sbp_log = np.log(clean_bp(sbp))
+    xFeat = np.array([age_log,
+                      age_log**2,
+                      tot_log,
+                      tot_log*age_log,
+                      hdl_log,
+                      hdl_log*age_log,
+                      sbp_log*(1-htn),
+                      age_log*sbp_log*(1-htn),
+                      sbp_log*htn,
+                      age_log*sbp_log*htn,
                       smoker,
-                      smoker*np.log(age), 
+                      smoker*age_log,
                       diab])
     s = cox_surv(xFeat, cohortInfo["coef"],
                  cohortInfo[baseSurv],
@@ -129,6 +135,66 @@ def pce(female, ac, age, tot_chol, hdl,
     return s
 
 
+def _pce_design(cols):
+    """
+    The 13-term interaction design of pce for the Cohort cols
+    """
+    age_log = cols.log("index_age", clean_age)
+    tot_log = cols.log("chol_tot", clean_tot_chol)
+    hdl_log = cols.log("chol_hdl", clean_hdl)
+    sbp_log = cols.log("sbp", clean_bp)
+    htn = cols["htn_treat"]
+    smoker = cols["cur_smoke"]
+    xFeat = np.column_stack([age_log,
+                             age_log**2,
+                             tot_log,
+                             tot_log*age_log,
+                             hdl_log,
+                             hdl_log*age_log,
+                             sbp_log*(1-htn),
+                             age_log*sbp_log*(1-htn),
+                             sbp_log*htn,
+                             age_log*sbp_log*htn,
+                             smoker,
+                             smoker*age_log,
+                             cols["dm"]])
+    return xFeat
+
+
+def pce_batch(cols, risk=5):
+    """
+    Vectorized version of pce where cols is a
+    Cohort holding the Pce feature keys
+    """
+    if risk not in [5, 10]:
+        raise NotImplementedError("Does not support risk that is not 5 or 10")
+    baseSurv = "s10"
+    if risk == 5:
+        baseSurv = "s5"
+    cohortInfo = PCE_COEF.gather(branch_code(cols["female"], cols["AC"]))
+    return cox_surv(_pce_design(cols), cohortInfo["coef"],
+                    cohortInfo[baseSurv],
+                    cohortInfo["const"])
+
+
+def pce_horizons_batch(cols, risks=(5, 10)):
+    """
+    Risk of pce at several horizons (5 and/or 10 years) for the
+    Cohort cols, all from the same linear predictor
+
+    Returns
+    ----------
+    ndarray: (n, len(risks)) risk matrix
+    """
+    for risk in risks:
+        if risk not in PCE_HORIZONS:
+            raise NotImplementedError("Does not support risk that is not 5 or 10")
+    code = branch_code(cols["female"], cols["AC"])
+    s0 = np.column_stack([PCE_COEF[PCE_HORIZONS[risk]] for risk in risks])
+    return cox_surv_multi(_pce_design(cols), PCE_COEF["coef"][code],
+                          s0[code], PCE_COEF["const"][code])
+
+
 class Pce(BaseRisk):
     risk = None
     features = ["female",
@@ -140,6 +206,7 @@ class Pce(BaseRisk):
                            "chol_hdl", 
                            "sbp",
                            "htn_treat"]
+    config_keys = ["risk"]
 
     def __init__(self, risk = 5):
         self.risk = risk
@@ -156,6 +223,16 @@ class Pce(BaseRisk):
                    row["dm"],
                    self.risk)
 
+    def score_batch(self, data):
+        return pce_batch(self.get_feature_columns(data), self.risk)
+
+    def score_horizons(self, data, risks=(5, 10)):
+        """
+        Risk at each horizon in risks for every row, as an
+        (n, len(risks)) matrix (the 5- and 10-year risk by default)
+        """
+        return pce_horizons_batch(self.get_feature_columns(data), risks)
+
     def get_features(self, row):
         feat_dict = super().get_features(row)
         feat_dict["age_log"] = np.log(row["index_age"])
@@ -170,3 +247,20 @@ class Pce(BaseRisk):
         feat_dict["sbp_age_htn"] = feat_dict["age_log"]*np.log(row["sbp"])*row["htn_treat"]
         feat_dict["smoke_age"] = feat_dict["age_log"]*feat_dict["cur_smoke"]
         return feat_dict
+
+    def get_feature_arrays(self, cols):
+        feat = super().get_feature_arrays(cols)
+        ageLog = cols.log("index_age")
+        sbpLog = cols.log("sbp")
+        feat["age_log"] = ageLog
+        feat["age_log2"] = ageLog**2
+        feat["tot_log2"] = cols.log("chol_tot")
+        feat["tot_age"] = cols.log("chol_tot")*ageLog
+        feat["hdl_log2"] = cols.log("chol_hdl")
+        feat["hdl_age"] = cols.log("chol_hdl")*ageLog
+        feat["sbp_nhtn"] = sbpLog*(1-cols["htn_treat"])
+        feat["sbp_age_nhtn"] = ageLog*sbpLog*(1-cols["htn_treat"])
+        feat["sbp_htn"] = sbpLog*cols["htn_treat"]
+        feat["sbp_age_htn"] = ageLog*sbpLog*cols["htn_treat"]
+        feat["smoke_age"] = ageLog*feat["cur_smoke"]
+        return feat
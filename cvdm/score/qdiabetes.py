@@ -9,6 +9,7 @@ import numpy as np
 from cvdm.score import BaseRisk
 from cvdm.score import clean_age, clean_hba1c, clean_bmi, clean_diab_dur
 from cvdm.score import clean_tchdl, clean_bp
+from cvdm.score.coefTable import CoefTable, branch_apply, branch_code
 
 FEMALE_CCF = {
     "survival": np.array([0,
@@ -175,6 +176,35 @@ def _get_ethnic_cat(ac, easian):
         return 0
 
 
+# indexed by branch_code(male)
+QDIABETES_COEF = CoefTable([FEMALE_CCF, MALE_CCF])
+# years of the survival table, survival[0] is a placeholder for S(0) = 1
+SURVIVAL_YEARS = np.arange(len(FEMALE_CCF["survival"]))
+LOG_SURVIVAL = np.log(np.where(SURVIVAL_YEARS == 0, 1,
+                               QDIABETES_COEF["survival"]))
+
+# diabetes duration categories < 1, [1, 3], (3, 6], (6, 10], > 10
+DIAB_DUR_EDGES = np.array([np.nextafter(1, -np.inf), 3, 6, 10])
+# smoking category by branch_code(prev, light, moderate, heavy),
+# the heaviest recorded level wins
+SMOKE_CAT = np.array([code.bit_length() for code in range(16)])
+# ethnic category by branch_code(easian, ac)
+ETHNIC_CAT = np.array([0, 5, 7, 7])
+
+
+def _diab_dur_cat_batch(diabDur):
+    return np.searchsorted(DIAB_DUR_EDGES, diabDur)
+
+
+def _smoke_cat_batch(heavy_smoke, moderate_smoke, light_smoke, prev_smoke):
+    return SMOKE_CAT[branch_code(prev_smoke, light_smoke,
+                                 moderate_smoke, heavy_smoke)]
+
+
+def _ethnic_cat_batch(ac, easian):
+    return ETHNIC_CAT[branch_code(easian, ac)]
+
+
 def _frac_poly_female(bmi, hba1c, sbp):
     bmiDecile = bmi / 10
     bmi1 = np.power(bmiDecile, -1)
@@ -246,6 +276,77 @@ def qdiabetes(age, male, bmi, diab_dur, ac, easian,
                      renal, dmt1, genderInfo, tYear, fractalFunc)
 
 
+def _qdiabetes_lin_pred(cols, dmt1=False):
+    """
+    Linear predictor of qdiabetes and the branch_code(male)
+    of every row of the Cohort cols
+    """
+    diabDurCat = _diab_dur_cat_batch(cols.clean("diab_dur", clean_diab_dur,
+                                                min_val=0))
+    smokeCat = _smoke_cat_batch(cols["heavy_smoke"], cols["moderate_smoke"],
+                                cols["light_smoke"], cols["prev_smoke"])
+    ethnicCat = _ethnic_cat_batch(cols["AC"], cols["EAsian"])
+    age = cols.clean("index_age", clean_age)
+    bmi = cols.clean("bmi", clean_bmi)
+    hba1c = cols.clean("hba1c_mmol", clean_hba1c, meas="mmol")
+    tchdl = cols.clean("tchdl", clean_tchdl)
+    sbp = cols.clean("sbp", clean_bp)
+    code = branch_code(cols["male"])
+    # the fractional polynomials differ in form by sex
+    frac = branch_apply(code,
+                        [lambda *x: np.column_stack(_frac_poly_female(*x)),
+                         lambda *x: np.column_stack(_frac_poly_male(*x))],
+                        bmi, hba1c, sbp, shape=(6,))
+    xFeat = np.column_stack([age, frac[:, :4], tchdl, frac[:, 4:],
+                             cols["afib"], cols["cvd_hist"], cols["renal"],
+                             np.full(len(age), dmt1, dtype=float)])
+    xFeat -= QDIABETES_COEF["center"][code]
+    a = np.einsum("ij,ij->i", xFeat, QDIABETES_COEF["beta"][code])
+    a += QDIABETES_COEF["diabDur"][code, diabDurCat]
+    a += QDIABETES_COEF["smoke"][code, smokeCat]
+    a += QDIABETES_COEF["ethnic"][code, ethnicCat]
+    return a, code
+
+
+def qdiabetes_batch(cols, tYear=5, dmt1=False):
+    """
+    Vectorized version of qdiabetes where cols is a
+    Cohort holding the QDiabetes feature keys
+    """
+    a, code = _qdiabetes_lin_pred(cols, dmt1)
+    return 1 - np.power(QDIABETES_COEF["survival"][code, tYear], np.exp(a))
+
+
+def qdiabetes_horizons_batch(cols, tYears=None, dmt1=False):
+    """
+    Risk of qdiabetes at several horizons for the Cohort cols,
+    all from the same linear predictor. Fractional horizons
+    interpolate the log baseline survival (the cumulative
+    baseline hazard) linearly between whole years.
+
+    Parameters
+    ----------
+    tYears : horizons in years within [0, 15],
+             defaults to every whole year 1 to 15
+
+    Returns
+    ----------
+    ndarray: (n, len(tYears)) risk matrix
+    """
+    if tYears is None:
+        tYears = SURVIVAL_YEARS[1:]
+    tYears = np.asarray(tYears, dtype=float)
+    if np.any((tYears < 0) | (tYears > SURVIVAL_YEARS[-1])):
+        raise ValueError("Horizons must be between 0 and {} years"
+                         .format(SURVIVAL_YEARS[-1]))
+    logS0 = np.array([np.interp(tYears, SURVIVAL_YEARS, logS)
+                      for logS in LOG_SURVIVAL])
+    a, code = _qdiabetes_lin_pred(cols, dmt1)
+    risk = np.exp(a)[:, None] * logS0[code]
+    np.expm1(risk, out=risk)
+    return np.negative(risk, out=risk)
+
+
 class QDiabetes(BaseRisk):
     tYear = None
     features = ["male",
@@ -263,6 +364,7 @@ class QDiabetes(BaseRisk):
                            "moderate_smoke", 
                            "light_smoke", 
                            "prev_smoke"]
+    config_keys = ["tYear"]
 
     def __init__(self, tYear=5):
         self.tYear = tYear
@@ -286,6 +388,17 @@ class QDiabetes(BaseRisk):
                          row["renal"],
                          self.tYear)
 
+    def score_batch(self, data):
+        return qdiabetes_batch(self.get_feature_columns(data), self.tYear)
+
+    def score_horizons(self, data, tYears=None):
+        """
+        Risk at each horizon in tYears (every whole year 1 to 15
+        by default) for every row, as an (n, len(tYears)) matrix
+        """
+        return qdiabetes_horizons_batch(self.get_feature_columns(data),
+                                        tYears)
+
     def get_features(self, row):
         feat_dict = super().get_features(row)
         feat_dict["diab_dur_cat"] = _get_diab_dur_cat(row["diab_dur"])
@@ -296,5 +409,15 @@ class QDiabetes(BaseRisk):
                                                 row["prev_smoke"])
         return feat_dict
 
+    def get_feature_arrays(self, cols):
+        feat = super().get_feature_arrays(cols)
+        feat["diab_dur_cat"] = _diab_dur_cat_batch(cols["diab_dur"])
+        feat["ethnic_cat"] = _ethnic_cat_batch(cols["AC"], cols["EAsian"])
+        feat["smoke_cat"] = _smoke_cat_batch(cols["heavy_smoke"],
+                                             cols["moderate_smoke"],
+                                             cols["light_smoke"],
+                                             cols["prev_smoke"])
+        return feat
+
 
 
@@ -9,6 +9,8 @@ import tqdm
 from cvdm.score import cox_surv, BaseRisk
 from cvdm.score import clean_age, clean_bp, clean_hba1c
 from cvdm.score import clean_tot_chol, clean_hdl, clean_acr
+from cvdm.score.incremental import IncrementalCoxMixin, design_matrix
+from cvdm.score.incremental import column_term, clean_term
 
 
 ## Coefficients for CHF Recode
@@ -103,7 +105,43 @@ def recode(age, female, ethnicity, smoking, sbp,
                     coefInfo["s0"], coefInfo["const"])
 
 
-class Recode(BaseRisk):
+# design terms of the coefficients of every target
+RECODE_TERMS = [clean_term("index_age", clean_age),
+                column_term("female"),
+                column_term("AC"),
+                column_term("cur_smoke"),
+                clean_term("sbp", clean_bp),
+                column_term("cvd_hist"),
+                column_term("bpld"),
+                column_term("statin"),
+                column_term("anticoagulant"),
+                clean_term("hba1c", clean_hba1c),
+                clean_term("chol_tot", clean_tot_chol),
+                clean_term("chol_hdl", clean_hdl),
+                column_term("creat"),
+                clean_term("albumin_creat", clean_acr)]
+
+
+def _recode_info(target):
+    coefInfo = CHD_INFO
+    if target == "MI":
+        coefInfo = MI_INFO
+    if target == "STROKE":
+        coefInfo = STROKE_INFO
+    return coefInfo
+
+
+def recode_batch(cols, target="CHF"):
+    """
+    Vectorized version of recode where cols is a
+    Cohort holding the Recode feature keys
+    """
+    coefInfo = _recode_info(target)
+    return cox_surv(design_matrix(cols, RECODE_TERMS), coefInfo["coef"],
+                    coefInfo["s0"], coefInfo["const"])
+
+
+class Recode(IncrementalCoxMixin, BaseRisk):
     target = None
     features = ["index_age",
                 "female",
@@ -120,6 +158,8 @@ class Recode(BaseRisk):
                 "creat", 
                 "albumin_creat"]
     feat_key = features
+    cox_terms = RECODE_TERMS
+    config_keys = ["target"]
 
     def __init__(self, target="CHF"):
         self.target = target
@@ -140,3 +180,10 @@ class Recode(BaseRisk):
                       row["creat"], 
                       row["albumin_creat"],
                       target=self.target)
+
+    def score_batch(self, data):
+        return recode_batch(self.get_feature_columns(data), self.target)
+
+    def cox_params(self, cols):
+        coefInfo = _recode_info(self.target)
+        return coefInfo["coef"], coefInfo["s0"], coefInfo["const"], 1
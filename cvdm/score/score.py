@@ -8,6 +8,7 @@ disease in Europe: the SCORE project. European Heart Journal, 24(11), 987–1003
 import numpy as np
 
 from cvdm.score import BaseRisk, clean_chol, clean_bp
+from cvdm.score.coefTable import CoefTable, branch_code
 
 
 # coefficients for survival
@@ -24,6 +25,12 @@ HIGH_RISK_WOMEN = {'CHD': {"alpha": -28.7, "p": 6.23},
 COEFF = {'CHD': [0.71, 0.24, 0.018],
          'Non-CHD': [0.63, 0.02, 0.022]}
 
+# baseline coefficients of each component
+# indexed by branch_code(female, low_risk)
+SCORE_COEF = {k: CoefTable([HIGH_RISK_MEN[k], HIGH_RISK_WOMEN[k],
+                            LOW_RISK_MEN[k], LOW_RISK_WOMEN[k]])
+              for k in COEFF}
+
 
 def _so(age, alpha, p):
     """
@@ -80,6 +87,7 @@ class Score(BaseRisk):
                 "sbp", 
                 "chol_tot_mmol"]
     feat_key = features
+    config_keys = ["low_risk"]
 
     def __init__(self, low_risk=True):
         self.low_risk = low_risk
@@ -92,6 +100,16 @@ class Score(BaseRisk):
                      row["cur_smoke"],
                      self.low_risk)
 
+    def score_batch(self, data):
+        return score_batch(self.get_feature_columns(data), self.low_risk)
+
+    def score_regions(self, data):
+        """
+        Low risk and high risk region SCORE for every row,
+        as an (n, 2) matrix
+        """
+        return score_regions_batch(self.get_feature_columns(data))
+
 
 def score(female, age, chol_mmol, sbp, smoking, low_risk):
     sc = None
@@ -109,3 +127,46 @@ def score(female, age, chol_mmol, sbp, smoking, low_risk):
                           smoking)
     return max(0, min(sc, 1))
 
+
+def score_batch(cols, low_risk):
+    """
+    Vectorized version of score where cols is a
+    Cohort holding the Score feature keys
+    """
+    return score_regions_batch(cols, [low_risk])[:, 0]
+
+
+def score_regions_batch(cols, low_risk=(True, False)):
+    """
+    SCORE risk of the Cohort cols for several risk regions at once.
+    The measurement terms w, the age terms and their logs are shared
+    by every region, and each component's risk
+    1 - s_0(age+10)**exp(w) / s_0(age)**exp(w) is evaluated as
+    -expm1(-exp(alpha + w) * ((age-10)**p - (age-20)**p))
+
+    Parameters
+    ----------
+    low_risk : sequence of booleans, one per region
+               (low risk and high risk region by default)
+
+    Returns
+    ----------
+    ndarray: (n, len(low_risk)) risk matrix
+    """
+    age = np.fmax(cols["index_age"], 20)
+    with np.errstate(divide="ignore"):
+        logAgeNow = np.log(age - 20)
+    logAge10 = np.log(age - 10)
+    xFeat = np.column_stack([cols["cur_smoke"] != 0,
+                             cols.clean("chol_tot_mmol", clean_chol) - 6,
+                             cols.clean("sbp", clean_bp) - 120])
+    cvdRisk = np.zeros((len(age), len(low_risk)))
+    for k in COEFF:
+        w = xFeat.dot(COEFF[k])
+        for j, lowRisk in enumerate(low_risk):
+            coef = SCORE_COEF[k].gather(branch_code(cols["female"], lowRisk))
+            h = np.exp(coef["p"]*logAge10)
+            h -= np.exp(coef["p"]*logAgeNow)
+            h *= np.exp(coef["alpha"] + w)
+            cvdRisk[:, j] -= np.expm1(-h)
+    return np.clip(cvdRisk, 0, 1, out=cvdRisk)
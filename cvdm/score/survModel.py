@@ -1,23 +1,148 @@
 import numpy as np
 
 
-def cox_surv(xFeat, beta, s0, b0=0, shrinkage=1):
-    # 1 - x**exp(sum(xb))
-    xBeta = xFeat.dot(beta)
-    return 1 - s0**np.exp(shrinkage*(xBeta - b0))
+def _lin_pred(xFeat, beta, out=None):
+    """
+    Linear predictor for a single feature vector (p,)
+    or a feature matrix (n, p), optionally written into out.
+    beta is either shared (p,) or per row (n, p), e.g. gathered
+    from a CoefTable, in which case the dot product is row-wise.
+    """
+    if np.ndim(beta) == 2:
+        return np.einsum("ij,ij->i", xFeat, beta, out=out)
+    if out is None:
+        return xFeat.dot(beta)
+    return np.dot(xFeat, beta, out=out)
 
 
-def weibull_atf_surv(xFeat, beta, mu, sigma, t):
-    a = xFeat.dot(beta) + mu
-    b = (t / a) ** sigma
-    return 1 - np.exp(-b)
+def cox_surv(xFeat, beta, s0, b0=0, shrinkage=1, out=None):
+    """
+    1 - s0**exp(shrinkage*(xFeat.beta - b0)) evaluated in log space
+    as -expm1(exp(lp)*log(s0))
 
+    Parameters
+    ----------
+    xFeat : feature vector (p,) or feature matrix (n, p)
+    beta : coefficients (p,) or per-row coefficients (n, p)
+    s0 : baseline survival, scalar or per-row array (n,)
+    b0 : mean linear predictor, scalar or per-row array (n,)
+    shrinkage : shrinkage factor, scalar or per-row array (n,)
+    out : optional float array (n,) to write the risk into
+    """
+    lp = _lin_pred(xFeat, beta, out)
+    # the linear predictor is our own buffer, so it holds the risk
+    return cox_risk(lp, s0, b0, shrinkage, out=lp if np.ndim(lp) else None)
 
-def weibull_hazard(xFeat, beta, lmbda, t, rho):
-    # exp(lambda + beta * xFeat) * t^rho
-    return np.exp(lmbda + xFeat.dot(beta)) * t ** rho
 
+def cox_risk(lp, s0, b0=0, shrinkage=1, out=None):
+    """
+    cox_surv of a precomputed linear predictor xFeat.beta
 
-def weibull_surv(xFeat, beta, lmbda, t1, t2, rho):
-    return 1 - np.exp(weibull_hazard(xFeat, beta, lmbda, t1, rho) - weibull_hazard(xFeat, beta, lmbda, t2, rho))
+    Parameters
+    ----------
+    lp : linear predictor, scalar or array (n,), left unchanged
+    s0, b0, shrinkage : as in cox_surv
+    out : optional float array (n,) to write the risk into, which
+          may be lp itself
+    """
+    with np.errstate(over="ignore"):
+        if np.ndim(lp) == 0:
+            return -np.expm1(np.exp(shrinkage*(lp - b0))*np.log(s0))
+        risk = np.subtract(lp, b0, out=out)
+        risk *= shrinkage
+        np.exp(risk, out=risk)
+        risk *= np.log(s0)
+    np.expm1(risk, out=risk)
+    return np.negative(risk, out=risk)
 
+
+def cox_surv_multi(xFeat, beta, s0, b0=0, shrinkage=1):
+    """
+    cox_surv for several baseline survivals (e.g. horizons)
+    sharing one linear predictor
+
+    Parameters
+    ----------
+    xFeat : feature matrix (n, p)
+    beta : coefficients (p,) or per-row coefficients (n, p)
+    s0 : baseline survivals, shared (h,) or per row (n, h)
+    b0 : mean linear predictor, scalar or per-row array (n,)
+    shrinkage : shrinkage factor, scalar or per-row array (n,)
+
+    Returns
+    ----------
+    ndarray: (n, h) risk matrix
+    """
+    lp = _lin_pred(xFeat, beta)
+    lp -= b0
+    lp *= shrinkage
+    with np.errstate(over="ignore"):
+        hr = np.exp(lp, out=lp)
+        risk = hr[:, None] * np.log(s0)
+    np.expm1(risk, out=risk)
+    return np.negative(risk, out=risk)
+
+
+def weibull_atf_surv(xFeat, beta, mu, sigma, t, out=None):
+    """
+    1 - exp(-(t / (xFeat.beta + mu))**sigma)
+
+    Parameters
+    ----------
+    xFeat : feature vector (p,) or feature matrix (n, p)
+    t : time, scalar or per-row array (n,)
+    out : optional float array (n,) to write the risk into
+    """
+    a = _lin_pred(xFeat, beta, out)
+    if np.ndim(a) == 0:
+        return -np.expm1(-(t / (a + mu)) ** sigma)
+    a += mu
+    np.divide(t, a, out=a)
+    np.power(a, sigma, out=a)
+    np.negative(a, out=a)
+    np.expm1(a, out=a)
+    return np.negative(a, out=a)
+
+
+def weibull_hazard(xFeat, beta, lmbda, t, rho, out=None):
+    """
+    Cumulative hazard exp(lambda + xFeat.beta) * t^rho
+
+    Parameters
+    ----------
+    xFeat : feature vector (p,) or feature matrix (n, p)
+    t : time, scalar or per-row array (n,)
+    out : optional float array (n,) to write the hazard into
+    """
+    lp = _lin_pred(xFeat, beta, out)
+    if np.ndim(lp) == 0:
+        return np.exp(lmbda + lp) * t ** rho
+    lp += lmbda
+    np.exp(lp, out=lp)
+    lp *= np.power(t, rho)
+    return lp
+
+
+def weibull_surv(xFeat, beta, lmbda, t1, t2, rho, out=None):
+    """
+    Probability of the event between t1 and t2 given
+    survival to t1, 1 - exp(H(t1) - H(t2)), evaluated as
+    -expm1(-exp(lambda + xFeat.beta) * (t2^rho - t1^rho))
+
+    Parameters
+    ----------
+    xFeat : feature vector (p,) or feature matrix (n, p)
+    t1, t2 : times, scalar or per-row arrays (n,)
+    out : optional float array (n,) to write the risk into
+    """
+    dt = np.power(t2, rho) - np.power(t1, rho)
+    lp = _lin_pred(xFeat, beta, out)
+    with np.errstate(over="ignore"):
+        if np.ndim(lp) == 0:
+            return -np.expm1(-np.exp(lmbda + lp) * dt)
+        lp += lmbda
+        np.exp(lp, out=lp)
+        lp *= dt
+    np.negative(lp, out=lp)
+    np.expm1(lp, out=lp)
+    return np.negative(lp, out=lp)
@@ -21,3 +21,20 @@ def test_advance_json():
                     "nonhdl_mmol": 3.3,
                     "htn_treat": True})
     npt.assert_almost_equal(tmp, 0.062, decimal=3)
+
+
+def test_advance_batch():
+    ad = Advance()
+    tmp = ad.score_batch({"diab_age": [50, 50],
+                          "female": [False, True],
+                          "diab_dur": [3, 3],
+                          "pp": [50, 50],
+                          "retinopathy": [True, True],
+                          "afib": [True, True],
+                          "hba1c": [7, 7],
+                          "albumin_creat": [50, 50],
+                          "nonhdl_mmol": [3.3, 3.3],
+                          "htn_treat": [True, True]})
+    npt.assert_almost_equal(tmp[0], 0.062, decimal=3)
+    npt.assert_almost_equal(tmp[1], advance(50, True, 3, 50, True, True,
+                                            7, 50, 3.3, True))
@@ -23,3 +23,45 @@ def test_aric_json():
                     "htn_treat": False,
                     "cur_smoke": False})
     npt.assert_almost_equal(tmp, 0.03169, decimal=5)
+
+
+def test_aric_batch():
+    ar = Aric()
+    tmp = ar.score_batch({"male": [False, False, True],
+                          "index_age": [53, 53, 60],
+                          "Cauc": [False, True, True],
+                          "chol_tot": [190, 190, 220],
+                          "chol_hdl": [50, 50, 40],
+                          "sbp": [140, 140, 140],
+                          "htn_treat": [False, False, True],
+                          "cur_smoke": [False, False, False]})
+    npt.assert_almost_equal(tmp, [0.03169, 0.04571, 0.38077], decimal=5)
+
+
+def test_aric_feature_matrix():
+    xFeat, names = Aric().get_feature_matrix({"index_age": [50, 60],
+                                              "male": [True, False],
+                                              "Cauc": [True, True],
+                                              "sbp": [120, 140],
+                                              "htn_treat": [False, True],
+                                              "cur_smoke": [False, False],
+                                              "chol_tot": [250, 290],
+                                              "chol_hdl": [47, 40]})
+    npt.assert_equal(xFeat[:, names.index("tc_279")], [1, 0])
+    npt.assert_equal(xFeat[:, names.index("tc_280")], [0, 1])
+    npt.assert_equal(xFeat[:, names.index("hdl_49")], [1, 0])
+    npt.assert_equal(xFeat[:, names.index("age_sq")], [2500, 3600])
+
+
+def test_aric_band_edges():
+    # band edges and the gaps between the published bands
+    tc = [199.5, 200, 279, 279.5, 280]
+    hdl = [44.5, 45, 49, 49.5, 50]
+    rows = [{"male": True, "index_age": 55, "Cauc": True, "chol_tot": t,
+             "chol_hdl": h, "sbp": 130, "htn_treat": False,
+             "cur_smoke": True} for t, h in zip(tc, hdl)]
+    ar = Aric()
+    tmp = ar.score_batch({k: [r[k] for r in rows] for k in rows[0]})
+    npt.assert_almost_equal(tmp, [ar.score(r) for r in rows])
+    npt.assert_almost_equal(tmp, [aric(55, True, True, t, h, 130, False, True)
+                                  for t, h in zip(tc, hdl)])
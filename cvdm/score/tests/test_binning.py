@@ -0,0 +1,17 @@
+import numpy as np
+import numpy.testing as npt
+
+from cvdm.score.binning import BinTable
+
+
+def test_bin_table():
+    # < 10, 10-20 inclusive, > 20 with the last band as reference
+    table = BinTable([10, np.nextafter(20, np.inf)], [0, 1, -1], ["lo", "mid"])
+    x = np.array([5, 10, 20, 20.5, np.nan])
+    npt.assert_equal(table.bin(x), [0, 1, 1, 2, 3])
+    npt.assert_equal(table.indicators(x),
+                     [[1, 0], [0, 1], [0, 1], [0, 0], [0, 0]])
+    npt.assert_equal(table.indicators(15), [0, 1])
+    feat = table.named(x)
+    npt.assert_equal(feat["mid"], [0, 1, 1, 0, 0])
+    npt.assert_raises(ValueError, BinTable, [10], [0], ["lo"])
@@ -0,0 +1,100 @@
+import threading
+
+import numpy as np
+import numpy.testing as npt
+
+from cvdm.score import CachedRisk, ScoreCache, Pce, HkdrPanel
+from cvdm.score import GridRisk, HkdrStroke
+
+
+ROW = {"female": False,
+       "AC": False,
+       "index_age": 60,
+       "chol_tot": 150,
+       "chol_hdl": 65,
+       "sbp": 120,
+       "cur_smoke": False,
+       "dm": True,
+       "htn_treat": False}
+
+
+def test_cached_risk():
+    model = CachedRisk(Pce(risk=10))
+    tmp = model.score(ROW)
+    npt.assert_almost_equal(tmp, Pce(risk=10).score(ROW))
+    # other keys and equivalent values hit the cache
+    assert model.score(dict(ROW, dm=1.0, visit="2024-01-01")) == tmp
+    assert model.cache.info() == {"hits": 1, "misses": 1,
+                                  "size": 1, "maxsize": 1024}
+    model.score(dict(ROW, sbp=140))
+    assert model.cache.misses == 2
+    model.cache.clear()
+    assert len(model.cache) == 0 and model.cache.hits == 0
+
+
+def test_score_cache_config():
+    cache = ScoreCache()
+    five = CachedRisk(Pce(risk=5), cache)
+    ten = CachedRisk(Pce(risk=10), cache)
+    assert five.score(ROW) != ten.score(ROW)
+    assert cache.misses == 2 and len(cache) == 2
+
+
+def test_score_cache_key():
+    cache = ScoreCache()
+    model = Pce()
+    # instance state outside config_keys neither breaks nor splits the key
+    model.weights = np.array([1, 2])
+    assert cache.score(model, ROW) == cache.score(Pce(), ROW)
+    assert cache.hits == 1
+    grid = GridRisk(HkdrStroke(), {"index_age": [40, 80], "hba1c": [5, 12],
+                                   "chd": [0, 1],
+                                   "albumin_creat_mgmmol": [0.1, 300]})
+    row = {"index_age": 60, "hba1c": 8, "chd": 1, "albumin_creat_mgmmol": 2}
+    cache.score(grid, row)
+    cache.score(HkdrStroke(), row)
+    assert cache.misses == 3
+
+
+def test_score_cache_lru():
+    cache = ScoreCache(maxsize=2)
+    model = Pce()
+    for age in [50, 60, 50, 70]:
+        cache.score(model, dict(ROW, index_age=age))
+    # 60 was the least recently used when 70 came in
+    assert cache.hits == 1 and len(cache) == 2
+    cache.score(model, dict(ROW, index_age=50))
+    assert cache.hits == 2
+    cache.score(model, dict(ROW, index_age=60))
+    assert cache.misses == 4
+
+
+def test_score_cache_array():
+    row = {"index_age": 59, "female": True, "cur_smoke": False,
+           "diab_dur": 5, "egfr": 105, "albumin_creat_mgmmol": 2.3,
+           "nonhdl_mmol": 3.87, "bmi": 32, "hba1c": 8, "hb": 13.8,
+           "chd": True}
+    cache = ScoreCache()
+    tmp = cache.score(HkdrPanel(), row)
+    assert not tmp.flags.writeable
+    npt.assert_equal(cache.score(HkdrPanel(), row), tmp)
+    assert cache.hits == 1
+
+
+def test_score_cache_threads():
+    model = CachedRisk(Pce(), maxsize=8)
+    rows = [dict(ROW, index_age=age) for age in range(40, 56)]
+
+    def work():
+        for row in rows * 20:
+            model.score(row)
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    info = model.cache.info()
+    assert info["hits"] + info["misses"] == 4 * 20 * len(rows)
+    assert info["size"] == 8
+    npt.assert_almost_equal(model.score(rows[-1]), Pce().score(rows[-1]))
+    assert np.isscalar(model.score(rows[-1]))
@@ -0,0 +1,105 @@
+import json
+
+import numpy.testing as npt
+import pytest
+
+from cvdm.score import Pce
+from cvdm.score.cli import main, parse_model, score_file
+
+pd = pytest.importorskip("pandas")
+
+
+ROWS = [{"id": i,
+         "female": i % 2 == 0,
+         "AC": i % 3 == 0,
+         "index_age": 40 + i,
+         "chol_tot": 150 + i,
+         "chol_hdl": 50,
+         "sbp": 120 + i,
+         "cur_smoke": i % 4 == 0,
+         "dm": True,
+         "htn_treat": i % 5 == 0,
+         "bmi": 25 + i / 10}
+        for i in range(25)]
+
+
+def test_parse_model():
+    model = parse_model("pce:risk=10")
+    assert isinstance(model, Pce)
+    assert model.risk == 10
+    assert parse_model("dcs:target=MI").target == "MI"
+    with pytest.raises(ValueError):
+        parse_model("unknown")
+
+
+@pytest.mark.parametrize("ext", [".csv", ".jsonl"])
+def test_cli(tmp_path, ext):
+    df = pd.DataFrame(ROWS)
+    infile = str(tmp_path / ("cohort" + ext))
+    outfile = str(tmp_path / ("scores" + ext))
+    if ext == ".csv":
+        df.to_csv(infile, index=False)
+    else:
+        with open(infile, "w") as f:
+            f.writelines(json.dumps(r) + "\n" for r in ROWS)
+    main([infile, outfile, "-m", "pce:risk=10", "frs_simple",
+          "-k", "id", "-c", "7", "-q"])
+    if ext == ".csv":
+        out = pd.read_csv(outfile)
+    else:
+        out = pd.read_json(outfile, lines=True)
+    assert list(out.columns) == ["id", "pce:risk=10", "frs_simple"]
+    npt.assert_equal(out["id"].to_numpy(), df["id"].to_numpy())
+    npt.assert_allclose(out["pce:risk=10"], Pce(risk=10).score_batch(df))
+
+
+def test_cli_parquet(tmp_path):
+    pytest.importorskip("pyarrow")
+    df = pd.DataFrame(ROWS)
+    infile = str(tmp_path / "cohort.parquet")
+    outfile = str(tmp_path / "scores.csv")
+    df.to_parquet(infile)
+    main([infile, outfile, "-m", "pce", "-c", "10", "-q"])
+    out = pd.read_csv(outfile)
+    npt.assert_allclose(out["pce"], Pce().score_batch(df))
+
+
+def test_cli_dedup(tmp_path, capsys):
+    df = pd.DataFrame(ROWS + ROWS)
+    infile = str(tmp_path / "cohort.csv")
+    outfile = str(tmp_path / "scores.csv")
+    df.to_csv(infile, index=False)
+    score_file(infile, outfile, ["pce"], chunksize=50, dedup=True)
+    out = pd.read_csv(outfile)
+    npt.assert_allclose(out["pce"], Pce().score_batch(df))
+    assert "25 unique of 50 rows (2.0x collapse)" in capsys.readouterr().err
+
+
+def test_cli_empty(tmp_path):
+    pytest.importorskip("pyarrow")
+    # a Parquet file without rows yields no chunk at all
+    infile = str(tmp_path / "cohort.parquet")
+    outfile = str(tmp_path / "scores.csv")
+    pd.DataFrame(ROWS)[:0].to_parquet(infile)
+    assert score_file(infile, outfile, ["pce"], keep=["id"],
+                      progress=False) == 0
+    out = pd.read_csv(outfile)
+    assert list(out.columns) == ["id", "pce"] and len(out) == 0
+
+
+def test_cli_parquet_schema(tmp_path):
+    pytest.importorskip("pyarrow")
+    df = pd.DataFrame(ROWS)
+    # an integer column that is missing in later chunks
+    df["site"] = pd.array([i if i < 10 else None for i in range(25)],
+                          dtype="Int64")
+    infile = str(tmp_path / "cohort.csv")
+    outfile = str(tmp_path / "scores.parquet")
+    df.to_csv(infile, index=False)
+    score_file(infile, outfile, ["pce"], chunksize=10, keep=["id", "site"],
+               progress=False)
+    import pyarrow.parquet as pq
+    assert str(pq.read_schema(outfile).field("site").type) == "int64"
+    out = pd.read_parquet(outfile)
+    assert out["site"].isna().sum() == 15
+    npt.assert_allclose(out["pce"], Pce().score_batch(df))
@@ -0,0 +1,59 @@
+import numpy as np
+import numpy.testing as npt
+
+from cvdm.score import Cohort, cox_surv
+from cvdm.score.coefTable import CoefTable, branch_apply, branch_code, partition
+from cvdm.score.pce import PCE_COEF, WHITE_MALE, BLACK_FEMALE
+
+
+def test_branch_code():
+    npt.assert_equal(branch_code([False, True, False, True],
+                                 [False, False, True, True]), [0, 1, 2, 3])
+    npt.assert_equal(branch_code([0, 1], True), [2, 3])
+
+
+def test_coef_table():
+    table = CoefTable([{"coef": np.array([1., 2.]), "s0": 0.9},
+                       {"coef": np.array([3., 4.]), "s0": 0.8}])
+    assert len(table) == 2
+    assert table["coef"].shape == (2, 2)
+    tmp = table.gather(np.array([1, 0, 1]))
+    npt.assert_equal(tmp["coef"], [[3, 4], [1, 2], [3, 4]])
+    npt.assert_equal(tmp["s0"], [0.8, 0.9, 0.8])
+
+
+def test_cox_surv_gather():
+    xFeat = np.random.default_rng(0).uniform(0, 1, (2, 13))
+    tmp = PCE_COEF.gather(np.array([0, 3]))
+    s = cox_surv(xFeat, tmp["coef"], tmp["s10"], tmp["const"])
+    npt.assert_almost_equal(s[0], cox_surv(xFeat[0], WHITE_MALE["coef"],
+                                           WHITE_MALE["s10"],
+                                           WHITE_MALE["const"]))
+    npt.assert_almost_equal(s[1], cox_surv(xFeat[1], BLACK_FEMALE["coef"],
+                                           BLACK_FEMALE["s10"],
+                                           BLACK_FEMALE["const"]))
+
+
+def test_partition():
+    rows = partition(np.array([2, 0, 2, 1, 0]), 4)
+    assert len(rows) == 4
+    npt.assert_equal(rows[0], [1, 4])
+    npt.assert_equal(rows[1], [3])
+    npt.assert_equal(rows[2], [0, 2])
+    assert len(rows[3]) == 0
+
+
+def test_branch_apply():
+    code = np.array([1, 0, 1, 0])
+    x = np.arange(4.)
+    tmp = branch_apply(code, [lambda v: -v, lambda v: v**2], x)
+    npt.assert_equal(tmp, [0, -1, 4, -3])
+    tmp = branch_apply(code, [lambda v: np.column_stack([v, v]),
+                              lambda v: np.column_stack([v, 2*v])], x)
+    npt.assert_equal(tmp, [[0, 0], [1, 1], [2, 4], [3, 3]])
+    cols = Cohort({"x": x})
+    tmp = branch_apply(code, [lambda c: c["x"], lambda c: c["x"] + 10], cols)
+    npt.assert_equal(tmp, [10, 1, 12, 3])
+    npt.assert_raises(ValueError, branch_apply, code, [np.negative], x)
+    tmp = branch_apply(code[:0], [np.negative, np.negative], x[:0], shape=(2,))
+    assert tmp.shape == (0, 2)
@@ -0,0 +1,95 @@
+import numpy as np
+import numpy.testing as npt
+import pytest
+
+from cvdm.score import Cohort, CohortPlan, score_cohort
+from cvdm.score.cohort import unique_rows
+from cvdm.score import clean_age, Pce, FrsPrimary, HkdrCHD
+
+
+COLS = {"female": [False, True, True],
+        "AC": [False, False, True],
+        "index_age": [60, 61, 15],
+        "chol_tot": [150, 180, 150],
+        "chol_hdl": [65, 47, 65],
+        "sbp": [120, 124, 120],
+        "cur_smoke": [False, True, False],
+        "dm": [True, False, True],
+        "htn_treat": [False, False, False],
+        "diab_dur": [5, 5, 2],
+        "egfr": [105, 105, 60],
+        "albumin_creat_mgmmol": [2.3, 2.3, 0.5],
+        "nonhdl_mmol": [3.87, 3.87, 4.1]}
+
+
+def test_cohort_shared():
+    cohort = Cohort(COLS)
+    age_log = cohort.log("index_age", clean_age)
+    assert age_log is cohort.log("index_age", clean_age)
+    npt.assert_almost_equal(age_log, np.log([60, 61, 18]))
+    npt.assert_almost_equal(cohort.log10("albumin_creat_mgmmol", offset=1),
+                            np.log10([3.3, 3.3, 1.5]))
+    assert not age_log.flags.writeable
+    assert "sbp" in cohort
+    assert "bmi" not in cohort
+    npt.assert_equal(cohort.take([0, 2])["index_age"], [60, 15])
+
+
+def test_score_cohort():
+    tmp = score_cohort(COLS, ["pce", "frs_primary", "hkdr_chd"])
+    assert tmp.shape == (3, 3)
+    npt.assert_allclose(tmp[:, 0], Pce().score_batch(COLS))
+    npt.assert_allclose(tmp[:, 1], FrsPrimary().score_batch(COLS))
+    npt.assert_allclose(tmp[:, 2], HkdrCHD().score_batch(COLS))
+    npt.assert_almost_equal(tmp[1, 1], 0.1048, decimal=4)
+    plan = CohortPlan([Pce(risk=10), "hkdr_chd"])
+    tmp = plan.run(COLS)
+    npt.assert_almost_equal(tmp[0, 0], 0.093, decimal=3)
+
+
+class _LabelledPce(Pce):
+    # an unrelated attribute named outcomes
+    outcomes = ["ascvd"]
+
+
+def test_score_cohort_multi_outcome():
+    tmp = score_cohort(COLS, [_LabelledPce()])
+    npt.assert_allclose(tmp[:, 0], Pce().score_batch(COLS))
+    flagged = Pce()
+    flagged.multi_outcome = True
+    with pytest.raises(TypeError):
+        CohortPlan([flagged])
+
+
+def test_score_cohort_missing():
+    with pytest.raises(KeyError, match="hba1c"):
+        score_cohort(COLS, ["pce", "dmcx"])
+    with pytest.raises(KeyError, match=r"\['hba1c', 'bmi'\]"):
+        Cohort(COLS).load(["sbp", "hba1c", "bmi"])
+    with pytest.raises(ValueError):
+        score_cohort(COLS, ["unknown"])
+
+
+def test_score_cohort_dedup():
+    cols = {k: np.tile(v, 4) for k, v in COLS.items()}
+    plan = CohortPlan(["pce", Pce(risk=10), "hkdr_chd"], dedup=True)
+    tmp = plan.run(cols)
+    npt.assert_allclose(tmp, score_cohort(cols, plan.models))
+    assert plan.unique_counts == [3, 3, 3]
+    npt.assert_almost_equal(plan.collapse_ratio, [4, 4, 4])
+    npt.assert_allclose(score_cohort(cols, ["pce"], dedup=True)[:, 0],
+                        Pce().score_batch(cols))
+
+
+def test_unique_rows():
+    cohort = Cohort({"a": [1, 2, 1, np.nan, np.nan, 1],
+                     "b": [0, 0, 0, 1, 1, 1]})
+    uniq, inverse = unique_rows(cohort, ["a", "b"])
+    assert len(uniq["a"]) == 4
+    npt.assert_equal(uniq["a"][inverse], cohort["a"])
+    npt.assert_equal(uniq["b"][inverse], cohort["b"])
+    # enough distinct values to overflow a single mixed-radix code
+    big = Cohort({k: np.arange(1000.) % (997 + i) for i, k in enumerate("cdefgh")})
+    uniq, inverse = unique_rows(big, list("cdefgh"))
+    assert len(uniq["h"]) == 1000
+    npt.assert_equal(uniq["h"][inverse], big["h"])
@@ -1,4 +1,5 @@
 import numpy.testing as npt
+import pytest
 
 from cvdm.score import darts, Darts
 
@@ -27,3 +28,48 @@ def test_darts_class():
                        "htn_treat": False,
                        "height_m": 1.7})
     npt.assert_almost_equal(tmp, 0.54, decimal=2)
+
+
+def test_darts_batch():
+    model = Darts(5)
+    tmp = model.score_batch({"diab_age": [59, 59],
+                             "diab_dur": [6, 6],
+                             "chol_tot_mmol": [5.8, 5.8],
+                             "prev_smoke": [False, False],
+                             "cur_smoke": [True, False],
+                             "male": [True, True],
+                             "hba1c": [8, 8],
+                             "5y_follow": [True, True],
+                             "sbp": [160, 160],
+                             "htn_treat": [False, False],
+                             "height_m": [1.7, 1.7]})
+    npt.assert_almost_equal(tmp[0], 0.54, decimal=2)
+    npt.assert_almost_equal(tmp[1], darts(59, 6, 5.8, 0, 0, 1,
+                                          8, 1, 160, 0, 1.7, 5))
+
+
+def test_darts_horizons():
+    cols = {"diab_age": [59, 50],
+            "diab_dur": [6, 0.5],
+            "chol_tot_mmol": [5.8, 4.9],
+            "prev_smoke": [False, True],
+            "cur_smoke": [True, False],
+            "male": [True, False],
+            "hba1c": [8, 7],
+            "5y_follow": [True, False],
+            "sbp": [160, 130],
+            "htn_treat": [False, True],
+            "height_m": [1.7, 1.6]}
+    tmp = Darts().score_horizons(cols, tYears=[1, 5, 10])
+    assert tmp.shape == (2, 3)
+    for j, t in enumerate([1, 5, 10]):
+        npt.assert_almost_equal(tmp[:, j], Darts(t).score_batch(cols))
+    del cols["5y_follow"]
+    tmp = Darts().score_horizons(cols, tYears=[5, 10], follow5_from_t=True)
+    for j, t in enumerate([5, 10]):
+        cols["5y_follow"] = [t > 5, t > 5]
+        npt.assert_almost_equal(tmp[:, j], Darts(t).score_batch(cols))
+    assert Darts().score_horizons(cols).shape == (2, 10)
+    del cols["5y_follow"], cols["hba1c"]
+    with pytest.raises(KeyError, match="hba1c"):
+        Darts().score_horizons(cols, follow5_from_t=True)
@@ -97,3 +97,26 @@ def test_dcs_json():
                       "diab_dur": 5,
                       "htn_treat": False})
     npt.assert_almost_equal(tmp, 0.175, decimal=3)
+
+
+def test_dcs_batch():
+    cols = {"diab_age": [55, 55, 55],
+            "female": [False, True, True],
+            "prev_smoke": [False, False, False],
+            "cur_smoke": [False, False, False],
+            "hba1c": [8, 8, 8],
+            "sbp": [120, 120, 120],
+            "Maori": [False, False, False],
+            "EAsian": [False, False, False],
+            "Pacific": [False, False, False],
+            "IndoAsian": [False, False, False],
+            "ODcs": [True, True, True],
+            "tchdl": [4.3, 4.3, 4.3],
+            "microalbum": [False, False, True],
+            "macroalbum": [False, False, False],
+            "diab_dur": [5, 5, 5],
+            "htn_treat": [False, False, False]}
+    tmp = Dcs("CVD").score_batch(cols)
+    npt.assert_almost_equal(tmp, [0.172, 0.147, 0.175], decimal=3)
+    tmp = Dcs("MI").score_batch(cols)
+    npt.assert_almost_equal(tmp[[0, 2]], [0.071, 0.065], decimal=3)
@@ -1,3 +1,4 @@
+import numpy as np
 import numpy.testing as npt
 
 from cvdm.score import dial, Dial
@@ -28,3 +29,80 @@ def test_dial_json():
                       "insulin": False})
     npt.assert_almost_equal(tmp, 0.0248, decimal=4)
 
+
+
+def test_dial_batch():
+    dial = Dial()
+    tmp = dial.score_batch({"index_age": [55, 55],
+                            "male": [True, False],
+                            "bmi": [27, 27],
+                            "cur_smoke": [False, True],
+                            "sbp": [150, 150],
+                            "nonhdl_mmol": [5, 5],
+                            "hba1c_mmol": [55, 55],
+                            "egfr": [70, 70],
+                            "microalbum": [False, False],
+                            "macroalbum": [False, False],
+                            "diab_dur": [5, 5],
+                            "cvd_hist": [True, True],
+                            "insulin": [False, False]})
+    npt.assert_almost_equal(tmp[0], 0.0248, decimal=4)
+    npt.assert_almost_equal(tmp[1], dial.score({"index_age": 55,
+                                                "male": False,
+                                                "bmi": 27,
+                                                "cur_smoke": True,
+                                                "sbp": 150,
+                                                "nonhdl_mmol": 5,
+                                                "hba1c_mmol": 55,
+                                                "egfr": 70,
+                                                "microalbum": False,
+                                                "macroalbum": False,
+                                                "diab_dur": 5,
+                                                "cvd_hist": True,
+                                                "insulin": False}))
+
+
+def test_dial_lifetime():
+    row = {"index_age": 55,
+           "male": True,
+           "bmi": 27,
+           "cur_smoke": False,
+           "sbp": 150,
+           "nonhdl_mmol": 5,
+           "hba1c_mmol": 55,
+           "egfr": 70,
+           "microalbum": False,
+           "macroalbum": False,
+           "diab_dur": 5,
+           "cvd_hist": True,
+           "insulin": False}
+    cols = {k: [v, v] for k, v in row.items()}
+    cols["index_age"] = [55, 94]
+    surv, lifeYears = Dial().score_lifetime(cols)
+    # the last year of the table is a single annual step
+    npt.assert_almost_equal(surv[1], 1 - Dial().score(dict(row, index_age=94)))
+    npt.assert_almost_equal(lifeYears[1], (1 + surv[1]) / 2)
+    assert surv[0] < surv[1] and 0 < lifeYears[0] <= 40
+    surv, lifeYears = Dial().score_lifetime(cols, [0, np.log(0.75)])
+    assert surv.shape == (2, 2)
+    assert (surv[:, 1] > surv[:, 0]).all()
+    assert (lifeYears[:, 1] > lifeYears[:, 0]).all()
+
+
+def test_dial_fractional_age():
+    row = {"index_age": 55.5,
+           "male": False,
+           "bmi": 27,
+           "cur_smoke": True,
+           "sbp": 150,
+           "nonhdl_mmol": 5,
+           "hba1c_mmol": 55,
+           "egfr": 70,
+           "microalbum": False,
+           "macroalbum": False,
+           "diab_dur": 5,
+           "cvd_hist": True,
+           "insulin": False}
+    tmp = Dial().score(row)
+    npt.assert_almost_equal(Dial().score_batch({k: [v] for k, v in row.items()}),
+                            [tmp])
@@ -35,3 +35,22 @@ def test_dmcx_json():
                     "insulin": False,
                     "a_glucose": False})
     npt.assert_almost_equal(tmp, 0.03, decimal=2)
+
+
+def test_dmcx_batch():
+    dm = Dmcx()
+    tmp = dm.score_batch({"index_age": [55, 55, 65, 65],
+                          "female": [True, False, True, False],
+                          "cur_smoke": [False, False, True, True],
+                          "hba1c": [7, 7, 9, 9],
+                          "bmi": [28, 28, 30, 30],
+                          "sbp": [120, 120, 200, 200],
+                          "dbp": [60, 60, 80, 80],
+                          "egfr": [80, 80, 80, 80],
+                          "tchdl": [4.3, 4.3, 4.3, 4.3],
+                          "albumin_creat_mgmmol": [2.0, 2.0, 4.0, 4.0],
+                          "diab_dur": [5, 5, 5, 5],
+                          "htn_treat": [False, False, True, True],
+                          "insulin": [False, False, True, True],
+                          "a_glucose": [False, False, True, True]})
+    npt.assert_almost_equal(tmp, [0.03, 0.06, 0.28, 0.38], decimal=2)
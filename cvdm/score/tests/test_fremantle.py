@@ -19,3 +19,18 @@ def test_fremantle_json():
                      "SEuro": True,
                      "Abor": False})
     npt.assert_almost_equal(tmp, 0.062, decimal=3)
+
+
+def test_fremantle_batch():
+    fr = Fremantle()
+    tmp = fr.score_batch({"index_age": [59, 59],
+                          "male": [True, False],
+                          "cvd_hist": [True, True],
+                          "hba1c": [8, 8],
+                          "albumin_creat_mgmmol": [0.92, 0.92],
+                          "chol_hdl_mmol": [0.79, 0.79],
+                          "SEuro": [True, True],
+                          "Abor": [False, False]})
+    npt.assert_almost_equal(tmp[0], 0.062, decimal=3)
+    npt.assert_almost_equal(tmp[1], fremantle(59, False, True, 8, 0.92,
+                                              0.79, True, False))
@@ -49,3 +49,30 @@ def test_frs_simple_json():
                      "dm": False,
                      "cur_smoke": True})
     npt.assert_almost_equal(tmp, 0.029352227213368165, decimal=5)
+
+
+def test_frs_primary_batch():
+    frs = FrsPrimary()
+    tmp = frs.score_batch({"female": [True, False],
+                           "index_age": [61, 53],
+                           "chol_tot": [180, 161],
+                           "chol_hdl": [47, 55],
+                           "sbp": [124, 125],
+                           "htn_treat": [False, True],
+                           "dm": [False, True],
+                           "cur_smoke": [True, False]})
+    npt.assert_almost_equal(tmp, [0.1048, 0.1562], decimal=4)
+
+
+def test_frs_simple_batch():
+    frs = FrsSimple()
+    tmp = frs.score_batch({"female": [True, False],
+                           "index_age": [35, 35],
+                           "bmi": [24.3, 24.3],
+                           "sbp": [122, 122],
+                           "htn_treat": [False, False],
+                           "dm": [False, False],
+                           "cur_smoke": [True, True]})
+    npt.assert_almost_equal(tmp[0], 0.029352227213368165, decimal=5)
+    npt.assert_almost_equal(tmp[1], frs_simple(False, 35, 24.3, 122,
+                                               False, True, False))
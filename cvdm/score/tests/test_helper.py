@@ -0,0 +1,41 @@
+import numpy as np
+import numpy.testing as npt
+
+from cvdm.score import clean_age, clean_hba1c, clean_hdl, clean_height
+
+
+def test_clean_scalar():
+    assert clean_age(15) == 18
+    assert clean_age(40) == 40
+    assert clean_hba1c(2, meas="mmol") == 9
+    assert clean_hdl(0.001, meas="mmol") == 0.01
+
+
+def test_clean_array():
+    tmp = clean_age(np.array([15, 40, np.nan]))
+    npt.assert_equal(tmp, [18, 40, 18])
+    npt.assert_equal(clean_hba1c([2, 5]), [3, 5])
+    npt.assert_equal(clean_hba1c([2, 50], meas="mmol"), [9, 50])
+    npt.assert_almost_equal(clean_hdl([0.1, 50]), [0.3867, 50])
+    npt.assert_equal(clean_height([0.1, 1.8]), [0.2, 1.8])
+    npt.assert_equal(clean_height([5, 70], meas="in"), [7.87, 70])
+
+
+def test_clean_inplace_mask():
+    age = np.array([15.0, 40.0, 17.0])
+    tmp, mask = clean_age(age, inplace=True, return_mask=True)
+    assert tmp is age
+    npt.assert_equal(age, [18, 40, 18])
+    npt.assert_equal(mask, [True, False, True])
+    hba1c = np.array([2.0, 5.0])
+    tmp = clean_hba1c(hba1c)
+    npt.assert_equal(hba1c, [2, 5])
+    npt.assert_equal(tmp, [3, 5])
+    # integer columns are copied rather than failing to hold the floor
+    hdl = np.array([0, 70])
+    tmp = clean_hdl(hdl, inplace=True)
+    assert tmp is not hdl
+    npt.assert_equal(hdl, [0, 70])
+    npt.assert_almost_equal(tmp, [0.3867, 70])
+    height = np.array([0, 2])
+    npt.assert_almost_equal(clean_height(height, inplace=True), [0.2, 2])
@@ -1,7 +1,11 @@
+import numpy as np
 import numpy.testing as npt
+import pytest
 
+from cvdm.score import Cohort, Pce, score_cohort
 from cvdm.score import hkdr_chd, HkdrCHD
 from cvdm.score import hkdr_hf, HkdrHF
+from cvdm.score import hkdr_stroke, HkdrStroke, HkdrPanel
 
 
 def test_hkdr_chd():
@@ -40,3 +44,62 @@ def test_hkdr_hf_json():
                     "hb": 13.8,
                     "chd": True})
     npt.assert_almost_equal(tmp, 0.024, decimal=3)
+
+
+def test_hkdr_batch():
+    chd = HkdrCHD()
+    tmp = chd.score_batch({"index_age": [59],
+                           "female": [True],
+                           "cur_smoke": [False],
+                           "diab_dur": [5],
+                           "egfr": [105],
+                           "albumin_creat_mgmmol": [2.3],
+                           "nonhdl_mmol": [3.87]})
+    npt.assert_almost_equal(tmp, [0.082], decimal=3)
+    hf = HkdrHF()
+    tmp = hf.score_batch({"index_age": [59, 59, 59],
+                          "female": [False, True, False],
+                          "albumin_creat_mgmmol": [2.5, 2.5, 2.5],
+                          "bmi": [32, 32, 24.3],
+                          "hba1c": [8, 8, 8],
+                          "hb": [13.8, 13.8, 13.8],
+                          "chd": [True, True, True]})
+    npt.assert_almost_equal(tmp, [0.038, 0.064, 0.024], decimal=3)
+    stroke = HkdrStroke()
+    tmp = stroke.score_batch({"index_age": [59, 70],
+                              "hba1c": [8, 9],
+                              "albumin_creat_mgmmol": [2.5, 0.5],
+                              "chd": [True, False]})
+    npt.assert_almost_equal(tmp, [hkdr_stroke(59, 8, 2.5, True),
+                                  hkdr_stroke(70, 9, 0.5, False)])
+
+
+def test_hkdr_panel():
+    cols = {"index_age": [59, 59, 70],
+            "female": [True, False, True],
+            "cur_smoke": [False, True, False],
+            "diab_dur": [5, 12, 0.5],
+            "egfr": [105, 60, 40],
+            "albumin_creat_mgmmol": [2.3, 2.5, 0.5],
+            "nonhdl_mmol": [3.87, 3.2, 4.1],
+            "bmi": [32, 24.3, 28],
+            "hba1c": [8, 8, 9],
+            "hb": [13.8, 13.8, 12],
+            "chd": [True, True, False]}
+    tmp = HkdrPanel().score_batch(cols)
+    assert tmp.shape == (3, 3)
+    npt.assert_almost_equal(tmp[:, 0], HkdrCHD().score_batch(cols))
+    npt.assert_almost_equal(tmp[:, 1], HkdrHF().score_batch(cols))
+    npt.assert_almost_equal(tmp[:, 2], HkdrStroke().score_batch(cols))
+    row = {k: v[1] for k, v in cols.items()}
+    npt.assert_almost_equal(HkdrPanel().score(row), tmp[1])
+    # alongside single-outcome models, sharing the cleaned columns
+    cohort = Cohort(dict(cols, AC=[False] * 3, chol_tot=[150] * 3,
+                         chol_hdl=[50] * 3, sbp=[130] * 3, dm=[True] * 3,
+                         htn_treat=[False] * 3))
+    tmp = np.column_stack([HkdrPanel().score_batch(cohort),
+                           score_cohort(cohort, ["pce", "hkdr_chd"])])
+    npt.assert_almost_equal(tmp[:, 3], Pce().score_batch(cohort))
+    npt.assert_almost_equal(tmp[:, 4], tmp[:, 0])
+    with pytest.raises(TypeError):
+        score_cohort(cohort, [HkdrPanel(), "hkdr_chd"])
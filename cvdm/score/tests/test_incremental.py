@@ -0,0 +1,69 @@
+import numpy as np
+import numpy.testing as npt
+import pytest
+
+from cvdm.score import Advance, Dmcx, Fremantle, HkdrCHD, Recode
+from cvdm.score.incremental import IncrementalCox, column_term
+
+
+def _cohort(keys, n=20, seed=0):
+    rng = np.random.default_rng(seed)
+    ranges = {"index_age": (30, 80), "diab_age": (30, 70),
+              "diab_dur": (0, 20), "sbp": (100, 180), "dbp": (60, 100),
+              "pp": (30, 80), "hba1c": (5, 11), "bmi": (18, 40),
+              "egfr": (20, 120), "tchdl": (2, 7), "chol_tot": (3, 8),
+              "chol_hdl": (0.8, 2), "chol_hdl_mmol": (0.8, 2),
+              "nonhdl_mmol": (2, 6), "creat": (0.5, 2),
+              "albumin_creat": (1, 300), "albumin_creat_mgmmol": (0.5, 30)}
+    return {k: rng.uniform(*ranges[k], n) if k in ranges
+            else rng.integers(0, 2, n).astype(float) for k in keys}
+
+
+@pytest.mark.parametrize("model", [Advance(), Recode("MI"), Fremantle(),
+                                   HkdrCHD(), Dmcx()])
+def test_incremental_update(model):
+    data = _cohort(model.feat_key)
+    state = model.score_state(data)
+    npt.assert_almost_equal(state.risk(), model.score_batch(data))
+    rows = [3, 7]
+    for key, new in [("hba1c", [6.2, 9.9]), ("sbp", [190, 95]),
+                     ("index_age", [45, 72]), ("egfr", [25, 95])]:
+        if key not in model.feat_key:
+            continue
+        data[key][rows] = new
+        npt.assert_almost_equal(state.update(rows, {key: new}),
+                                model.score_batch(data)[rows])
+    npt.assert_almost_equal(state.risk(), model.score_batch(data))
+
+
+def test_incremental_errors():
+    data = _cohort(Dmcx.feat_key)
+    state = Dmcx().score_state(data)
+    with pytest.raises(ValueError):
+        state.update([0], {"female": [1]})
+    with pytest.raises(KeyError):
+        state.update([0], {"ldl": [3]})
+    npt.assert_equal(state.update([1, 2], {}), state.risk([1, 2]))
+
+
+def _checked(cols):
+    if np.any(cols["x"] < 0):
+        raise ValueError("negative x")
+    return cols["x"]
+
+
+def test_incremental_update_failure():
+    data = {"x": np.array([1., 2.]), "y": np.array([0., 1.])}
+    state = IncrementalCox(data, [(("x",), _checked), column_term("y")],
+                           [0.5, 0.2], 0.9)
+    risk = state.risk()
+    with pytest.raises(ValueError):
+        state.update([1], {"x": [-1.], "y": [3.]})
+    # nothing was written by the failed update
+    npt.assert_equal(state.raw["x"], [1, 2])
+    npt.assert_equal(state.raw["y"], [0, 1])
+    npt.assert_equal(state.risk(), risk)
+    npt.assert_almost_equal(state.update([1], {"x": 3.}),
+                            IncrementalCox({"x": [1., 3.], "y": [0., 1.]},
+                                           state.terms, [0.5, 0.2],
+                                           0.9).risk([1]))
@@ -0,0 +1,22 @@
+import subprocess
+import sys
+
+import cvdm.score
+
+
+def test_lazy_import():
+    out = subprocess.check_output(
+        [sys.executable, "-c",
+         "import sys, cvdm.score; "
+         "print(sorted(m for m in sys.modules if m.startswith('cvdm.score.')))"])
+    assert "cvdm.score.pce" not in out.decode()
+    assert "pce" in dir(cvdm.score)
+
+
+def test_lazy_names():
+    import cvdm.score.score
+    from cvdm.score import score, Score, pce
+    assert callable(score) and score.__module__ == "cvdm.score.score"
+    assert Score.__name__ == "Score"
+    assert pce.__module__ == "cvdm.score.pce"
+    assert cvdm.score.hkdr.HkdrHF is cvdm.score.HkdrHF
@@ -0,0 +1,91 @@
+import numpy as np
+import numpy.testing as npt
+import pytest
+
+from cvdm.score import BaseRisk, FrsSimple, GridRisk, HkdrStroke
+
+
+def _stroke_grid():
+    return GridRisk(HkdrStroke(),
+                    {"index_age": np.linspace(30, 90, 61),
+                     "hba1c": np.linspace(5, 12, 29),
+                     "chd": [0, 1],
+                     "albumin_creat_mgmmol": np.geomspace(0.1, 300, 60)},
+                    discrete=["chd"])
+
+
+def test_grid_risk():
+    model = _stroke_grid()
+    assert 1e-4 < model.error_estimate < 1e-3
+    assert model.check_points == 60 * 28 * 2 * 59
+    rng = np.random.default_rng(1)
+    n = 2000
+    data = {"index_age": rng.uniform(30, 90, n),
+            "hba1c": rng.uniform(5, 12, n),
+            "chd": rng.integers(0, 2, n).astype(float),
+            "albumin_creat_mgmmol": rng.uniform(0.1, 300, n)}
+    exact = HkdrStroke().score_batch(data)
+    risk = model.score_batch(data)
+    # an estimate from the cell centres, of the order of the errors
+    err = np.max(np.abs(risk - exact))
+    assert model.error_estimate / 4 < err < 1.5 * model.error_estimate
+    for i in range(0, n, 200):
+        row = {k: v[i] for k, v in data.items()}
+        npt.assert_almost_equal(model.score(row), risk[i])
+    # grid points are answered from the table
+    row = {"index_age": 60., "hba1c": 8., "chd": 1.,
+           "albumin_creat_mgmmol": 0.1}
+    npt.assert_almost_equal(model.score(row), HkdrStroke().score(row),
+                            decimal=6)
+
+
+def test_grid_risk_fallback():
+    model = _stroke_grid()
+    data = {"index_age": np.array([95., 60., 60., np.nan]),
+            "hba1c": np.array([8., 8., 8., 8.]),
+            "chd": np.array([1., 0.5, 0., 1.]),
+            "albumin_creat_mgmmol": np.array([2., 2., 500., 2.])}
+    exact = HkdrStroke().score_batch(data)
+    npt.assert_equal(model.score_batch(data), exact)
+    for i in range(3):
+        row = {k: v[i] for k, v in data.items()}
+        assert model.score(row) == HkdrStroke().score(row)
+
+
+def test_grid_risk_flags():
+    axes = {"female": [0, 1], "cur_smoke": [0, 1], "dm": [0, 1],
+            "htn_treat": [0, 1], "index_age": np.linspace(30, 80, 26),
+            "bmi": np.linspace(15, 45, 16), "sbp": np.linspace(90, 200, 23)}
+    model = GridRisk(FrsSimple(), axes, discrete=axes.keys() - {
+        "index_age", "bmi", "sbp"})
+    assert model.nbytes == 16 * 26 * 16 * 23 * 4
+    row = {"female": 1, "cur_smoke": 0, "dm": 1, "htn_treat": 1,
+           "index_age": 57, "bmi": 31, "sbp": 141}
+    assert model.error_estimate < 5e-3
+    assert abs(model.score(row) - FrsSimple().score(row)) < 5e-3
+
+
+class _Wave(BaseRisk):
+    features = feat_key = ["x"]
+
+    def score_batch(self, data):
+        return np.sin(np.asarray(data["x"], dtype=float))
+
+
+def test_grid_risk_estimate():
+    # equal corners around a peak, caught at the cell centre
+    model = GridRisk(_Wave(), {"x": [0, np.pi]})
+    npt.assert_almost_equal(model.error_estimate, 1, decimal=6)
+    model = GridRisk(_Wave(), {"x": np.linspace(0, np.pi, 33)})
+    # h^2/8 max|f''| for linear interpolation
+    npt.assert_allclose(model.error_estimate, (np.pi / 32)**2 / 8, rtol=0.01)
+
+
+def test_grid_risk_errors():
+    with pytest.raises(ValueError):
+        GridRisk(HkdrStroke(), {"index_age": [40, 50], "hba1c": [5, 9],
+                                "chd": [0, 1]})
+    with pytest.raises(ValueError):
+        GridRisk(HkdrStroke(), {"index_age": [40, 40], "hba1c": [5, 9],
+                                "chd": [0, 1],
+                                "albumin_creat_mgmmol": [1, 10]})
@@ -29,3 +29,23 @@ def test_ndr_json():
                     "afib": False,
                     "cvd_hist": False})
     npt.assert_almost_equal(tmp, 0.109, decimal=3)
+
+
+def test_ndr_batch():
+    model = Ndr()
+    tmp = model.score_batch({"diab_age": [53, 53],
+                             "diab_dur": [5, 5],
+                             "tchdl": [4.3, 4.3],
+                             "hba1c": [8, 8],
+                             "sbp": [150, 150],
+                             "bmi": [32, 32],
+                             "male": [True, False],
+                             "cur_smoke": [False, True],
+                             "microalbum": [True, True],
+                             "macroalbum": [False, False],
+                             "afib": [False, False],
+                             "cvd_hist": [False, True]})
+    npt.assert_almost_equal(tmp[0], 0.109, decimal=3)
+    npt.assert_almost_equal(tmp[1], ndr(53, 5, 4.3, 8, 150, 32,
+                                        False, True, True, False,
+                                        False, True))
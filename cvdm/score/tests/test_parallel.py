@@ -0,0 +1,29 @@
+import numpy.testing as npt
+
+from cvdm.score import score_cohort
+from cvdm.score.parallel import ParallelScorer, score_parallel
+
+
+COLS = {"female": [False, True, True, False, True],
+        "AC": [False, False, True, True, False],
+        "index_age": [60, 61, 15, 45, 70],
+        "chol_tot": [150, 180, 150, 210, 190],
+        "chol_hdl": [65, 47, 65, 40, 55],
+        "sbp": [120, 124, 120, 140, 150],
+        "cur_smoke": [False, True, False, True, False],
+        "dm": [True, False, True, True, False],
+        "htn_treat": [False, False, False, True, True]}
+
+
+def test_score_parallel():
+    models = ["pce", "frs_primary"]
+    tmp = score_parallel(COLS, models, n_workers=2, chunksize=2)
+    npt.assert_allclose(tmp, score_cohort(COLS, models))
+
+
+def test_parallel_scorer_reuse():
+    with ParallelScorer(["pce"], n_workers=2) as scorer:
+        first = scorer.score(COLS)
+        second = scorer.score({k: v[:3] for k, v in COLS.items()})
+    assert first.shape == (5, 1)
+    npt.assert_allclose(second, first[:3])
@@ -28,3 +28,54 @@ def test_pce_json():
                      "dm": True,
                      "htn_treat": False})
     npt.assert_almost_equal(tmp, 0.093, decimal=3)
+
+
+def test_pce_batch():
+    model = Pce(risk=10)
+    tmp = model.score_batch({"female": [False, True, True, False, False],
+                             "AC": [False, False, True, True, True],
+                             "index_age": [60, 60, 60, 60, 60],
+                             "chol_tot": [150, 150, 150, 150, 150],
+                             "chol_hdl": [65, 65, 65, 65, 65],
+                             "sbp": [120, 120, 120, 120, 120],
+                             "cur_smoke": [False, False, False, False, True],
+                             "dm": [True, True, True, True, True],
+                             "htn_treat": [False, False, False, False, True]})
+    npt.assert_almost_equal(tmp, [0.093, 0.040, 0.070, 0.115, 0.298],
+                            decimal=3)
+
+
+def test_pce_feature_matrix():
+    row = {"female": False,
+           "AC": True,
+           "index_age": 60,
+           "chol_tot": 150,
+           "chol_hdl": 65,
+           "sbp": 120,
+           "cur_smoke": True,
+           "dm": True,
+           "htn_treat": False}
+    model = Pce()
+    xFeat, names = model.get_feature_matrix({k: [v, v] for k, v in row.items()})
+    feat = model.get_features(row)
+    assert xFeat.shape == (2, len(feat))
+    assert sorted(names) == sorted(feat)
+    npt.assert_almost_equal(xFeat[1], [feat[k] for k in names])
+
+
+def test_pce_horizons():
+    cols = {"female": [False, True],
+            "AC": [False, True],
+            "index_age": [60, 60],
+            "chol_tot": [150, 150],
+            "chol_hdl": [65, 65],
+            "sbp": [120, 120],
+            "cur_smoke": [False, False],
+            "dm": [True, True],
+            "htn_treat": [False, False]}
+    tmp = Pce().score_horizons(cols)
+    assert tmp.shape == (2, 2)
+    npt.assert_almost_equal(tmp[:, 0], Pce(risk=5).score_batch(cols))
+    npt.assert_almost_equal(tmp[:, 1], [0.093, 0.070], decimal=3)
+    npt.assert_almost_equal(Pce().score_horizons(cols, risks=[10])[:, 0],
+                            tmp[:, 1])
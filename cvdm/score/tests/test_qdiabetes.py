@@ -1,3 +1,4 @@
+import numpy as np
 import numpy.testing as npt
 
 from cvdm.score import qdiabetes, QDiabetes
@@ -86,3 +87,38 @@ def test_qdiabetes_json():
                        "renal": True
     })
     npt.assert_almost_equal(tmp, 0.025, decimal=3)
+
+
+COLS = {"index_age": [64, 64, 64, 64],
+        "male": [False, False, True, True],
+        "bmi": [27.34, 27.34, 27.34, 27.34],
+        "diab_dur": [2, 8, 0.5, 5],
+        "AC": [False, False, True, False],
+        "EAsian": [False, True, False, True],
+        "hba1c_mmol": [64, 64, 64, 64],
+        "tchdl": [4.3, 4.3, 4.3, 4.3],
+        "sbp": [120, 120, 120, 120],
+        "heavy_smoke": [False, False, False, False],
+        "moderate_smoke": [False, False, False, True],
+        "light_smoke": [False, True, False, False],
+        "prev_smoke": [True, False, False, False],
+        "afib": [True, True, True, True],
+        "cvd_hist": [True, True, False, False],
+        "renal": [False, False, True, True]}
+
+
+def test_qdiabetes_batch():
+    tmp = QDiabetes(1).score_batch(COLS)
+    npt.assert_almost_equal(tmp, [0.0225, 0.031, 0.011, 0.025], decimal=3)
+    tmp = QDiabetes().score_batch({k: np.asarray(v)[:0] for k, v in COLS.items()})
+    assert tmp.shape == (0,)
+
+
+def test_qdiabetes_horizons():
+    tmp = QDiabetes().score_horizons(COLS)
+    assert tmp.shape == (4, 15)
+    npt.assert_almost_equal(tmp[:, 0], [0.0225, 0.031, 0.011, 0.025], decimal=3)
+    npt.assert_almost_equal(tmp[:, 9], QDiabetes(10).score_batch(COLS))
+    assert (np.diff(tmp, axis=1) > 0).all()
+    half = QDiabetes().score_horizons(COLS, [4.5])[:, 0]
+    assert ((half > tmp[:, 3]) & (half < tmp[:, 4])).all()
@@ -43,3 +43,22 @@ def test_recode_json():
                      "creat": 1.1,
                      "albumin_creat": 10})
     npt.assert_almost_equal(risk, 0.03, decimal=2)
+
+
+def test_recode_batch():
+    rc = Recode()
+    tmp = rc.score_batch({"index_age": [60, 70, 70, 75, 60],
+                          "female": [False, False, True, True, True],
+                          "AC": [False, False, False, False, True],
+                          "cur_smoke": [False, False, True, True, True],
+                          "sbp": [140, 140, 140, 140, 140],
+                          "cvd_hist": [False, False, False, True, True],
+                          "bpld": [False, False, True, True, True],
+                          "statin": [False, False, False, True, True],
+                          "anticoagulant": [False, False, False, False, True],
+                          "hba1c": [8, 8, 8, 8, 8],
+                          "chol_tot": [190, 190, 190, 190, 190],
+                          "chol_hdl": [50, 50, 50, 50, 50],
+                          "creat": [1.1, 1.1, 1.1, 1.1, 1.1],
+                          "albumin_creat": [10, 10, 10, 10, 10]})
+    npt.assert_almost_equal(tmp, [0.03, 0.05, 0.14, 0.39, 0.36], decimal=2)
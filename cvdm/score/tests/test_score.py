@@ -37,3 +37,30 @@ def test_score_json():
                     "sbp": 160,
                     "cur_smoke": True})
     npt.assert_almost_equal(tmp, 0.08, decimal=2)
+
+
+def test_score_batch():
+    cols = {"female": [True, False],
+            "index_age": [55, 60],
+            "chol_tot_mmol": [3.62, 5.17],
+            "sbp": [160, 160],
+            "cur_smoke": [True, True]}
+    tmp = Score(low_risk=True).score_batch(cols)
+    npt.assert_almost_equal(tmp, [0.02, 0.08], decimal=2)
+    tmp = Score(low_risk=False).score_batch(cols)
+    npt.assert_almost_equal(tmp, [score(True, 55, 3.62, 160, True, False),
+                                  score(False, 60, 5.17, 160, True, False)])
+
+
+def test_score_regions():
+    cols = {"female": [True, False, True],
+            "index_age": [55, 60, 18],
+            "chol_tot_mmol": [3.62, 5.17, 5],
+            "sbp": [160, 160, 120],
+            "cur_smoke": [True, True, False]}
+    tmp = Score().score_regions(cols)
+    assert tmp.shape == (3, 2)
+    npt.assert_almost_equal(tmp[:, 0], Score(low_risk=True).score_batch(cols))
+    npt.assert_almost_equal(tmp[:, 1], [score(True, 55, 3.62, 160, True, False),
+                                        score(False, 60, 5.17, 160, True, False),
+                                        score(True, 18, 5, 120, False, False)])
@@ -1,7 +1,8 @@
 import numpy as np
 import numpy.testing as npt
 
-from cvdm.score import cox_surv, weibull_atf_surv, weibull_hazard, weibull_surv
+from cvdm.score import cox_risk, cox_surv, cox_surv_multi
+from cvdm.score import weibull_atf_surv, weibull_hazard, weibull_surv
 
 
 def test_cox_surv():
@@ -87,3 +88,61 @@ def test_weibull_atf_surv():
     tmp = weibull_atf_surv(xFeat, alpha, mu, sigma, 5)
     npt.assert_almost_equal(tmp, 0.54, decimal=2)
 
+
+
+def test_cox_surv_matrix():
+    beta = np.array([0.5, -0.25])
+    xFeat = np.array([[1.0, 2.0],
+                      [3.0, 0.5],
+                      [0.0, 4.0]])
+    s0 = np.array([0.9, 0.95, 0.99])
+    b0 = np.array([0.1, 0.2, 0.3])
+    expected = [cox_surv(x, beta, s, b, 0.9) for x, s, b in zip(xFeat, s0, b0)]
+    out = np.empty(3)
+    tmp = cox_surv(xFeat, beta, s0, b0, 0.9, out=out)
+    assert tmp is out
+    npt.assert_allclose(tmp, expected)
+    npt.assert_allclose(tmp, 1 - s0**np.exp(0.9*(xFeat.dot(beta) - b0)))
+    lp = xFeat.dot(beta)
+    saved = lp.copy()
+    npt.assert_allclose(cox_risk(lp, s0, b0, 0.9), expected)
+    npt.assert_equal(lp, saved)
+    assert cox_risk(lp, s0, b0, 0.9, out=lp) is lp
+    npt.assert_allclose(lp, expected)
+
+
+def test_cox_surv_stable():
+    beta = np.array([1.0])
+    tmp = cox_surv(np.array([[800.0], [-40.0]]), beta, 0.9)
+    npt.assert_equal(tmp[0], 1.0)
+    # 1 - s0**exp(-40) underflows to 0 without the log-space form
+    npt.assert_allclose(tmp[1], -np.exp(-40.0)*np.log(0.9))
+
+
+def test_weibull_matrix():
+    beta = np.array([0.068, 0.012, 0.072, -0.22, 0.771, 0.658])
+    xFeat = np.array([[62, 30, 32, 5, 1, 1],
+                      [55, 20, 28, 0, 0, 1]], dtype=float)
+    t1 = np.array([8.0, 2.0])
+    out = np.empty(2)
+    tmp = weibull_surv(xFeat, beta, -12.332, t1, t1 + 1, 1.514, out=out)
+    assert tmp is out
+    npt.assert_allclose(tmp, [weibull_surv(x, beta, -12.332, t, t + 1, 1.514)
+                              for x, t in zip(xFeat, t1)])
+    npt.assert_almost_equal(tmp[0], 0.027, decimal=3)
+    tmp = weibull_hazard(xFeat, beta, -12.332, t1, 1.514)
+    npt.assert_allclose(tmp, [weibull_hazard(x, beta, -12.332, t, 1.514)
+                              for x, t in zip(xFeat, t1)])
+    tmp = weibull_atf_surv(xFeat[:, :2], beta[:2], 11.262, 0.587,
+                           np.array([5.0, 10.0]))
+    npt.assert_allclose(tmp, [weibull_atf_surv(x, beta[:2], 11.262, 0.587, t)
+                              for x, t in zip(xFeat[:, :2], [5.0, 10.0])])
+
+
+def test_cox_surv_multi():
+    xFeat = np.array([[1.0, 2.0], [0.5, -1.0]])
+    beta = np.array([0.3, 0.1])
+    tmp = cox_surv_multi(xFeat, beta, [0.9, 0.8], 0.2)
+    assert tmp.shape == (2, 2)
+    npt.assert_almost_equal(tmp[:, 0], cox_surv(xFeat, beta, 0.9, 0.2))
+    npt.assert_almost_equal(tmp[:, 1], cox_surv(xFeat, beta, 0.8, 0.2))
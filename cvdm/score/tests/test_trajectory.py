@@ -0,0 +1,81 @@
+import numpy as np
+import numpy.testing as npt
+import pytest
+
+from cvdm.score import HkdrStroke, Pce, score_trajectories
+from cvdm.score.trajectory import group_visits, trajectory_stats
+
+
+def _visits(n=300, seed=0):
+    rng = np.random.default_rng(seed)
+    return {"patient_id": rng.choice(["a", "b", "c", "d", "e"], n),
+            "time": rng.permutation(n) / 10.,
+            "index_age": rng.uniform(40, 75, n),
+            "hba1c": rng.uniform(5, 11, n),
+            "chd": rng.integers(0, 2, n),
+            "albumin_creat_mgmmol": rng.uniform(0.5, 30, n),
+            "female": rng.integers(0, 2, n),
+            "AC": rng.integers(0, 2, n),
+            "chol_tot": rng.uniform(130, 260, n),
+            "chol_hdl": rng.uniform(30, 80, n),
+            "sbp": rng.uniform(100, 170, n),
+            "cur_smoke": rng.integers(0, 2, n),
+            "dm": rng.integers(0, 2, n),
+            "htn_treat": rng.integers(0, 2, n)}
+
+
+def test_group_visits():
+    order, offsets, ids = group_visits([3, 1, 3, 2, 1], [5, 2, 1, 0, 1])
+    npt.assert_equal(order, [4, 1, 3, 2, 0])
+    npt.assert_equal(offsets, [0, 2, 3, 5])
+    npt.assert_equal(ids, [1, 2, 3])
+    order, offsets, ids = group_visits([3, 1, 3])
+    npt.assert_equal(order, [1, 0, 2])
+    order, offsets, ids = group_visits(["a", "a", "b"], [1, 2, 0])
+    npt.assert_equal(order, [0, 1, 2])
+    npt.assert_equal(offsets, [0, 2, 3])
+    order, offsets, ids = group_visits(["a", "a", "b"], [2, 1, 0])
+    npt.assert_equal(order, [1, 0, 2])
+
+
+def test_trajectory_stats():
+    risk = np.array([0.1, 0.3, 0.2, 0.5, 0.4, 0.7])
+    time = np.array([0., 1., 2., 0., 0., 1e9 + 1])
+    stats = trajectory_stats(risk, time, np.array([0, 3, 4, 6]))
+    npt.assert_equal(stats["first"], [0.1, 0.5, 0.4])
+    npt.assert_equal(stats["last"], [0.2, 0.5, 0.7])
+    npt.assert_equal(stats["max"], [0.3, 0.5, 0.7])
+    npt.assert_almost_equal(stats["slope"], [0.05, np.nan, 0.3 / (1e9 + 1)])
+    with pytest.raises(ValueError):
+        trajectory_stats(risk, time, np.array([0, 3, 3, 6]))
+
+
+def test_score_trajectories():
+    data = _visits()
+    traj = score_trajectories(data, ["hkdr_stroke", Pce()], chunksize=64)
+    assert traj.names == ["hkdr_stroke", "Pce"] and len(traj) == 5
+    npt.assert_equal(traj.ids, ["a", "b", "c", "d", "e"])
+    npt.assert_almost_equal(traj.visit_risk(),
+                            np.column_stack([HkdrStroke().score_batch(data),
+                                             Pce().score_batch(data)]))
+    stats = traj.stats()
+    for i, pid in enumerate(traj.ids):
+        rows = np.flatnonzero(data["patient_id"] == pid)
+        rows = rows[np.argsort(data["time"][rows])]
+        time, risk = traj.series(i)
+        npt.assert_equal(time, data["time"][rows])
+        npt.assert_almost_equal(risk, traj.visit_risk()[rows])
+        npt.assert_equal(stats["first"][i], risk[0])
+        npt.assert_equal(stats["last"][i], risk[-1])
+        npt.assert_almost_equal(stats["max"][i], risk.max(axis=0))
+        npt.assert_almost_equal(stats["slope"][i],
+                                np.polyfit(time, risk, 1)[0])
+
+
+def test_score_trajectories_empty():
+    data = {k: v[:0] for k, v in _visits().items()}
+    traj = score_trajectories(data, ["hkdr_stroke", "pce"])
+    assert len(traj) == 0
+    npt.assert_equal(traj.offsets, [0])
+    assert traj.risk.shape == (0, 2)
+    assert traj.stats()["slope"].shape == (0, 2)
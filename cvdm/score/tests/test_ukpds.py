@@ -62,3 +62,36 @@ def test_ukpds_json():
                     "cur_smoke": False})
     npt.assert_almost_equal(tmp, 0.079, decimal=3)
 
+
+
+def test_ukpds_batch():
+    uk = Ukpds(10)
+    tmp = uk.score_batch({"index_age": [55, 55, 55, 55],
+                          "female": [True, True, True, True],
+                          "diab_age": [55, 55, 55, 55],
+                          "AC": [False, False, False, False],
+                          "sbp": [140, 140, 140, 140],
+                          "tchdl": [4.0, 4.0, 4.0, 4.0],
+                          "hba1c": [6, 8, 10, 10],
+                          "cur_smoke": [False, False, False, True]})
+    npt.assert_almost_equal(tmp, [0.057, 0.079, 0.109, 0.144], decimal=3)
+
+
+def test_ukpds_horizons():
+    cols = {"index_age": [55, 60],
+            "female": [True, False],
+            "diab_age": [55, 50],
+            "AC": [False, True],
+            "sbp": [140, 150],
+            "tchdl": [4.0, 5.0],
+            "hba1c": [8, 9],
+            "cur_smoke": [False, True]}
+    tmp = Ukpds().score_horizons(cols, [1, 5, 10, 12.5])
+    assert tmp.shape == (2, 4)
+    npt.assert_almost_equal(tmp[0, 2], 0.079, decimal=3)
+    for j, t in enumerate([1, 5, 10]):
+        npt.assert_almost_equal(tmp[:, j], Ukpds(t).score_batch(cols))
+        npt.assert_almost_equal(tmp[1, j], Ukpds(t).score({k: v[1] for k, v in cols.items()}))
+    assert (tmp[:, 3] > tmp[:, 2]).all()
+    npt.assert_almost_equal(Ukpds().score_horizons(cols)[:, [0, 4, 9]],
+                            tmp[:, :3])
@@ -1,6 +1,8 @@
+import numpy as np
 import numpy.testing as npt
 
-from cvdm.score import ukpdsom2_chf, UkpdsOM2CHF
+from cvdm.score import ukpdsom2_chf, UkpdsOM2CHF, UkpdsOM2MI, UkpdsOM2Stroke
+from cvdm.score.ukpdsOM2 import ukpdsom2_annual_batch
 
 
 def test_ukpdsom2_chf():
@@ -23,3 +25,56 @@ def test_chf():
                        "ulcer_hist": False})
     npt.assert_almost_equal(tmp, 0.027, decimal=3)
 
+
+
+def test_chf_batch():
+    model = UkpdsOM2CHF(tYear=1)
+    tmp = model.score_batch({"diab_dur": [8],
+                             "diab_age": [62],
+                             "afib": [False],
+                             "bmi": [32],
+                             "egfr": [50],
+                             "chol_ldl_mmol": [3.0],
+                             "albumin_urine": [55],
+                             "pvd": [False],
+                             "amp_hist": [True],
+                             "ulcer_hist": [False]})
+    npt.assert_almost_equal(tmp, [0.027], decimal=3)
+
+
+MI_ROWS = [{"AC": False, "EAsian": False, "diab_dur": 8, "diab_age": 62,
+           "hba1c": 8, "cur_smoke": True, "pvd": False, "wbc": 7,
+           "amp_hist": False, "chd": False, "chf": False,
+           "stroke_hist": False, "egfr": 50, "chol_hdl_mmol": 1.1,
+           "chol_ldl_mmol": 3.0, "albumin_urine": 55, "sbp": 140,
+           "female": False},
+          {"AC": True, "EAsian": False, "diab_dur": 3, "diab_age": 55,
+           "hba1c": 7, "cur_smoke": False, "pvd": True, "wbc": 6,
+           "amp_hist": False, "chd": True, "chf": False,
+           "stroke_hist": False, "egfr": 80, "chol_hdl_mmol": 1.4,
+           "chol_ldl_mmol": 2.5, "albumin_urine": 20, "sbp": 130,
+           "female": True}]
+
+
+def test_mi_batch():
+    model = UkpdsOM2MI(tYear=5)
+    tmp = model.score_batch({k: [r[k] for r in MI_ROWS] for k in MI_ROWS[0]})
+    npt.assert_almost_equal(tmp, [model.score(r) for r in MI_ROWS])
+
+
+def test_ukpdsom2_annual():
+    cols = {k: [r[k] for r in MI_ROWS] for k in MI_ROWS[0]}
+    cols.update({"afib": [False, True], "bmi": [32, 27],
+                 "ulcer_hist": [False, True]})
+    annual = ukpdsom2_annual_batch(cols, years=np.arange(1, 6))
+    for outcome, model in [("chf", UkpdsOM2CHF), ("stroke", UkpdsOM2Stroke),
+                           ("mi", UkpdsOM2MI)]:
+        assert annual[outcome].shape == (2, 5)
+        npt.assert_almost_equal(annual[outcome][:, 0],
+                                model(tYear=1).score_batch(cols))
+        # the annual conditional probabilities compound to the 5-year risk
+        npt.assert_almost_equal(1 - np.prod(1 - annual[outcome], axis=1),
+                                model(tYear=5).score_batch(cols))
+    tmp = ukpdsom2_annual_batch(cols, outcomes=["mi"])
+    assert list(tmp) == ["mi"] and tmp["mi"].shape == (2, 10)
+    npt.assert_almost_equal(tmp["mi"][:, :5], annual["mi"])
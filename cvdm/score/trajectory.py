@@ -0,0 +1,172 @@
+"""
+Risk trajectories from visit-level data
+
+Every visit of every patient is one row. The rows are sorted by
+patient and visit time and grouped CSR style: the visits of patient
+i are rows offsets[i]:offsets[i + 1] of the sorted order. Every visit
+is scored by the vectorized models in chunks of sorted rows, and the
+per-patient change statistics are segment reductions (np.*.reduceat)
+over the offsets, so memory stays linear in the number of visits.
+"""
+import numpy as np
+
+from cvdm.score.cohort import CohortPlan, as_cohort
+
+
+def group_visits(ids, time=None):
+    """
+    Sort visits by patient (then time) and group them
+
+    Parameters
+    ----------
+    ids : (n,) patient id of every visit
+    time : optional (n,) visit time, otherwise the input order
+           of the visits of a patient is kept
+
+    Returns
+    ----------
+    ndarray: (n,) order sorting the visits
+    ndarray: (p + 1,) offsets of the p patients in the sorted order
+    ndarray: (p,) id of every patient
+    """
+    ids = np.asarray(ids)
+    same = ids[1:] == ids[:-1]
+    inOrder = np.all(same | (ids[1:] > ids[:-1]))
+    if inOrder and time is not None:
+        time = np.asarray(time)
+        inOrder = np.all(~same | (time[1:] >= time[:-1]))
+    if inOrder:
+        # extracts are usually sorted already, which skips the sort
+        # dominating the cost of large cohorts
+        order = np.arange(len(ids))
+    elif time is None:
+        order = np.argsort(ids, kind="stable")
+    else:
+        order = np.lexsort((np.asarray(time), ids))
+    sortedIds = ids[order]
+    if len(ids) == 0:
+        return order, np.zeros(1, dtype=np.intp), sortedIds
+    starts = np.flatnonzero(sortedIds[1:] != sortedIds[:-1]) + 1
+    offsets = np.concatenate(([0], starts, [len(ids)])).astype(np.intp)
+    return order, offsets, sortedIds[offsets[:-1]]
+
+
+def trajectory_stats(risk, time, offsets):
+    """
+    First, last and max risk and least-squares slope of the risk over
+    time of every patient
+
+    Parameters
+    ----------
+    risk : (n,) or (n, m) risks of the visits in sorted order
+    time : (n,) visit times in sorted order
+    offsets : (p + 1,) patient offsets (see group_visits)
+
+    Returns
+    ----------
+    dict of "first", "last", "max", "slope" to (p,) or (p, m) arrays;
+    the slope is NaN for patients with a single visit time
+    """
+    risk = np.asarray(risk, dtype=float)
+    time = np.asarray(time, dtype=float)
+    starts = offsets[:-1]
+    count = np.diff(offsets)
+    if np.any(count == 0):
+        raise ValueError("Every patient needs at least one visit")
+    shape = (-1,) + (1,) * (risk.ndim - 1)
+    # slope of the centred series to avoid the cancellation of
+    # sum(t*r) - sum(t)*sum(r)/n on large times
+    tc = time - np.repeat(np.add.reduceat(time, starts) / count, count)
+    sxx = np.add.reduceat(tc * tc, starts)
+    sxy = np.add.reduceat(tc.reshape(shape) * risk, starts)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        slope = sxy / sxx.reshape(shape)
+    slope[sxx == 0] = np.nan
+    return {"first": risk[starts],
+            "last": risk[offsets[1:] - 1],
+            "max": np.maximum.reduceat(risk, starts),
+            "slope": slope}
+
+
+class Trajectories(object):
+    """
+    Scored visits grouped by patient
+
+    Attributes
+    ----------
+    ids : (p,) patient ids
+    offsets : (p + 1,) offsets of the patients in the sorted visits
+    order : (n,) order sorting the input visits
+    time : (n,) sorted visit times
+    risk : (n, m) risks of the sorted visits, one column per model
+    names : names of the m models
+    """
+
+    def __init__(self, ids, offsets, order, time, risk, names):
+        self.ids = ids
+        self.offsets = offsets
+        self.order = order
+        self.time = time
+        self.risk = risk
+        self.names = names
+        self._stats = None
+
+    def __len__(self):
+        return len(self.ids)
+
+    def series(self, i):
+        """
+        Visit times (k,) and risks (k, m) of the i-th patient
+        """
+        rows = slice(self.offsets[i], self.offsets[i + 1])
+        return self.time[rows], self.risk[rows]
+
+    def stats(self):
+        """
+        Per-patient change statistics (see trajectory_stats), computed
+        once
+        """
+        if self._stats is None:
+            self._stats = trajectory_stats(self.risk, self.time, self.offsets)
+        return self._stats
+
+    def visit_risk(self):
+        """
+        (n, m) risks in the input order of the visits
+        """
+        risk = np.empty_like(self.risk)
+        risk[self.order] = self.risk
+        return risk
+
+
+def score_trajectories(data, models, id_key="patient_id", time_key="time",
+                       chunksize=1000000):
+    """
+    Score every visit against several models and group them by patient
+
+    Parameters
+    ----------
+    data : visit-level columns (see score_cohort), one row per visit
+    models : list of model names (see MODELS) or model instances
+    id_key : column of the patient id
+    time_key : column of the visit time, e.g. years or days since
+               baseline; the slope is per unit of it
+    chunksize : visits scored at once, which bounds the memory of
+                the gathered columns and model temporaries
+
+    Returns
+    ----------
+    Trajectories
+    """
+    cohort = as_cohort(data)
+    # ids are kept as given (e.g. strings), not converted to float
+    ids = np.asarray(cohort.data[id_key])
+    time = cohort[time_key]
+    order, offsets, patients = group_visits(ids, time)
+    plan = CohortPlan(models)
+    risk = np.empty((len(order), len(plan.models)))
+    for a in range(0, len(order), chunksize):
+        rows = order[a:a + chunksize]
+        risk[a:a + len(rows)] = plan.run(cohort.take(rows))
+    return Trajectories(patients, offsets, order, time[order], risk,
+                        plan.names)
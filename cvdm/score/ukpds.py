@@ -21,6 +21,8 @@ BETA = np.array([ 1.059, # age at diagnosis of diabetes
 ])
 Q_0 = 0.0112 # intercept
 D = 1.078    # risk ratio for each year increase in duration of diagnosed diabetes
+# log-space form, prod(BETA**x) = exp(x.LOG_BETA)
+LOG_BETA = np.log(BETA)
 
 
 def ukpds(ageDiab, age, female, ac, smoking, hba1c, sbp, tchdl, tYear=10):
@@ -39,6 +41,57 @@ def ukpds(ageDiab, age, female, ac, smoking, hba1c, sbp, tchdl, tYear=10):
     return max(uscore, 0.0)
 
 
+def _ukpds_log_q(cols):
+    """
+    Log of the annual hazard q * D**(age - ageDiab) at the current
+    diabetes duration for every row of the Cohort cols
+    """
+    xFeat = np.column_stack([cols.clean("index_age", clean_age)-55,
+                             cols["female"],
+                             cols["AC"],
+                             cols["cur_smoke"] != 0,
+                             cols.clean("hba1c", clean_hba1c)-6.72,
+                             (cols.clean("sbp", clean_bp) - 135.7)/10,
+                             cols.log("tchdl", clean_tchdl)-1.59])
+    logQ = xFeat.dot(LOG_BETA)
+    logQ += np.log(Q_0)
+    logQ += np.log(D) * (cols["index_age"] - cols["diab_age"])
+    return logQ
+
+
+def ukpds_batch(cols, tYear=10):
+    """
+    Vectorized version of ukpds where cols is a
+    Cohort holding the Ukpds feature keys
+    """
+    return ukpds_horizons_batch(cols, [tYear])[:, 0]
+
+
+def ukpds_horizons_batch(cols, tYears=None):
+    """
+    Risk of ukpds at several horizons for the Cohort cols from one
+    log hazard. The hazard grows by D per year of diabetes duration,
+    so the cumulative hazard over t years is the geometric series
+    q * D**(age-ageDiab) * (1 - D**t) / (1 - D).
+
+    Parameters
+    ----------
+    tYears : horizons in years (every year 1 to 10 by default)
+
+    Returns
+    ----------
+    ndarray: (n, len(tYears)) risk matrix
+    """
+    if tYears is None:
+        tYears = np.arange(1, 11)
+    series = (1 - np.power(D, np.asarray(tYears, dtype=float))) / (1 - D)
+    risk = np.exp(_ukpds_log_q(cols))[:, None] * series
+    np.negative(risk, out=risk)
+    np.expm1(risk, out=risk)
+    np.negative(risk, out=risk)
+    return np.maximum(risk, 0.0, out=risk)
+
+
 class Ukpds(BaseRisk):
     tYear = None
     features = ["diab_age",
@@ -49,6 +102,7 @@ class Ukpds(BaseRisk):
                 "hba1c",
                 "sbp"]
     feat_key = features + ["tchdl"]
+    config_keys = ["tYear"]
 
     def __init__(self, tYear=10):
         self.tYear = tYear
@@ -64,7 +118,22 @@ class Ukpds(BaseRisk):
                      row["tchdl"],
                      tYear=self.tYear)
 
+    def score_batch(self, data):
+        return ukpds_batch(self.get_feature_columns(data), self.tYear)
+
+    def score_horizons(self, data, tYears=None):
+        """
+        Risk at each horizon in tYears (every year 1 to 10 by default)
+        for every row, as an (n, len(tYears)) matrix
+        """
+        return ukpds_horizons_batch(self.get_feature_columns(data), tYears)
+
     def get_features(self, row):
         feat_dict = super().get_features(row)
         feat_dict["tchdl_log"] = np.log(row["tchdl"])
         return feat_dict
+
+    def get_feature_arrays(self, cols):
+        feat = super().get_feature_arrays(cols)
+        feat["tchdl_log"] = cols.log("tchdl")
+        return feat
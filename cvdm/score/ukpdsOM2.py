@@ -12,6 +12,8 @@ import numpy as np
 
 from cvdm.score import weibull_surv, BaseRisk
 from cvdm.score import clean_bmi, clean_egfr, clean_hdl, clean_ldl, clean_hba1c, clean_bp
+from cvdm.score.coefTable import branch_apply, branch_code
+from cvdm.score.cohort import as_cohort
 
 
 CHF_PARAMS = {"rho": 1.514,
@@ -106,6 +108,30 @@ def ukpdsom2_chf(diabDur, diabAge, afib, bmi, egfr, ldl,
                         CHF_PARAMS["rho"])
 
 
+def ukpdsom2_chf_batch(cols, tYear=1):
+    """
+    Vectorized version of ukpdsom2_chf where cols is a
+    Cohort holding the UkpdsOM2CHF feature keys
+    """
+    diabDur = cols["diab_dur"]
+    return weibull_surv(_chf_xfeat(cols), CHF_PARAMS["beta"],
+                        CHF_PARAMS["lambda"],
+                        diabDur, diabDur+tYear,
+                        CHF_PARAMS["rho"])
+
+
+def _chf_xfeat(cols):
+    return np.column_stack([cols["diab_age"],
+                            cols["afib"],
+                            cols.clean("bmi", clean_bmi),
+                            _egfr_lt_60(cols),
+                            _ldl_10(cols),
+                            _mmalb(cols),
+                            cols["pvd"],
+                            cols["amp_hist"],
+                            cols["ulcer_hist"]])
+
+
 class UkpdsOM2CHF(BaseRisk):
     tYear = None
     features = ["diab_dur",
@@ -119,6 +145,7 @@ class UkpdsOM2CHF(BaseRisk):
                            "chol_ldl_mmol",
                            "albumin_urine"]
     
+    config_keys = ["tYear"]
 
     def __init__(self, tYear=10):
         self.tYear = tYear
@@ -136,6 +163,9 @@ class UkpdsOM2CHF(BaseRisk):
                             row["ulcer_hist"],
                             tYear=self.tYear)
 
+    def score_batch(self, data):
+        return ukpdsom2_chf_batch(self.get_feature_columns(data), self.tYear)
+
     def get_features(self, row):
         feat_dict = super().get_features(row)
         feat_dict["egfr_gt_60"] = row["egfr"]/10 if row["egfr"]<60 else 0
@@ -143,6 +173,14 @@ class UkpdsOM2CHF(BaseRisk):
         feat_dict["mmalb"] = row["albumin_urine"] >= 50
         return feat_dict
 
+    def get_feature_arrays(self, cols):
+        feat = super().get_feature_arrays(cols)
+        egfr = cols["egfr"]
+        feat["egfr_gt_60"] = np.where(egfr < 60, egfr/10, 0)
+        feat["ldl_mmol_10"] = cols["chol_ldl_mmol"]*10
+        feat["mmalb"] = cols["albumin_urine"] >= 50
+        return feat
+
 
 def ukpdsom2_stroke(diab_dur, diab_age, female, afib,
                     egfr, hba1c, ldl, mmalb,
@@ -169,6 +207,34 @@ def ukpdsom2_stroke(diab_dur, diab_age, female, afib,
                         STROKE_PARAMS["rho"])
 
 
+def ukpdsom2_stroke_batch(cols, tYear=1):
+    """
+    Vectorized version of ukpdsom2_stroke where cols is a
+    Cohort holding the UkpdsOM2Stroke feature keys
+    """
+    diabDur = cols["diab_dur"]
+    return weibull_surv(_stroke_xfeat(cols), STROKE_PARAMS["beta"],
+                        STROKE_PARAMS["lambda"],
+                        diabDur, diabDur+tYear,
+                        STROKE_PARAMS["rho"])
+
+
+def _stroke_xfeat(cols):
+    # the stroke equation uses the uncleaned eGFR and LDL
+    return np.column_stack([cols["diab_age"],
+                            cols["female"],
+                            cols["afib"],
+                            _egfr_lt_60(cols, clean=False),
+                            cols.clean("hba1c", clean_hba1c),
+                            _ldl_10(cols, clean=False),
+                            _mmalb(cols),
+                            _sbp_10(cols),
+                            cols["cur_smoke"],
+                            cols["wbc"],
+                            cols["amp_hist"],
+                            cols["chd"]])
+
+
 class UkpdsOM2Stroke(BaseRisk):
     tYear = None
     features = ["diab_dur",
@@ -184,6 +250,7 @@ class UkpdsOM2Stroke(BaseRisk):
                            "chol_ldl_mmol",
                            "albumin_urine",
                            "sbp"]
+    config_keys = ["tYear"]
 
     def __init__(self, tYear=10):
         self.tYear = tYear
@@ -204,6 +271,9 @@ class UkpdsOM2Stroke(BaseRisk):
                                row["chd"],
                                tYear=self.tYear)
 
+    def score_batch(self, data):
+        return ukpdsom2_stroke_batch(self.get_feature_columns(data), self.tYear)
+
     def get_features(self, row):
         feat_dict = super().get_features(row)
         feat_dict["egfr_gt_60"] = row["egfr"]/10 if row["egfr"]<60 else 0
@@ -212,6 +282,15 @@ class UkpdsOM2Stroke(BaseRisk):
         feat_dict["sbp_10"] = row["sbp"] / 10
         return feat_dict
 
+    def get_feature_arrays(self, cols):
+        feat = super().get_feature_arrays(cols)
+        egfr = cols["egfr"]
+        feat["egfr_gt_60"] = np.where(egfr < 60, egfr/10, 0)
+        feat["ldl_mmol_10"] = cols["chol_ldl_mmol"]*10
+        feat["mmalb"] = cols["albumin_urine"] >= 50
+        feat["sbp_10"] = cols["sbp"] / 10
+        return feat
+
 
 
 def ukpdsom2_mi_male(ac, diab_dur, diab_age, easian, 
@@ -271,6 +350,86 @@ def ukpdsom2_mi_female(ac, diab_dur, diab_age, egfr,
                         MI_MALE_PARAMS["rho"])
 
 
+def ukpdsom2_mi_batch(cols, tYear=1):
+    """
+    Vectorized version of ukpdsom2_mi_female and ukpdsom2_mi_male
+    where cols is a Cohort holding the UkpdsOM2MI feature keys
+    """
+    def mi_surv(xFunc, params):
+        def func(sub):
+            diabDur = sub["diab_dur"]
+            # the female equation uses the male shape parameter
+            return weibull_surv(xFunc(sub), params["beta"],
+                                params["lambda"],
+                                diabDur, diabDur+tYear,
+                                MI_MALE_PARAMS["rho"])
+        return func
+    return branch_apply(branch_code(cols["female"]),
+                        [mi_surv(_mi_male_xfeat, MI_MALE_PARAMS),
+                         mi_surv(_mi_female_xfeat, MI_FEMALE_PARAMS)],
+                        cols)
+
+
+def _mi_male_xfeat(cols):
+    return np.column_stack([cols["AC"],
+                            cols["diab_age"],
+                            cols["EAsian"],
+                            cols.clean("hba1c", clean_hba1c),
+                            cols.clean("chol_hdl_mmol", clean_hdl)*10,
+                            _ldl_10(cols),
+                            _mmalb(cols),
+                            cols["pvd"],
+                            _sbp_10(cols),
+                            cols["cur_smoke"],
+                            cols["wbc"],
+                            cols["amp_hist"],
+                            cols["chf"],
+                            cols["chd"],
+                            cols["stroke_hist"]])
+
+
+def _mi_female_xfeat(cols):
+    ldl = cols.clean("chol_ldl_mmol", clean_ldl)
+    return np.column_stack([cols["AC"],
+                            cols["diab_age"],
+                            _egfr_lt_60(cols),
+                            cols.clean("hba1c", clean_hba1c),
+                            np.where(ldl > 35, ldl*10, 0),
+                            _mmalb(cols),
+                            cols["pvd"],
+                            _sbp_10(cols),
+                            cols["cur_smoke"],
+                            cols["wbc"],
+                            cols["chf"],
+                            cols["chd"]])
+
+
+def _egfr_lt_60(cols, clean=True):
+    """
+    eGFR/10 when eGFR < 60 and 0 otherwise
+    """
+    def func():
+        egfr = cols.clean("egfr", clean_egfr) if clean else cols["egfr"]
+        return np.where(egfr < 60, egfr/10, 0)
+    return cols.derive(("om2_egfr_lt_60", clean), func)
+
+
+def _ldl_10(cols, clean=True):
+    def func():
+        ldl = cols.clean("chol_ldl_mmol", clean_ldl) if clean \
+            else cols["chol_ldl_mmol"]
+        return ldl*10
+    return cols.derive(("om2_ldl_10", clean), func)
+
+
+def _mmalb(cols):
+    return cols.derive("om2_mmalb", lambda: cols["albumin_urine"] >= 50)
+
+
+def _sbp_10(cols):
+    return cols.derive("om2_sbp_10", lambda: cols.clean("sbp", clean_bp)/10)
+
+
 class UkpdsOM2MI(BaseRisk):
     tYear = None
     features = ["AC",
@@ -291,6 +450,7 @@ class UkpdsOM2MI(BaseRisk):
                            "albumin_urine",
                            "sbp",
                            "female"]
+    config_keys = ["tYear"]
 
     def __init__(self, tYear=10):
         self.tYear = tYear
@@ -330,6 +490,9 @@ class UkpdsOM2MI(BaseRisk):
                                     row["stroke_hist"],
                                     tYear=self.tYear)
 
+    def score_batch(self, data):
+        return ukpdsom2_mi_batch(self.get_feature_columns(data), self.tYear)
+
     def get_features(self, row):
         feat_dict = super().get_features(row)
         feat_dict["egfr_gt_60"] = row["egfr"]/10 if row["egfr"]<60 else 0
@@ -339,3 +502,82 @@ class UkpdsOM2MI(BaseRisk):
         feat_dict["mmalb"] = row["albumin_urine"] >= 50
         feat_dict["sbp_10"] = row["sbp"] / 10
         return feat_dict
+
+    def get_feature_arrays(self, cols):
+        feat = super().get_feature_arrays(cols)
+        egfr = cols["egfr"]
+        ldl = cols["chol_ldl_mmol"]
+        feat["egfr_gt_60"] = np.where(egfr < 60, egfr/10, 0)
+        feat["ldl_mmol_10"] = ldl*10
+        feat["hdl_mmol_10"] = cols["chol_hdl_mmol"]*10
+        feat["ldl_35"] = np.where(ldl > 35, ldl*10, 0)
+        feat["mmalb"] = cols["albumin_urine"] >= 50
+        feat["sbp_10"] = cols["sbp"] / 10
+        return feat
+
+
+def _lin_pred(xFunc, params):
+    return lambda cols: xFunc(cols).dot(params["beta"]) + params["lambda"]
+
+
+def _chf_lin_pred(cols):
+    return _lin_pred(_chf_xfeat, CHF_PARAMS)(cols), CHF_PARAMS["rho"]
+
+
+def _stroke_lin_pred(cols):
+    return _lin_pred(_stroke_xfeat, STROKE_PARAMS)(cols), STROKE_PARAMS["rho"]
+
+
+def _mi_lin_pred(cols):
+    lp = branch_apply(branch_code(cols["female"]),
+                      [_lin_pred(_mi_male_xfeat, MI_MALE_PARAMS),
+                       _lin_pred(_mi_female_xfeat, MI_FEMALE_PARAMS)],
+                      cols)
+    # the female equation uses the male shape parameter
+    return lp, MI_MALE_PARAMS["rho"]
+
+
+# linear predictor (lambda + xFeat.beta) and shape of each outcome
+OM2_LIN_PRED = {"chf": _chf_lin_pred,
+                "stroke": _stroke_lin_pred,
+                "mi": _mi_lin_pred}
+
+
+def ukpdsom2_annual_batch(cols, years=None,
+                          outcomes=("chf", "stroke", "mi")):
+    """
+    Annual conditional event probabilities of the OM2 outcomes.
+    Each outcome's linear predictor is computed once and the
+    covariates shared by the equations are built once per cohort.
+    Entry (i, j) is the probability of the event in year years[j]
+    from now, [diab_dur + years[j] - 1, diab_dur + years[j]], given
+    no event before it; the risk over the first T years is
+    1 - prod(1 - annual[:, :T], axis=1).
+
+    Parameters
+    ----------
+    cols : Cohort (or column mapping) holding the feature keys of
+           the requested outcome models
+    years : grid of years from now (1 to 10 by default)
+    outcomes : subset of "chf", "stroke" and "mi"
+
+    Returns
+    ----------
+    dict: outcome -> (n, len(years)) matrix of annual probabilities
+    """
+    cols = as_cohort(cols)
+    if years is None:
+        years = np.arange(1, 11)
+    years = np.asarray(years, dtype=float)
+    t = cols["diab_dur"][:, None] + years
+    annual = {}
+    for outcome in outcomes:
+        lp, rho = OM2_LIN_PRED[outcome](cols)
+        risk = np.power(t, rho)
+        risk -= np.power(t - 1, rho)
+        with np.errstate(over="ignore"):
+            risk *= np.exp(lp)[:, None]
+        np.negative(risk, out=risk)
+        np.expm1(risk, out=risk)
+        annual[outcome] = np.negative(risk, out=risk)
+    return annual
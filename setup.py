@@ -7,11 +7,20 @@ setup(name='cvdm',
       author='Joyce Ho',
       author_email='joyce.c.ho@emory.edu',
       license='MIT',
-      packages=['cvdm'],
+      packages=['cvdm.score'],
       install_requires=[
                        'numpy',
                        'pytest',
+                       'tqdm',
                      ],
+      extras_require={
+                       'io': ['pandas', 'pyarrow'],
+                     },
+      entry_points={
+                       'console_scripts': [
+                           'cvdm-score=cvdm.score.cli:main',
+                       ],
+                     },
       classifiers=[
         "Programming Language :: Python :: 3",
         "License :: OSI Approved :: MIT License",